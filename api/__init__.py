@@ -20,6 +20,9 @@ socketio = SocketIO()
 def create_app(testing=False):
     app = Flask(__name__)
 
+    from .request import APIRequest
+    app.request_class = APIRequest
+
     # Configuration Options
     config = {
         "SECRET_KEY": bytes.fromhex(os.getenv("SECRET_KEY")),
@@ -29,7 +32,40 @@ def create_app(testing=False):
         "MAIL_PORT": os.getenv("MAIL_PORT"),
         "MAIL_USE_TLS": os.getenv("MAIL_USE_TLS").lower() in ("true", "1"),
         "MAIL_USERNAME": os.getenv("MAIL_USERNAME"),
-        "MAIL_PASSWORD": os.getenv("MAIL_PASSWORD")
+        "MAIL_PASSWORD": os.getenv("MAIL_PASSWORD"),
+        "LEGACY_SERIALIZATION": os.getenv("LEGACY_SERIALIZATION", "false").lower() in ("true", "1"),
+        "SERIALIZATION_MAX_DEPTH": int(os.getenv("SERIALIZATION_MAX_DEPTH", 2)),
+        "DEFAULT_PAGE_SIZE": int(os.getenv("DEFAULT_PAGE_SIZE", 50)),
+        "MAX_PAGE_SIZE": int(os.getenv("MAX_PAGE_SIZE", 500)),
+        "STREAM_BATCH_SIZE": int(os.getenv("STREAM_BATCH_SIZE", 100)),
+        "JOB_BACKEND": os.getenv("JOB_BACKEND", "thread"),
+        "JOB_WORKERS": int(os.getenv("JOB_WORKERS", 4)),
+        "JOB_MAX_ATTEMPTS": int(os.getenv("JOB_MAX_ATTEMPTS", 5)),
+        "JOB_RETRY_BACKOFF": float(os.getenv("JOB_RETRY_BACKOFF", 30)),
+        "JOB_RUNNING_TIMEOUT": float(os.getenv("JOB_RUNNING_TIMEOUT", 600)),
+        "JOB_POLL_INTERVAL": float(os.getenv("JOB_POLL_INTERVAL", 1)),
+        "USE_X_SENDFILE": os.getenv("USE_X_SENDFILE", "false").lower() in ("true", "1"),
+        "X_ACCEL_REDIRECT_PREFIX": os.getenv("X_ACCEL_REDIRECT_PREFIX"),
+        "MAX_CONTENT_LENGTH": int(os.getenv("MAX_CONTENT_LENGTH", 50 * 1024 * 1024)),
+        "STORAGE_BACKEND": os.getenv("STORAGE_BACKEND", "local"),
+        "S3_ENDPOINT_URL": os.getenv("S3_ENDPOINT_URL"),
+        "S3_BUCKET": os.getenv("S3_BUCKET"),
+        "S3_REGION": os.getenv("S3_REGION", "us-east-1"),
+        "S3_ACCESS_KEY_ID": os.getenv("S3_ACCESS_KEY_ID"),
+        "S3_SECRET_ACCESS_KEY": os.getenv("S3_SECRET_ACCESS_KEY"),
+        "S3_PREFIX": os.getenv("S3_PREFIX", ""),
+        "S3_URL_EXPIRES": int(os.getenv("S3_URL_EXPIRES", 300)),
+        "S3_REDIRECT_DOWNLOADS": os.getenv("S3_REDIRECT_DOWNLOADS", "true").lower() in ("true", "1"),
+        "REQUESTER_CACHE_TTL": float(os.getenv("REQUESTER_CACHE_TTL", 0)),
+        "REQUESTER_CACHE_SIZE": int(os.getenv("REQUESTER_CACHE_SIZE", 1024)),
+        "BCRYPT_ROUNDS": int(os.getenv("BCRYPT_ROUNDS", 12)),
+        "BCRYPT_WORKERS": int(os.getenv("BCRYPT_WORKERS", 4)),
+        "MAIL_POOL_SIZE": int(os.getenv("MAIL_POOL_SIZE", 4)),
+        "MAIL_POOL_MAX_MESSAGES": int(os.getenv("MAIL_POOL_MAX_MESSAGES", 100)),
+        "MAIL_POOL_IDLE_TIMEOUT": float(os.getenv("MAIL_POOL_IDLE_TIMEOUT", 60)),
+        "MAIL_BATCH_SIZE": int(os.getenv("MAIL_BATCH_SIZE", 50)),
+        "SOCKETIO_MESSAGE_QUEUE": os.getenv("SOCKETIO_MESSAGE_QUEUE"),
+        "REPORT_RETENTION": float(os.getenv("REPORT_RETENTION", 7 * 24 * 3600))
     }
 
     if testing:
@@ -41,6 +77,10 @@ def create_app(testing=False):
     for bp in blueprints:
         bp.setup(app)
 
+    from .commands import command_groups
+    for group in command_groups:
+        group.setup(app)
+
     jwt.init_app(app)
     mail.init_app(app)
     db.init_app(app)
@@ -50,9 +90,19 @@ def create_app(testing=False):
         namespaces=[
             '/notifications',
         ],
-        cors_allowed_origins=os.getenv("CORS_ALLOWED_ORIGINS")
+        cors_allowed_origins=os.getenv("CORS_ALLOWED_ORIGINS"),
+        message_queue=app.config.get("SOCKETIO_MESSAGE_QUEUE")
     )
 
+    from .services import job_service, template_service, storage_service, password_encoder_service, report_service, mail_service, jwt_service, points_ledger_service
+    password_encoder_service.init_app(app)
+    jwt_service.init_app(app)
+    job_service.init_app(app)
+    mail_service.init_app(app)
+    template_service.init_app(app)
+    storage_service.init_app(app)
+    report_service.init_app(app)
+
     with app.app_context():
         if testing:
              db.drop_all()
@@ -60,6 +110,9 @@ def create_app(testing=False):
         db.create_all()
         db.session.commit()
 
+        # A ledger table that create_all has just added to an existing database starts empty.
+        points_ledger_service.rebuild_if_empty()
+
     CORS(
         app,
         resources={
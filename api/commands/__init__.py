@@ -0,0 +1,8 @@
+from . import job_commands, proof_commands, points_commands, report_commands
+
+command_groups = [
+    job_commands,
+    proof_commands,
+    points_commands,
+    report_commands
+]
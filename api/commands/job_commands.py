@@ -0,0 +1,23 @@
+import click
+from flask import Flask, current_app
+from flask.cli import AppGroup
+
+from ..services import job_service
+from ..services.job_service import DatabaseBackend
+
+jobs = AppGroup("jobs", help="Manage background jobs.")
+
+@jobs.command("work")
+@click.option("--once", is_flag=True, help="Run the jobs that are due and exit.")
+def work(once: bool) -> None:
+    """Executes jobs queued in the database backend."""
+    if not isinstance(job_service.backend, DatabaseBackend):
+        raise click.ClickException("The worker requires JOB_BACKEND=database.")
+
+    if once:
+        click.echo(f"Processed {job_service.backend.run_pending()} job(s).")
+    else:
+        job_service.backend.work(current_app.config.get("JOB_POLL_INTERVAL", 1))
+
+def setup(app: Flask) -> None:
+    app.cli.add_command(jobs)
@@ -0,0 +1,35 @@
+import sys
+
+import click
+from flask import Flask
+from flask.cli import AppGroup
+
+from ..services import points_ledger_service
+
+points = AppGroup("points", help="Manage the per-user, per-term points ledger.")
+
+@points.command("rebuild")
+@click.option("--batch-size", default=1000, show_default=True, help="Ledger rows inserted per statement.")
+def rebuild(batch_size: int) -> None:
+    """Recomputes every ledger row from the SWTDs and clearings."""
+    count = points_ledger_service.rebuild(batch_size=batch_size)
+    click.echo(f"Rebuilt {count} ledger row(s).")
+
+@points.command("verify")
+@click.option("--limit", default=20, show_default=True, help="Mismatched rows to print.")
+def verify(limit: int) -> None:
+    """Compares the ledger with totals recomputed from the SWTDs. Exits with status 1 if any row differs."""
+    mismatches = points_ledger_service.verify()
+
+    if not mismatches:
+        click.echo("Ledger matches the SWTDs and clearings.")
+        return
+
+    for mismatch in mismatches[:limit]:
+        click.echo(f"User {mismatch['user_id']}, term {mismatch['term_id']}: expected {mismatch['expected']}, stored {mismatch['stored']}")
+
+    click.echo(f"{len(mismatches)} ledger row(s) differ. Run `flask points rebuild` to repair them.")
+    sys.exit(1)
+
+def setup(app: Flask) -> None:
+    app.cli.add_command(points)
@@ -0,0 +1,30 @@
+import click
+from flask import Flask
+from flask.cli import AppGroup
+
+from ..services import ft_service, preview_service
+
+proofs = AppGroup("proofs", help="Manage stored proof files.")
+
+@proofs.command("dedupe")
+@click.option("--batch-size", default=100, show_default=True, help="Proofs migrated per transaction.")
+@click.option("--dry-run", is_flag=True, help="Report what would be folded without changing anything.")
+def dedupe(batch_size: int, dry_run: bool) -> None:
+    """Moves proofs saved before the blob store into it, sharing one blob per distinct file."""
+    stats = ft_service.dedupe_proofs(batch_size=batch_size, dry_run=dry_run)
+
+    click.echo(f"{'Would migrate' if dry_run else 'Migrated'} {stats['proofs']} proof(s) into {stats['blobs']} blob(s).")
+    click.echo(f"Duplicates: {stats['duplicates']} ({stats['bytes_reclaimed']} bytes reclaimed).")
+
+    if stats["missing"]:
+        click.echo(f"Skipped {stats['missing']} proof(s) whose file is missing.")
+
+@proofs.command("previews")
+@click.option("--batch-size", default=100, show_default=True, help="Blobs queued per query.")
+def previews(batch_size: int) -> None:
+    """Queues thumbnails and previews for stored files that have none yet."""
+    count = preview_service.enqueue_missing(batch_size=batch_size)
+    click.echo(f"Queued previews for {count} file(s).")
+
+def setup(app: Flask) -> None:
+    app.cli.add_command(proofs)
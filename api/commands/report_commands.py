@@ -0,0 +1,17 @@
+import click
+from flask import Flask
+from flask.cli import AppGroup
+
+from ..services import report_service
+
+reports = AppGroup("reports", help="Manage generated reports.")
+
+@reports.command("cleanup")
+@click.option("--max-age", type=float, default=None, help="Seconds a finished report is kept, defaults to REPORT_RETENTION.")
+def cleanup(max_age: float) -> None:
+    """Deletes finished reports and their files once they expire."""
+    count = report_service.cleanup(max_age=max_age)
+    click.echo(f"Deleted {count} report(s).")
+
+def setup(app: Flask) -> None:
+    app.cli.add_command(reports)
@@ -1,9 +1,11 @@
-from . import auth_controller, swtd_controller, term_controller, user_controller, department_controller
+from . import auth_controller, swtd_controller, term_controller, user_controller, department_controller, metrics_controller, report_controller
 
 blueprints = [
     auth_controller,
     swtd_controller,
     term_controller,
     user_controller,
-    department_controller
+    department_controller,
+    metrics_controller,
+    report_controller
 ]
@@ -2,7 +2,7 @@ from typing import Any
 from flask import Blueprint, request, Response, Flask
 from flask_jwt_extended import jwt_required
 
-from ..schemas.user_schema import RegistrationSchema, LoginSchema, AccountRecoverySchema, PasswordResetSchema
+from ..schemas.user_schema import RegistrationSchema, LoginSchema, AccountRecoverySchema, PasswordResetSchema, UserSchema
 
 from ..services import auth_service, user_service, jwt_service, password_encoder_service, mail_service, department_service
 
@@ -52,8 +52,8 @@ class AuthController(Blueprint, BaseController):
         )
 
         response = {
-            "user": user.to_dict(),
-            "access_token": self.jwt_service.generate_token(user.email)
+            "user": self.serialize(user, UserSchema),
+            "access_token": self.jwt_service.generate_user_token(user)
         }
 
         return self.build_response(response, 200)
@@ -67,8 +67,12 @@ class AuthController(Blueprint, BaseController):
         token = self.auth_service.login(user, data.get('password'))
         if not token: raise AuthenticationError()
 
+        # Hashes made with an older cost are upgraded while the password is at hand.
+        if self.password_encoder_service.needs_rehash(user.password):
+            self.user_service.rehash_password(user, self.password_encoder_service.encode_password(data.get('password')))
+
         response = {
-            "user": user.to_dict(),
+            "user": self.serialize(user, UserSchema),
             "access_token": token
         }
 
@@ -78,7 +82,7 @@ class AuthController(Blueprint, BaseController):
         data = self.parse_form(request.json, AccountRecoverySchema)
 
         user = self.user_service.get_user(lambda q, u: q.filter_by(email=data.get("email"), is_deleted=False).first())
-        if user: self.mail_service.send_recovery_mail(user.email, user.firstname)
+        if user: self.mail_service.send_recovery_mail(user)
 
         return self.build_response({"message": "Please check email for instructions on how to reset your password."}, 200)
 
@@ -1,9 +1,19 @@
-from typing import Any
+import os
+import base64
+import json
+from typing import IO, Any, Iterator, Optional
+from datetime import datetime
+from urllib.parse import quote
 
-from flask import jsonify, Response
+from flask import jsonify, request, Response, current_app, stream_with_context, send_file
+from werkzeug.exceptions import RequestedRangeNotSatisfiable
+from werkzeug.wsgi import wrap_file
 from marshmallow import Schema, ValidationError
+from sqlalchemy import and_, or_
+from sqlalchemy.orm import Query
 
-from ..exceptions.validation import MissingRequiredParameterError
+from ..schemas.base_schema import ModelSchema
+from ..exceptions.validation import MissingRequiredParameterError, InvalidParameterError
 
 class BaseController:
     def build_response(self, response: Any, code: int) -> Response:
@@ -12,6 +22,69 @@ class BaseController:
         
         return jsonify(response), code
 
+    def build_file_response(self, content: IO[bytes], filename: str, mimetype: str) -> Response:
+        """Streams a file object in chunks instead of reading it into memory."""
+        size = content.seek(0, os.SEEK_END)
+        content.seek(0)
+
+        headers = {
+            'Content-Disposition': f'attachment; filename="{filename}"',
+            'Content-Length': str(size)
+        }
+
+        return Response(wrap_file(request.environ, content), mimetype=mimetype, status=200, headers=headers, direct_passthrough=True)
+
+    def build_stored_file_response(self, path: str, mimetype: str, filename: str, root: str) -> Response:
+        """Serves a file on disk with ETag, Last-Modified and Range support.
+
+        With X_ACCEL_REDIRECT_PREFIX set, files under root are handed to nginx through an internal redirect. Otherwise
+        send_file streams them with the server's file wrapper, or via X-Sendfile when USE_X_SENDFILE is enabled.
+        """
+        disposition = f"inline; filename*=UTF-8''{quote(filename)}"
+
+        prefix = current_app.config.get("X_ACCEL_REDIRECT_PREFIX")
+        relative = os.path.relpath(path, root)
+
+        if prefix and not relative.startswith(os.pardir):
+            response = Response(mimetype=mimetype, status=200)
+            response.headers['X-Accel-Redirect'] = prefix.rstrip('/') + '/' + quote(relative.replace(os.sep, '/'))
+            response.headers['Content-Disposition'] = disposition
+            return response
+
+        try:
+            response = send_file(path, mimetype=mimetype, conditional=True, etag=True)
+        except RequestedRangeNotSatisfiable as e:
+            return e.get_response()
+
+        response.headers['Content-Disposition'] = disposition
+        # Werkzeug only advertises ranges when one was requested. Clients need it up front to resume downloads.
+        response.headers.setdefault('Accept-Ranges', 'bytes')
+        # Files are only served to authorized users, so shared caches must not store them.
+        response.cache_control.private = True
+        return response
+
+    def build_object_response(self, content: IO[bytes], mimetype: str, filename: str, size: Optional[int]=None) -> Response:
+        """Relays an object read from remote storage. It cannot seek, so it is sent whole without conditional or range support."""
+        headers = {'Content-Disposition': f"inline; filename*=UTF-8''{quote(filename)}"}
+        if size is not None:
+            headers['Content-Length'] = str(size)
+
+        response = Response(wrap_file(request.environ, content), mimetype=mimetype, status=200, headers=headers, direct_passthrough=True)
+        response.cache_control.private = True
+        return response
+
+    def build_stream_response(self, content: Iterator[bytes], filename: str, mimetype: str) -> Response:
+        """Sends a generated file as it is produced. Its size is not known in advance, so the response is chunked."""
+        headers = {'Content-Disposition': f'attachment; filename="{filename}"'}
+        return Response(stream_with_context(content), mimetype=mimetype, status=200, headers=headers)
+
+    def parse_export_format(self, formats: tuple[str, ...]=("pdf", "csv", "xlsx")) -> str:
+        format = request.args.get("format", formats[0])
+        if format not in formats:
+            raise InvalidParameterError("format")
+
+        return format
+
     def check_fields(self, data: dict[str, Any], required_fields: list[str]):
         for field in required_fields:
             if field not in data:
@@ -24,3 +97,91 @@ class BaseController:
             return data
         except ValidationError as e:
             return self.build_response(jsonify({"errors": e.messages}), 400)
+
+    def serialize(self, obj: Any, schema: type[ModelSchema]=None, view: str=None, many: bool=False) -> Any:
+        # Fall back to the model to_dict() payloads for clients that still depend on them.
+        if current_app.config.get("LEGACY_SERIALIZATION", False):
+            return [o.to_dict() for o in obj] if many else obj.to_dict()
+
+        if many and not obj:
+            return []
+
+        schema = schema or ModelSchema.for_model(type(obj[0] if many else obj))
+        if not schema: raise AttributeError(f"No schema registered for '{type(obj).__name__}'.")
+
+        return schema.serialize(obj, view=view, many=many, max_depth=current_app.config.get("SERIALIZATION_MAX_DEPTH", 2))
+
+    def parse_page(self, params: dict[str, Any]) -> dict[str, Any]:
+        """Pop the pagination and output parameters from the query params so the rest can be used as filters."""
+        page = {
+            "limit": params.pop("limit", None),
+            "cursor": params.pop("cursor", None),
+            "format": params.pop("format", "json")
+        }
+
+        if page["limit"] is not None:
+            try:
+                page["limit"] = int(page["limit"])
+            except ValueError:
+                raise InvalidParameterError("limit")
+
+            if page["limit"] < 1 or page["limit"] > current_app.config.get("MAX_PAGE_SIZE", 500):
+                raise InvalidParameterError("limit")
+
+        if page["cursor"] is not None:
+            page["cursor"] = self.decode_cursor(page["cursor"])
+
+        if page["format"] not in ("json", "ndjson"):
+            raise InvalidParameterError("format")
+
+        return page
+
+    def encode_cursor(self, obj: Any) -> str:
+        key = json.dumps([obj.date_created.isoformat(), obj.id])
+        return base64.urlsafe_b64encode(key.encode('utf-8')).decode('utf-8')
+
+    def decode_cursor(self, cursor: str) -> tuple[datetime, int]:
+        try:
+            date_created, id = json.loads(base64.urlsafe_b64decode(cursor.encode('utf-8')))
+            return datetime.fromisoformat(date_created), int(id)
+        except Exception:
+            raise InvalidParameterError("cursor")
+
+    def build_list_response(self, key: str, query: Query, schema: type[ModelSchema], page: dict[str, Any], view: str=None) -> Response:
+        """Respond with the full list, a keyset page ordered by (date_created, id), or an NDJSON stream."""
+        model = schema.__model__
+        query = query.order_by(model.date_created, model.id)
+
+        if page["cursor"]:
+            date_created, id = page["cursor"]
+            query = query.filter(or_(
+                model.date_created > date_created,
+                and_(model.date_created == date_created, model.id > id)
+            ))
+
+        if page["format"] == "ndjson":
+            if page["limit"]:
+                query = query.limit(page["limit"])
+
+            return Response(stream_with_context(self.stream_rows(query, schema, view)), mimetype='application/x-ndjson', status=200)
+
+        if not page["limit"] and not page["cursor"]:
+            return self.build_response({key: self.serialize(query.all(), schema, view=view, many=True)}, 200)
+
+        limit = page["limit"] or current_app.config.get("DEFAULT_PAGE_SIZE", 50)
+
+        # Fetch one extra row to know whether another page follows.
+        rows = query.limit(limit + 1).all()
+        next_cursor = self.encode_cursor(rows[limit - 1]) if len(rows) > limit else None
+
+        response = {
+            key: self.serialize(rows[:limit], schema, view=view, many=True),
+            "next_cursor": next_cursor
+        }
+
+        return self.build_response(response, 200)
+
+    def stream_rows(self, query: Query, schema: type[ModelSchema], view: str=None) -> Iterator[str]:
+        # yield_per fetches through a server-side cursor, so only one batch of rows is held at a time.
+        for row in query.yield_per(current_app.config.get("STREAM_BATCH_SIZE", 100)):
+            yield json.dumps(self.serialize(row, schema, view=view)) + "\n"
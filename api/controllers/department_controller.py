@@ -3,10 +3,12 @@ from datetime import datetime, date
 
 from flask import Blueprint, request, Response, Flask
 from flask_jwt_extended import jwt_required
+from werkzeug.utils import secure_filename
 
 from .base_controller import BaseController
-from ..schemas.department_schema import CreateDepartmentSchema, UpdateDepartmentSchema
-from ..services import jwt_service, user_service, department_service, auth_service, ft_service, term_service
+from ..schemas.department_schema import CreateDepartmentSchema, UpdateDepartmentSchema, DepartmentSchema
+from ..schemas.clearing_schema import ClearingSchema
+from ..services import jwt_service, user_service, department_service, auth_service, ft_service, term_service, table_export_service, notification_service
 
 from ..exceptions.authorization import AuthorizationError
 from ..exceptions.conflct import ResourceAlreadyExistsError
@@ -23,6 +25,8 @@ class DepartmentController(Blueprint, BaseController):
         self.auth_service = auth_service
         self.ft_service = ft_service
         self.term_service = term_service
+        self.table_export_service = table_export_service
+        self.notification_service = notification_service
 
         self.map_routes()
 
@@ -33,14 +37,18 @@ class DepartmentController(Blueprint, BaseController):
         self.route('/<int:department_id>', methods=['PUT'])(self.update_department)
         self.route('/<int:department_id>', methods=['DELETE'])(self.delete_department)
         self.route('/<int:department_id>/<field_name>', methods=['GET'])(self.get_department_property)
+        self.route('/<int:department_id>/points', methods=['GET'])(self.get_department_points)
+        self.route('/<int:department_id>/clearances', methods=['POST'])(self.grant_department_clearances)
         self.route('/<int:department_id>/export', methods=['GET'])(self.export_department_data)
         self.route('/<int:department_id>/staff/export', methods=['GET'])(self.export_staff_data)
+        self.route('/staff/export', methods=['GET'])(self.export_all_staff_data)
 
     def get_all_departments(self) -> Response:
         args = {"is_deleted": False, **request.args}
-        departments = self.department_service.get_department(lambda q, d: q.filter_by(**args).all())
+        page = self.parse_page(args)
 
-        return self.build_response({"departments": [d.to_dict() for d in departments]}, 200)
+        departments = self.department_service.get_department(lambda q, d: q.filter_by(**args), profile="list")
+        return self.build_list_response("departments", departments, DepartmentSchema, page)
 
     @jwt_required()
     def create_department(self) -> Response:
@@ -59,13 +67,13 @@ class DepartmentController(Blueprint, BaseController):
             use_schoolyear=data.get('use_schoolyear')
         )
 
-        return self.build_response({"department": department.to_dict()}, 200)
+        return self.build_response({"department": self.serialize(department, DepartmentSchema)}, 200)
 
     def get_department(self, department_id: int) -> Response:
         department = self.department_service.get_department(lambda q, d: q.filter_by(id=department_id, is_deleted=False).first())
         if not department: raise DepartmentNotFoundError()
 
-        return self.build_response({"department": department.to_dict()}, 200)
+        return self.build_response({"department": self.serialize(department, DepartmentSchema)}, 200)
 
     @jwt_required()
     def update_department(self, department_id: int) -> Response:
@@ -78,6 +86,7 @@ class DepartmentController(Blueprint, BaseController):
         if not department: raise DepartmentNotFoundError()
 
         data = self.parse_form(request.json, UpdateDepartmentSchema)
+        revoked = []
 
         if "head_id" in data:
             head_id = data.pop("head_id")
@@ -89,6 +98,8 @@ class DepartmentController(Blueprint, BaseController):
                     if head.access_level < 2:
                         self.user_service.update_user(head, access_level=0)
 
+                    revoked.append(head)
+
                 data["head"] = None
             else:
                 head = self.user_service.get_user(lambda q, u: q.filter_by(id=head_id).first())
@@ -99,13 +110,22 @@ class DepartmentController(Blueprint, BaseController):
                 if head.access_level < 2:
                     self.user_service.update_user(head, access_level=1)
 
+                if department.head:
+                    revoked.append(department.head)
+
+                revoked.append(head)
                 data["head"] = head
         
         if "level" in data:
             data["level"] = data.get("level", '').strip().upper()
 
         department = self.department_service.update_department(department, **data)
-        return self.build_response({"department": department.to_dict()}, 200)
+
+        # Head changes alter the headed_department_id claim of both users.
+        if revoked:
+            self.user_service.revoke_tokens(*revoked)
+
+        return self.build_response({"department": self.serialize(department, DepartmentSchema)}, 200)
 
     @jwt_required()
     def delete_department(self, department_id: int) -> Response:
@@ -117,7 +137,9 @@ class DepartmentController(Blueprint, BaseController):
         department = self.department_service.get_department(lambda q, d: q.filter_by(id=department_id, is_deleted=False).first())
         if not department: raise DepartmentNotFoundError()
 
+        members = list(department.members)
         self.department_service.delete_department(department)
+        self.user_service.revoke_tokens(*members)
         return self.build_response({"message": "Department deleted"}, 200)
 
     @jwt_required()
@@ -126,7 +148,10 @@ class DepartmentController(Blueprint, BaseController):
 
         protected_fields = ["members"]
 
-        department = self.department_service.get_department(lambda q, d: q.filter_by(id=department_id, is_deleted=False). first())
+        department = self.department_service.get_department(
+            lambda q, d: q.filter_by(id=department_id, is_deleted=False).first(),
+            profile="members" if field_name == "members" else None
+        )
         if not department: raise DepartmentNotFoundError()
 
         if field_name in protected_fields and not department.head == requester and not self.auth_service.has_permissions(requester, minimum_auth="staff"):
@@ -141,7 +166,7 @@ class DepartmentController(Blueprint, BaseController):
             if use_list:
                 prop = list(filter(lambda i: hasattr(i, 'is_deleted') and i.is_deleted == False, prop))
 
-            response[field_name] = [o.to_dict() for o in prop] if use_list else prop.to_dict()
+            response[field_name] = self.serialize(prop, view="list", many=use_list)
         except AttributeError:
             if isinstance(prop, datetime):
                 response[field_name] = prop.strftime("%m-%d-%Y %H:%M")
@@ -152,11 +177,62 @@ class DepartmentController(Blueprint, BaseController):
 
         return self.build_response(response, 200)
         
+    @jwt_required()
+    def get_department_points(self, department_id: int) -> Response:
+        requester = self.jwt_service.get_requester()
+
+        department = self.department_service.get_department(lambda q, d: q.filter_by(id=department_id, is_deleted=False).first())
+        if not department: raise DepartmentNotFoundError()
+
+        if not department.head == requester and not self.auth_service.has_permissions(requester, minimum_auth='staff'):
+            raise AuthorizationError("Cannot retrieve department points.")
+
+        if not "term_id" in request.args: raise MissingRequiredParameterError("term_id")
+
+        term = self.term_service.get_term(lambda q, t: q.filter_by(id=int(request.args.get("term_id", 0)), is_deleted=False).first())
+        if not term: raise TermNotFoundError()
+
+        members = list(filter(lambda u: u.is_deleted == False, department.members))
+        points = self.user_service.get_point_summaries(members, term)
+
+        return self.build_response({"points": points}, 200)
+
+    @jwt_required()
+    def grant_department_clearances(self, department_id: int) -> Response:
+        requester = self.jwt_service.get_requester()
+
+        department = self.department_service.get_department(lambda q, d: q.filter_by(id=department_id, is_deleted=False).first())
+        if not department: raise DepartmentNotFoundError()
+
+        if not department.head == requester and not self.auth_service.has_permissions(requester, minimum_auth='staff'):
+            raise AuthorizationError("Cannot grant department clearances.")
+
+        data = {**request.json}
+
+        if "term_id" not in data: raise MissingRequiredParameterError("term_id")
+
+        term = self.term_service.get_term(lambda q, t: q.filter_by(id=data.get("term_id"), is_deleted=False).first())
+        if not term: raise TermNotFoundError()
+
+        user_ids = data.get("user_ids")
+        if user_ids is not None and (not isinstance(user_ids, list) or not all(type(user_id) is int for user_id in user_ids)):
+            raise InvalidParameterError("user_ids")
+
+        clearances, skipped = self.user_service.grant_clearances(requester, department, term, user_ids)
+
+        # Serialized before notifying, since the notifications commit and expire the clearings.
+        response = {"clearances": self.serialize(clearances, ClearingSchema, many=True), "skipped": skipped}
+        self.notification_service.notify_clearances(clearances)
+
+        return self.build_response(response, 200)
+
     @jwt_required()
     def export_department_data(self, department_id: int) -> Response:
         requester = self.jwt_service.get_requester()
+        format = self.parse_export_format()
         
-        department = self.department_service.get_department(lambda q, u: q.filter_by(id=department_id, is_deleted=False).first())
+        # Tabular exports are aggregated in SQL, so the members do not need to be loaded.
+        department = self.department_service.get_department(lambda q, u: q.filter_by(id=department_id, is_deleted=False).first(), profile="export" if format == "pdf" else None)
 
         if not department: raise DepartmentNotFoundError()
         
@@ -168,19 +244,20 @@ class DepartmentController(Blueprint, BaseController):
         if not department.head == requester and not self.auth_service.has_permissions(requester, minimum_auth='staff'):
             raise AuthorizationError("Cannot export staff validation data.")
 
-        content = self.ft_service.export_for_head(requester, department, term)
+        if format != "pdf":
+            content = self.table_export_service.export_for_head(format, department, term)
+            return self.build_stream_response(content, f"{department.name}_Report.{format}", self.table_export_service.formats[format])
 
-        headers = {
-            'Content-Disposition': f'attachment; filename="{department.name}_Report.pdf"'
-        }
+        content = self.ft_service.export_for_head(requester, department, term)
 
-        return Response(content, mimetype='application/pdf', status=200, headers=headers)
+        return self.build_file_response(content, f"{department.name}_Report.pdf", 'application/pdf')
 
     @jwt_required()
     def export_staff_data(self, department_id: int) -> Response:
         requester = self.jwt_service.get_requester()
+        format = self.parse_export_format()
         
-        department = self.department_service.get_department(lambda q, u: q.filter_by(id=department_id, is_deleted=False).first())
+        department = self.department_service.get_department(lambda q, u: q.filter_by(id=department_id, is_deleted=False).first(), profile="export" if format == "pdf" else None)
         if not department: raise DepartmentNotFoundError()
         
         if not "term_id" in request.args: raise MissingRequiredParameterError("term_id")
@@ -191,13 +268,38 @@ class DepartmentController(Blueprint, BaseController):
         if not self.auth_service.has_permissions(requester, minimum_auth='staff'):
             raise AuthorizationError("Cannot export staff validation data.")
 
+        if format != "pdf":
+            content = self.table_export_service.export_for_staff(format, term, department)
+            return self.build_stream_response(content, f"{department.name}_Report.{format}", self.table_export_service.formats[format])
+
         content = self.ft_service.export_for_staff(requester, department, term)
 
-        headers = {
-            'Content-Disposition': f'attachment; filename="{department.name}_Report.pdf"'
-        }
+        return self.build_file_response(content, f"{department.name}_Report.pdf", 'application/pdf')
+
+    @jwt_required()
+    def export_all_staff_data(self) -> Response:
+        requester = self.jwt_service.get_requester()
+        format = self.parse_export_format()
+
+        if not self.auth_service.has_permissions(requester, minimum_auth='staff'):
+            raise AuthorizationError("Cannot export staff validation data.")
+
+        if not "term_id" in request.args: raise MissingRequiredParameterError("term_id")
+
+        term = self.term_service.get_term(lambda q, t: q.filter_by(id=int(request.args.get("term_id", 0)), is_deleted=False).first())
+        if not term: raise TermNotFoundError()
+
+        filename = secure_filename(term.name) or term.id
+
+        # Tabular exports list every employee in a single sheet instead of one PDF per department.
+        if format != "pdf":
+            content = self.table_export_service.export_for_staff(format, term)
+            return self.build_stream_response(content, f"{filename}_Report.{format}", self.table_export_service.formats[format])
+
+        departments = self.department_service.get_department(lambda q, d: q.filter_by(is_deleted=False).order_by(d.id).all(), profile="export")
+        content = self.ft_service.export_all_for_staff(requester, departments, term)
 
-        return Response(content, mimetype='application/pdf', status=200, headers=headers)
+        return self.build_stream_response(content, f"{filename}_Reports.zip", 'application/zip')
 
 def setup(app: Flask) -> None:
     app.register_blueprint(DepartmentController('department', __name__, url_prefix='/departments'))
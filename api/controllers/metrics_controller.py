@@ -0,0 +1,26 @@
+from typing import Any
+
+from flask import Blueprint, Response, Flask
+
+from .base_controller import BaseController
+from ..services import auth_service, mail_service
+
+class MetricsController(Blueprint, BaseController):
+    def __init__(self, name: str, import_name: str, **kwargs: dict[str, Any]) -> None:
+        super().__init__(name, import_name, **kwargs)
+
+        self.auth_service = auth_service
+        self.mail_service = mail_service
+
+        self.map_routes()
+
+    def map_routes(self) -> None:
+        self.route('/mail', methods=['GET'])(self.get_mail_metrics)
+
+    @auth_service.claims_required(minimum_auth="staff")
+    def get_mail_metrics(self) -> Response:
+        # Metrics are kept per worker process.
+        return self.build_response({"mail": self.mail_service.get_metrics()}, 200)
+
+def setup(app: Flask) -> None:
+    app.register_blueprint(MetricsController('metrics', __name__, url_prefix='/metrics'))
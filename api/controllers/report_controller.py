@@ -0,0 +1,95 @@
+from typing import Any
+
+from flask import Blueprint, request, Response, Flask, send_file
+from flask_jwt_extended import jwt_required
+
+from .base_controller import BaseController
+from ..models.report import Report
+from ..schemas.report_schema import CreateReportSchema, ReportSchema
+from ..services import jwt_service, user_service, department_service, auth_service, term_service, report_service
+
+from ..exceptions.authorization import AuthorizationError
+from ..exceptions.conflct import ReportNotReadyError
+from ..exceptions.resource import DepartmentNotFoundError, UserNotFoundError, TermNotFoundError, ReportNotFoundError
+from ..exceptions.validation import MissingRequiredParameterError
+
+class ReportController(Blueprint, BaseController):
+    def __init__(self, name: str, import_name: str, **kwargs: dict[str, Any]) -> None:
+        super().__init__(name, import_name, **kwargs)
+
+        self.jwt_service = jwt_service
+        self.user_service = user_service
+        self.department_service = department_service
+        self.auth_service = auth_service
+        self.term_service = term_service
+        self.report_service = report_service
+
+        self.map_routes()
+
+    def map_routes(self) -> None:
+        self.route('', methods=['POST'])(self.create_report)
+        self.route('/<int:report_id>', methods=['GET'])(self.get_report)
+        self.route('/<int:report_id>/download', methods=['GET'])(self.download_report)
+
+    @jwt_required()
+    def create_report(self) -> Response:
+        requester = self.jwt_service.get_requester()
+
+        data = self.parse_form(request.json, CreateReportSchema)
+        report_type = data.get("type")
+
+        if report_type == "EMPLOYEE":
+            if not "user_id" in data: raise MissingRequiredParameterError("user_id")
+
+            user = self.user_service.get_user(lambda q, u: q.filter_by(id=data.get("user_id"), is_deleted=False).first())
+            if not user: raise UserNotFoundError()
+
+            if requester != user and not self.auth_service.has_permissions(requester, minimum_auth='head'):
+                raise AuthorizationError("Cannot export user SWTD data.")
+        else:
+            self.check_fields(data, ["department_id", "term_id"])
+
+            department = self.department_service.get_department(lambda q, d: q.filter_by(id=data.get("department_id"), is_deleted=False).first())
+            if not department: raise DepartmentNotFoundError()
+
+            term = self.term_service.get_term(lambda q, t: q.filter_by(id=data.get("term_id"), is_deleted=False).first())
+            if not term: raise TermNotFoundError()
+
+            if report_type == "DEPARTMENT" and not department.head == requester and not self.auth_service.has_permissions(requester, minimum_auth='staff'):
+                raise AuthorizationError("Cannot export department data.")
+
+            if report_type == "STAFF" and not self.auth_service.has_permissions(requester, minimum_auth='staff'):
+                raise AuthorizationError("Cannot export staff validation data.")
+
+        report = self.report_service.create_report(requester_id=requester.id, **data)
+        return self.build_response({"report": self.serialize(report, ReportSchema)}, 202)
+
+    @jwt_required()
+    def get_report(self, report_id: int) -> Response:
+        report = self.get_requested_report(report_id)
+        return self.build_response({"report": self.serialize(report, ReportSchema)}, 200)
+
+    @jwt_required()
+    def download_report(self, report_id: int) -> Response:
+        report = self.get_requested_report(report_id)
+        if report.status != "DONE": raise ReportNotReadyError()
+
+        try:
+            return send_file(report.path, mimetype='application/pdf', as_attachment=True, download_name=report.filename)
+        except FileNotFoundError:
+            # The file was removed while the report was still listed, e.g. by the retention cleanup.
+            raise ReportNotFoundError("Report file is no longer available.")
+
+    def get_requested_report(self, report_id: int) -> Report:
+        requester = self.jwt_service.get_requester()
+
+        report = self.report_service.get_report(lambda q, r: q.filter_by(id=report_id).first())
+        if not report: raise ReportNotFoundError()
+
+        if report.requester_id != requester.id and not self.auth_service.has_permissions(requester, minimum_auth='staff'):
+            raise AuthorizationError("Cannot retrieve report.")
+
+        return report
+
+def setup(app: Flask) -> None:
+    app.register_blueprint(ReportController('report', __name__, url_prefix='/reports'))
@@ -1,18 +1,21 @@
+import os
 from typing import Any
 from datetime import datetime, date
 
-from flask import Blueprint, request, Response, Flask
+from flask import Blueprint, request, Response, Flask, redirect
 from flask_jwt_extended import jwt_required
 
 from .base_controller import BaseController
-from ..schemas.swtd_schema import CreateSWTDSchema, UpdateSWTDScehma
-from ..schemas.comment_schema import CreateCommentSchema, UpdateCommentSchema
+from ..schemas.swtd_schema import CreateSWTDSchema, UpdateSWTDScehma, SWTDSchema, ProofSchema
+from ..schemas.comment_schema import CreateCommentSchema, UpdateCommentSchema, CommentSchema
 
 from ..exceptions.authorization import AuthorizationError
 from ..exceptions.resource import SWTDFormNotFoundError, UserNotFoundError, TermNotFoundError, SWTDCommentNotFoundError, ProofNotFoundError
 from ..exceptions.validation import MissingRequiredParameterError, InvalidDateTimeFormat, InvalidParameterError
 
-from ..services import swtd_service, jwt_service, user_service, auth_service, ft_service, swtd_comment_service, term_service
+from ..services import swtd_service, jwt_service, user_service, auth_service, ft_service, swtd_comment_service, term_service, storage_service, preview_service, notification_service
+
+VALIDATION_STATUSES = ("APPROVED", "PENDING", "REJECTED")
 
 class SWTDController(Blueprint, BaseController):
     def __init__(self, name: str, import_name: str, **kwargs: dict[str, Any]) -> None:
@@ -25,12 +28,16 @@ class SWTDController(Blueprint, BaseController):
         self.ft_service = ft_service
         self.swtd_comment_service = swtd_comment_service
         self.term_service = term_service
+        self.storage_service = storage_service
+        self.preview_service = preview_service
+        self.notification_service = notification_service
 
         self.map_routes()
 
     def map_routes(self) -> None:
         self.route('', methods=['GET'])(self.get_all_swtds)
         self.route('', methods=['POST'])(self.create_swtd)
+        self.route('/validate', methods=['POST'])(self.validate_swtds)
         self.route('/<int:form_id>', methods=['GET'])(self.get_swtd)
         self.route('/<int:form_id>', methods=['PUT'])(self.update_swtd)
         self.route('/<int:form_id>', methods=['DELETE'])(self.delete_swtd)
@@ -48,6 +55,7 @@ class SWTDController(Blueprint, BaseController):
         requester = self.jwt_service.get_requester()
 
         params = {"is_deleted": False, **request.args}
+        page = self.parse_page(params)
 
         author = self.user_service.get_user(lambda q, u: q.filter_by(id=int(params.get("author_id", 0)), is_deleted=False).first())
         
@@ -63,8 +71,8 @@ class SWTDController(Blueprint, BaseController):
         except Exception:
             raise InvalidDateTimeFormat()
 
-        swtd_forms = self.swtd_service.get_swtd(lambda q, s: q.filter_by(**params).all())
-        return self.build_response({"swtd_forms": [f.to_dict() for f in swtd_forms]}, 200)
+        swtd_forms = self.swtd_service.get_swtd(lambda q, s: q.filter_by(**params), profile="list")
+        return self.build_list_response("swtd_forms", swtd_forms, SWTDSchema, page, view="list")
 
     @jwt_required()
     def create_swtd(self) -> Response:
@@ -97,20 +105,65 @@ class SWTDController(Blueprint, BaseController):
             term=term
         )
 
-        for file in files: self.ft_service.save(requester.id, swtd.id, file)
-        return self.build_response({"swtd_form": swtd.to_dict()}, 200)
+        self.ft_service.save_proofs(requester.id, swtd.id, files)
+        return self.build_response({"swtd_form": self.serialize(swtd, SWTDSchema, view="detail")}, 200)
+
+    @jwt_required()
+    def validate_swtds(self) -> Response:
+        requester = self.jwt_service.get_requester()
+
+        data = {**request.json}
+
+        if "validations" not in data: raise MissingRequiredParameterError("validations")
+
+        validations = data.get("validations")
+        if not isinstance(validations, list) or not all(isinstance(v, dict) and type(v.get("id")) is int for v in validations):
+            raise InvalidParameterError("validations")
+
+        statuses = {}
+        for validation in validations:
+            if validation.get("validation_status") not in VALIDATION_STATUSES:
+                raise InvalidParameterError("validation_status")
+
+            statuses[validation.get("id")] = validation.get("validation_status")
+
+        swtds = self.swtd_service.get_swtd(lambda q, s: q.filter(s.id.in_(statuses), s.is_deleted == False).all(), profile="list")
+        swtds = {swtd.id: swtd for swtd in swtds}
+
+        is_staff = self.auth_service.has_permissions(requester, minimum_auth='staff')
+        changes, skipped = {}, []
+
+        for form_id, status in statuses.items():
+            swtd = swtds.get(form_id)
+
+            if not swtd:
+                skipped.append({"id": form_id, "reason": "NOT_FOUND"})
+            elif not is_staff and not requester.is_head_of(swtd.author):
+                skipped.append({"id": form_id, "reason": "FORBIDDEN"})
+            elif swtd.validation_status == status:
+                skipped.append({"id": form_id, "reason": "UNCHANGED"})
+            else:
+                changes[form_id] = status
+
+        swtds = self.swtd_service.validate_swtds(requester, changes)
+
+        # Serialized before notifying, since the notifications commit and expire the SWTDs.
+        response = {"swtd_forms": self.serialize(swtds, SWTDSchema, view="list", many=True), "skipped": skipped}
+        self.notification_service.notify_validations(requester, swtds)
+
+        return self.build_response(response, 200)
 
     @jwt_required()
     def get_swtd(self, form_id: int) -> Response:
         requester = self.jwt_service.get_requester()
 
-        swtd = self.swtd_service.get_swtd(lambda q, s: q.filter_by(id=form_id, is_deleted=False).first())
+        swtd = self.swtd_service.get_swtd(lambda q, s: q.filter_by(id=form_id, is_deleted=False).first(), profile="detail")
         if not swtd: raise SWTDFormNotFoundError()
 
         if not requester.is_head_of(swtd.author) and requester != swtd.author and not self.auth_service.has_permissions(requester, minimum_auth='staff'):
             raise AuthorizationError("Cannot retrieve SWTD form data.")
 
-        return self.build_response({"swtd_form": swtd.to_dict()}, 200)
+        return self.build_response({"swtd_form": self.serialize(swtd, SWTDSchema, view="detail")}, 200)
 
     @jwt_required()
     def update_swtd(self, form_id: int) -> Response:
@@ -157,7 +210,7 @@ class SWTDController(Blueprint, BaseController):
             if not term: raise TermNotFoundError()
 
         swtd = self.swtd_service.update_swtd(swtd, **data)
-        return self.build_response({"swtd_form": swtd.to_dict()}, 200)
+        return self.build_response({"swtd_form": self.serialize(swtd, SWTDSchema, view="detail")}, 200)
 
     @jwt_required()
     def delete_swtd(self, form_id: int) -> Response:
@@ -190,7 +243,7 @@ class SWTDController(Blueprint, BaseController):
             if use_list:
                 prop = list(filter(lambda i: hasattr(i, 'is_deleted') and i.is_deleted == False, prop))
 
-            response[field_name] = [o.to_dict() for o in prop] if use_list else prop.to_dict()
+            response[field_name] = self.serialize(prop, view="list", many=use_list)
         except AttributeError:
             if isinstance(prop, datetime):
                 response[field_name] = prop.strftime("%m-%d-%Y %H:%M")
@@ -214,7 +267,7 @@ class SWTDController(Blueprint, BaseController):
         data = self.parse_form({**request.json, "author_id": requester.id, "swtd_id": swtd.id}, CreateCommentSchema)
         
         comment = self.swtd_comment_service.create_comment(**data)
-        return self.build_response({"comment": comment.to_dict()}, 200)
+        return self.build_response({"comment": self.serialize(comment, CommentSchema)}, 200)
 
     @jwt_required()
     def get_swtd_comment(self, form_id: int, comment_id: int) -> Response:
@@ -229,7 +282,7 @@ class SWTDController(Blueprint, BaseController):
         comment = self.swtd_comment_service.get_comment(lambda q, c: q.filter_by(id=comment_id, is_deleted=False).first())
         if not comment or comment not in swtd.comments: raise SWTDCommentNotFoundError()
 
-        return self.build_response({"comment": comment.to_dict()}, 200)
+        return self.build_response({"comment": self.serialize(comment, CommentSchema)}, 200)
 
     @jwt_required()
     def update_swtd_comment(self, form_id: int, comment_id: int) -> Response:
@@ -248,7 +301,7 @@ class SWTDController(Blueprint, BaseController):
         if requester != comment.author: raise AuthorizationError("Cannot update comment data.")
         
         comment = self.swtd_comment_service.update_comment(comment, **data)
-        return self.build_response({"comment": comment.to_dict()}, 200)
+        return self.build_response({"comment": self.serialize(comment, CommentSchema)}, 200)
     
     @jwt_required()
     def delete_swtd_comment(self, form_id: int, comment_id: int) -> Response:
@@ -279,14 +332,11 @@ class SWTDController(Blueprint, BaseController):
         files = request.files.getlist('files')
         if not files: raise MissingRequiredParameterError("files")
 
-        proofs = []
-        for file in files:
-            proof = self.ft_service.save(requester.id, swtd.id, file)
-            proofs.append(proof)
+        proofs = self.ft_service.save_proofs(requester.id, swtd.id, files)
 
         swtd = self.swtd_service.update_swtd(swtd, validation_status="PENDING")
 
-        return self.build_response({"proof": [p.to_dict() for p in proofs]}, 200)
+        return self.build_response({"proof": self.serialize(proofs, ProofSchema, many=True)}, 200)
   
     @jwt_required()
     def show_proof(self, form_id: int, proof_id: int) -> Response:
@@ -301,8 +351,40 @@ class SWTDController(Blueprint, BaseController):
         proof = self.ft_service.get_proof(lambda q, p: q.filter_by(id=proof_id).first())
         if not proof: raise ProofNotFoundError()
 
-        with open(proof.path, 'rb') as f: content = f.read()
-        return Response(content, mimetype=proof.content_type, status=200)
+        variant = request.args.get("variant")
+        if variant:
+            if variant not in self.preview_service.variants:
+                raise InvalidParameterError("variant")
+
+            if not proof.blob or proof.blob.preview_status != "DONE":
+                raise ProofNotFoundError("Proof preview not available.")
+
+            filename = f"{os.path.splitext(proof.filename)[0]}.{variant}.jpg"
+            return self.build_storage_response(self.preview_service.get_key(proof.blob.key, variant), "image/jpeg", filename)
+
+        # Proofs saved before the blob store keep a path on local disk.
+        if not proof.blob:
+            try:
+                return self.build_stored_file_response(proof.path, proof.content_type, proof.filename, self.ft_service.data_dir)
+            except FileNotFoundError:
+                raise ProofNotFoundError()
+
+        return self.build_storage_response(proof.blob.key, proof.content_type, proof.filename, proof.blob.size)
+
+    def build_storage_response(self, key: str, mimetype: str, filename: str, size: int=None) -> Response:
+        url = self.storage_service.get_url(key, filename, mimetype)
+        if url:
+            return redirect(url)
+
+        path = self.storage_service.get_local_path(key)
+
+        try:
+            if not path:
+                return self.build_object_response(self.storage_service.open(key), mimetype, filename, size)
+
+            return self.build_stored_file_response(path, mimetype, filename, self.ft_service.data_dir)
+        except FileNotFoundError:
+            raise ProofNotFoundError()
        
     @jwt_required()
     def delete_swtd_proof(self, form_id: int, proof_id: int) -> Response:
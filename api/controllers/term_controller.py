@@ -5,7 +5,7 @@ from flask import Blueprint, request, Response, Flask
 from flask_jwt_extended import jwt_required
 
 from .base_controller import BaseController
-from ..schemas.term_schema import CreateTermSchema, UpdateTermSchema
+from ..schemas.term_schema import CreateTermSchema, UpdateTermSchema, TermSchema
 from ..services import jwt_service, user_service, term_service, auth_service
 
 from ..exceptions.authorization import AuthorizationError
@@ -31,14 +31,13 @@ class TermController(Blueprint, BaseController):
         self.route('/<int:term_id>', methods=['DELETE'])(self.delete_term)
         self.route('/<int:term_id>/<field_name>', methods=['GET'])(self.get_term_property)
 
-    @jwt_required()
+    @auth_service.claims_required()
     def get_all_terms(self) -> Response:
-        requester = self.jwt_service.get_requester()
-
         params = {
             "is_deleted": False,
             **request.args
         }
+        page = self.parse_page(params)
 
         try:    
             if "start_date" in params:
@@ -48,8 +47,8 @@ class TermController(Blueprint, BaseController):
         except Exception:
             raise InvalidDateTimeFormat()
 
-        terms = self.term_service.get_term(lambda q, t: q.filter_by(**params).all())
-        return self.build_response({"terms": [t.to_dict() for t in terms]}, 200)
+        terms = self.term_service.get_term(lambda q, t: q.filter_by(**params), profile="list")
+        return self.build_list_response("terms", terms, TermSchema, page)
 
     @jwt_required()
     def create_term(self) -> Response:
@@ -74,16 +73,14 @@ class TermController(Blueprint, BaseController):
             type=data.get('type').strip().upper()
         )
 
-        return self.build_response({"term": term.to_dict()}, 200)
+        return self.build_response({"term": self.serialize(term, TermSchema)}, 200)
 
-    @jwt_required()
+    @auth_service.claims_required()
     def get_term(self, term_id: int) -> Response:
-        requester = self.jwt_service.get_requester()
-
         term = self.term_service.get_term(lambda q, t: q.filter_by(id=term_id, is_deleted=False).first())
         if not term: raise TermNotFoundError()
 
-        return self.build_response({"term": term.to_dict()}  , 200)
+        return self.build_response({"term": self.serialize(term, TermSchema)}  , 200)
     
     @jwt_required()
     def update_term(self, term_id: int) -> Response:
@@ -110,7 +107,7 @@ class TermController(Blueprint, BaseController):
             data['type'] = data.get('type', '').strip().upper()
 
         term = self.term_service.update_term(term, **data)
-        return self.build_response({"term": term.to_dict()}, 200)
+        return self.build_response({"term": self.serialize(term, TermSchema)}, 200)
 
     @jwt_required()
     def delete_term(self, term_id: int) -> Response:
@@ -146,7 +143,7 @@ class TermController(Blueprint, BaseController):
             if use_list:
                 prop = list(filter(lambda i: hasattr(i, 'is_deleted') and i.is_deleted == False, prop))
 
-            response[field_name] = [o.to_dict() for o in prop] if use_list else prop.to_dict()
+            response[field_name] = self.serialize(prop, view="list", many=use_list)
         except AttributeError:
             if isinstance(prop, datetime):
                 response[field_name] = prop.strftime("%m-%d-%Y %H:%M")
@@ -5,8 +5,9 @@ from flask import Blueprint, request, Response, Flask
 from flask_jwt_extended import jwt_required
 
 from .base_controller import BaseController
-from ..schemas.user_schema import UpdateUserSchema
-from ..services import jwt_service, user_service, auth_service, term_service, ft_service, department_service, password_encoder_service, clearing_service
+from ..schemas.user_schema import UpdateUserSchema, UserSchema
+from ..schemas.clearing_schema import ClearingSchema
+from ..services import jwt_service, user_service, auth_service, term_service, ft_service, department_service, password_encoder_service, clearing_service, table_export_service
 
 from ..exceptions.authorization import AuthorizationError
 from ..exceptions.resource import ResourceNotFoundError, UserNotFoundError, DepartmentNotFoundError, TermNotFoundError, ClearingNotFoundError
@@ -21,6 +22,7 @@ class UserController(Blueprint, BaseController):
         self.auth_service = auth_service
         self.term_service = term_service
         self.ft_service = ft_service
+        self.table_export_service = table_export_service
         self.department_service = department_service
         self.password_encoder_service = password_encoder_service
         self.clearing_service = clearing_service
@@ -46,21 +48,22 @@ class UserController(Blueprint, BaseController):
             raise AuthorizationError("Cannot retrieve user list.")
 
         params = {"is_deleted": False, **request.args}
+        page = self.parse_page(params)
 
-        users = self.user_service.get_user(lambda q, u: q.filter_by(**params).all())
-        return self.build_response({"users": [u.to_dict() for u in users]}, 200)
+        users = self.user_service.get_user(lambda q, u: q.filter_by(**params), profile="list")
+        return self.build_list_response("users", users, UserSchema, page, view="list")
 
     @jwt_required()
     def get_user(self, user_id: int) -> Response:
         requester = self.jwt_service.get_requester()
         
-        user = self.user_service.get_user(lambda q, u: q.filter_by(id=user_id, is_deleted=False).first())
+        user = self.user_service.get_user(lambda q, u: q.filter_by(id=user_id, is_deleted=False).first(), profile="detail")
         if not user: raise UserNotFoundError()
 
         if requester != user and not requester.is_head_of(user) and not self.auth_service.has_permissions(requester, minimum_auth='staff'):
             raise AuthorizationError("Cannot retrieve user data.")
 
-        return self.build_response({"user": user.to_dict()}, 200)
+        return self.build_response({"user": self.serialize(user, UserSchema, view="detail")}, 200)
     
     @jwt_required()
     def update_user(self, user_id: int) -> Response:
@@ -92,8 +95,15 @@ class UserController(Blueprint, BaseController):
             if not department: raise DepartmentNotFoundError()
             data["department"] = department
 
+        token_version = user.token_version
         user = self.user_service.update_user(user, **data)
-        return self.build_response({"user": user.to_dict()}, 200)
+        response = {"user": self.serialize(user, UserSchema, view="detail")}
+
+        # Updating one's own credentials revokes the current token, so hand out a replacement.
+        if requester == user and user.token_version != token_version:
+            response["access_token"] = self.jwt_service.generate_user_token(user)
+
+        return self.build_response(response, 200)
     
     @jwt_required()
     def delete_user(self, user_id: int) -> Response:
@@ -133,20 +143,21 @@ class UserController(Blueprint, BaseController):
     @jwt_required()
     def export_user_swtd_data(self, user_id: int) -> Response:
         requester = jwt_service.get_requester()
+        format = self.parse_export_format()
         
-        user = self.user_service.get_user(lambda q, u: q.filter_by(id=user_id, is_deleted=False).first())
+        user = self.user_service.get_user(lambda q, u: q.filter_by(id=user_id, is_deleted=False).first(), profile="export" if format == "pdf" else None)
         if not user: raise UserNotFoundError()
         
         if requester != user and not self.auth_service.has_permissions(requester, minimum_auth='head'):
             raise AuthorizationError("Cannot export user SWTD data.")
 
-        content = self.ft_service.export_for_employee(requester, user)
+        if format != "pdf":
+            content = self.table_export_service.export_for_employee(format, user)
+            return self.build_stream_response(content, f"{user.employee_id}_SWTDReport.{format}", self.table_export_service.formats[format])
 
-        headers = {
-            'Content-Disposition': f'attachment; filename="{user.employee_id}_SWTDReport.pdf"'
-        }
+        content = self.ft_service.export_for_employee(requester, user)
 
-        return Response(content, mimetype='application/pdf', status=200, headers=headers)
+        return self.build_file_response(content, f"{user.employee_id}_SWTDReport.pdf", 'application/pdf')
         
     @jwt_required()
     def get_user_property(self, user_id: int, field_name: str) -> Response:
@@ -170,7 +181,7 @@ class UserController(Blueprint, BaseController):
             if use_list:
                 prop = list(filter(lambda i: hasattr(i, 'is_deleted') and i.is_deleted == False, prop))
     
-            response[field_name] = [o.to_dict() for o in prop] if use_list else prop.to_dict()
+            response[field_name] = self.serialize(prop, view="list", many=use_list)
         except AttributeError:
             if isinstance(prop, datetime):
                 response[field_name] = prop.strftime("%m-%d-%Y %H:%M")
@@ -200,7 +211,7 @@ class UserController(Blueprint, BaseController):
         
         clearance = self.user_service.grant_clearance(requester, user, term)
 
-        return self.build_response({"clearance": clearance.to_dict()}, 200)
+        return self.build_response({"clearance": self.serialize(clearance, ClearingSchema)}, 200)
     
     @jwt_required()
     def revoke_user_clearance(self, user_id: int, clearance_id: int) -> Response:
@@ -1,3 +1,5 @@
+from werkzeug.exceptions import RequestEntityTooLarge
+
 from .exceptions import APIError
 from .controllers.base_controller import BaseController
 
@@ -6,6 +8,8 @@ build_response = BaseController().build_response
 def handle_exception(e: Exception):
     if isinstance(e, APIError):
         return build_response(e.message, e.status_code)
+    if isinstance(e, RequestEntityTooLarge):
+        return build_response("Request exceeds the maximum size.", 413)
     # if isinstance(e, AccountUnavailableError):
     #     return build_response("Account unavailable.", 403)
     # elif isinstance(e, AuthenticationError):
@@ -15,3 +15,7 @@ class TermAlreadyExistsError(ResourceAlreadyExistsError):
 class DepartmentAlreadyExistsError(ResourceAlreadyExistsError):
     def __init__(self, message="Department already exists."):
         super().__init__(message)
+
+class ReportNotReadyError(APIError):
+    def __init__(self, message="Report is not ready.", status_code=409):
+        super().__init__(message, status_code)
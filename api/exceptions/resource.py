@@ -35,3 +35,7 @@ class DepartmentNotFoundError(ResourceNotFoundError):
 class ClearingNotFoundError(ResourceNotFoundError):
     def __init__(self, message="Clearing not found."):
         super().__init__(message)
+
+class ReportNotFoundError(ResourceNotFoundError):
+    def __init__(self, message="Report not found."):
+        super().__init__(message)
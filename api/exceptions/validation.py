@@ -19,3 +19,7 @@ class InsufficientPointsError(ValidationError):
 class InvalidDateTimeFormat(ValidationError):
     def __init__(self, message="Date/Time format is invalid."):
         super().__init__(message)
+
+class FileTooLargeError(ValidationError):
+    def __init__(self, max_size=0):
+        super().__init__(message=f"File exceeds the maximum size of {max_size} bytes.", status_code=413)
@@ -0,0 +1,32 @@
+from typing import Any
+from datetime import datetime
+
+from .. import db
+
+class Blob(db.Model):
+    __tablename__ = 'tblblobs'
+
+    # Record Information
+    id = db.Column(db.Integer, primary_key=True)
+    date_created = db.Column(db.DateTime, nullable=False, default=datetime.now)
+
+    # Blob Data
+    sha256 = db.Column(db.String(64), nullable=False, unique=True)
+    size = db.Column(db.BigInteger, nullable=False)
+    key = db.Column(db.Text, nullable=False)
+    ref_count = db.Column(db.Integer, nullable=False, default=0)
+    preview_status = db.Column(db.String(16), nullable=True) # DONE, UNSUPPORTED or None while pending
+
+    # Relationships
+    proofs = db.relationship("Proof", foreign_keys="Proof.blob_id", back_populates="blob", lazy=True)
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "id": self.id,
+            "date_created": self.date_created.strftime("%m-%d-%Y %H:%M"),
+
+            "sha256": self.sha256,
+            "size": self.size,
+            "ref_count": self.ref_count,
+            "preview_status": self.preview_status
+        }
@@ -5,11 +5,15 @@ from .. import db
 
 class Clearing(db.Model):
     __tablename__ = 'tblclearings'
+    __table_args__ = (
+        db.Index('ix_clearings_user_term', 'user_id', 'term_id', 'is_deleted'),
+    )
 
     # Record Information
     id = db.Column(db.Integer, primary_key=True)
     date_created = db.Column(db.DateTime, nullable=False, default=datetime.now)
     date_modified = db.Column(db.DateTime, nullable=False, default=datetime.now)
+    revision = db.Column(db.Integer, nullable=False, default=1, server_default='1', onupdate=db.text('revision + 1'))
     is_deleted = db.Column(db.Boolean, nullable=False, default=False)
 
     # Clearing Data
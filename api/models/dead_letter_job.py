@@ -0,0 +1,28 @@
+from typing import Any
+from datetime import datetime
+
+from .. import db
+
+class DeadLetterJob(db.Model):
+    __tablename__ = 'tbldeadletterjobs'
+
+    # Record Information
+    id = db.Column(db.Integer, primary_key=True)
+    date_created = db.Column(db.DateTime, nullable=False, default=datetime.now)
+
+    # Job Data
+    name = db.Column(db.String(255), nullable=False)
+    payload = db.Column(db.JSON, nullable=False)
+    attempts = db.Column(db.Integer, nullable=False)
+    error = db.Column(db.Text, nullable=True)
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "id": self.id,
+            "date_created": self.date_created.strftime("%m-%d-%Y %H:%M"),
+
+            "name": self.name,
+            "payload": self.payload,
+            "attempts": self.attempts,
+            "error": self.error
+        }
@@ -11,6 +11,7 @@ class Department(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     date_created = db.Column(db.DateTime, nullable=False, default=datetime.now)
     date_modified = db.Column(db.DateTime, nullable=False, default=datetime.now)
+    revision = db.Column(db.Integer, nullable=False, default=1, server_default='1', onupdate=db.text('revision + 1'))
     is_deleted = db.Column(db.Boolean, nullable=False, default=False)
 
     # Department Data
@@ -0,0 +1,34 @@
+from typing import Any
+from datetime import datetime
+
+from .. import db
+
+class Job(db.Model):
+    __tablename__ = 'tbljobs'
+
+    # Record Information
+    id = db.Column(db.Integer, primary_key=True)
+    date_created = db.Column(db.DateTime, nullable=False, default=datetime.now)
+    date_modified = db.Column(db.DateTime, nullable=False, default=datetime.now, onupdate=datetime.now)
+
+    # Job Data
+    name = db.Column(db.String(255), nullable=False)
+    payload = db.Column(db.JSON, nullable=False)
+    status = db.Column(db.Enum("QUEUED", "RUNNING"), nullable=False, default="QUEUED")
+    attempts = db.Column(db.Integer, nullable=False, default=0)
+    run_at = db.Column(db.DateTime, nullable=False, default=datetime.now, index=True)
+    last_error = db.Column(db.Text, nullable=True)
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "id": self.id,
+            "date_created": self.date_created.strftime("%m-%d-%Y %H:%M"),
+            "date_modified": self.date_modified.strftime("%m-%d-%Y %H:%M"),
+
+            "name": self.name,
+            "payload": self.payload,
+            "status": self.status,
+            "attempts": self.attempts,
+            "run_at": self.run_at.strftime("%m-%d-%Y %H:%M"),
+            "last_error": self.last_error
+        }
@@ -0,0 +1,82 @@
+from typing import Any, Callable
+
+from sqlalchemy.orm import Query, joinedload, selectinload
+
+from .clearing import Clearing
+from .department import Department
+from .swtd_comment import SWTDComment
+from .swtd_form import SWTDForm
+from .term import Term
+from .user import User
+
+# Named eager-loading profiles per model. Each profile loads the relationships the matching
+# call site will touch, so serializing or exporting the results does not trigger lazy loads.
+LOADING_PROFILES: dict[type, dict[str, Callable[[], list[Any]]]] = {
+    User: {
+        "list": lambda: [
+            joinedload(User.department),
+            joinedload(User.headed_department)
+        ],
+        "detail": lambda: [
+            joinedload(User.department),
+            joinedload(User.headed_department),
+            selectinload(User.clearances).joinedload(Clearing.clearer).joinedload(User.department),
+            selectinload(User.clearances).joinedload(Clearing.term)
+        ],
+        "export": lambda: [
+            joinedload(User.department).joinedload(Department.head),
+            selectinload(User.swtd_forms),
+            selectinload(User.clearances).joinedload(Clearing.term)
+        ]
+    },
+    SWTDForm: {
+        "list": lambda: [
+            joinedload(SWTDForm.author).joinedload(User.department),
+            joinedload(SWTDForm.term)
+        ],
+        "detail": lambda: [
+            joinedload(SWTDForm.author).joinedload(User.department),
+            joinedload(SWTDForm.term),
+            selectinload(SWTDForm.proof)
+        ]
+    },
+    Department: {
+        "list": lambda: [],
+        "detail": lambda: [],
+        "members": lambda: [
+            selectinload(Department.members).joinedload(User.department),
+            selectinload(Department.members).joinedload(User.headed_department)
+        ],
+        "export": lambda: [
+            joinedload(Department.head),
+            selectinload(Department.members).selectinload(User.swtd_forms).joinedload(SWTDForm.term),
+            selectinload(Department.members).selectinload(User.clearances).joinedload(Clearing.term)
+        ]
+    },
+    Term: {
+        "list": lambda: [],
+        "detail": lambda: []
+    },
+    Clearing: {
+        "detail": lambda: [
+            joinedload(Clearing.clearer).joinedload(User.department),
+            joinedload(Clearing.user),
+            joinedload(Clearing.term)
+        ]
+    },
+    SWTDComment: {
+        "detail": lambda: [
+            joinedload(SWTDComment.author).joinedload(User.department)
+        ]
+    }
+}
+
+def apply_loading_profile(query: Query, model: type, profile: str=None) -> Query:
+    if not profile:
+        return query
+
+    profiles = LOADING_PROFILES.get(model, {})
+    if profile not in profiles:
+        raise ValueError(f"Unknown loading profile '{profile}' for {model.__name__}.")
+
+    return query.options(*profiles[profile]())
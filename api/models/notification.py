@@ -5,6 +5,9 @@ from .. import db
 
 class Notification(db.Model):
     __tablename__ = 'tblnotifications'
+    __table_args__ = (
+        db.Index("ix_notifications_target", "target_id", "is_deleted", "date_created"),
+    )
 
     # Record Information
     id = db.Column(db.Integer, primary_key=True)
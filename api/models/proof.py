@@ -14,12 +14,16 @@ class Proof(db.Model):
     path = db.Column(db.Text, nullable=False)
     filename = db.Column(db.Text, nullable=False)
     content_type = db.Column(db.Text, nullable=False)
+    sha256 = db.Column(db.String(64), nullable=True)
+    size = db.Column(db.BigInteger, nullable=True)
 
     # Foreign Key
     swtd_form_id = db.Column(db.Integer, db.ForeignKey("tblswtdforms.id"), nullable=False)
+    blob_id = db.Column(db.Integer, db.ForeignKey("tblblobs.id"), nullable=True)
 
     # Relationships
     swtd_form = db.relationship("SWTDForm", foreign_keys=[swtd_form_id], back_populates="proof", uselist=False, lazy=True)
+    blob = db.relationship("Blob", foreign_keys=[blob_id], back_populates="proofs", uselist=False, lazy=True)
 
     def to_dict(self) -> dict[str, Any]:
         return {
@@ -27,5 +31,7 @@ class Proof(db.Model):
             "date_created": self.date_created.strftime("%m-%d-%Y %H:%M"),
             "path": self.path,
             "filename": self.filename,
-            "content_type": self.content_type
+            "content_type": self.content_type,
+            "sha256": self.sha256,
+            "size": self.size
         }
@@ -0,0 +1,50 @@
+from typing import Any
+from datetime import datetime
+
+from .. import db
+
+class Report(db.Model):
+    __tablename__ = 'tblreports'
+
+    # Record Information
+    id = db.Column(db.Integer, primary_key=True)
+    date_created = db.Column(db.DateTime, nullable=False, default=datetime.now)
+    date_modified = db.Column(db.DateTime, nullable=False, default=datetime.now, onupdate=datetime.now)
+
+    # Report Data
+    type = db.Column(db.Enum("EMPLOYEE", "DEPARTMENT", "STAFF"), nullable=False)
+    status = db.Column(db.Enum("QUEUED", "RUNNING", "DONE", "FAILED"), nullable=False, default="QUEUED")
+    progress = db.Column(db.Float, nullable=False, default=0.0)
+    path = db.Column(db.String(255), nullable=True)
+    filename = db.Column(db.String(255), nullable=True)
+    error = db.Column(db.Text, nullable=True)
+
+    # Foreign Keys
+    requester_id = db.Column(db.Integer, db.ForeignKey('tblusers.id'), nullable=False)
+    user_id = db.Column(db.Integer, db.ForeignKey('tblusers.id'), nullable=True)
+    department_id = db.Column(db.Integer, db.ForeignKey('tbldepartments.id'), nullable=True)
+    term_id = db.Column(db.Integer, db.ForeignKey('tblterms.id'), nullable=True)
+
+    # Relationships
+    requester = db.relationship("User", foreign_keys=[requester_id], uselist=False, lazy=True)
+    user = db.relationship("User", foreign_keys=[user_id], uselist=False, lazy=True)
+    department = db.relationship("Department", uselist=False, lazy=True)
+    term = db.relationship("Term", uselist=False, lazy=True)
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "id": self.id,
+            "date_created": self.date_created.strftime("%m-%d-%Y %H:%M"),
+            "date_modified": self.date_modified.strftime("%m-%d-%Y %H:%M"),
+
+            "type": self.type,
+            "status": self.status,
+            "progress": self.progress,
+            "filename": self.filename,
+            "error": self.error,
+
+            "requester_id": self.requester_id,
+            "user_id": self.user_id,
+            "department_id": self.department_id,
+            "term_id": self.term_id
+        }
@@ -5,11 +5,18 @@ from .. import db
 
 class SWTDForm(db.Model):
     __tablename__ = 'tblswtdforms'
+    __table_args__ = (
+        # Per-author listings and point totals, narrowed by term, deletion and status.
+        db.Index('ix_swtdforms_author_term', 'author_id', 'term_id', 'is_deleted', 'validation_status'),
+        # Per-term reports that group every author's SWTDs.
+        db.Index('ix_swtdforms_term_author', 'term_id', 'author_id'),
+    )
     
     # Record Information
     id = db.Column(db.Integer, primary_key=True)
     date_created = db.Column(db.DateTime, nullable=False, default=datetime.now)
     date_modified = db.Column(db.DateTime, nullable=False, default=datetime.now)
+    revision = db.Column(db.Integer, nullable=False, default=1, server_default='1', onupdate=db.text('revision + 1'))
     is_deleted = db.Column(db.Boolean, nullable=False, default=False)
 
     # Form Data
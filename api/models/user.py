@@ -12,6 +12,7 @@ class User(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     date_created = db.Column(db.DateTime, nullable=False, default=datetime.now)
     date_modified = db.Column(db.DateTime, nullable=False, default=datetime.now)
+    revision = db.Column(db.Integer, nullable=False, default=1, server_default='1', onupdate=db.text('revision + 1'))
     is_deleted = db.Column(db.Boolean, nullable=False, default=False)
 
     # Credentials
@@ -27,6 +28,7 @@ class User(db.Model):
     # Account Information
     is_ms_linked = db.Column(db.Boolean, nullable=False, default=False)
     access_level = db.Column(db.Integer, nullable=False, default=0)
+    token_version = db.Column(db.Integer, nullable=False, default=0)
 
     # Foreign Keys
     department_id = db.Column(db.Integer, db.ForeignKey("tbldepartments.id"))
@@ -0,0 +1,36 @@
+from typing import Any
+from datetime import datetime
+
+from .. import db
+
+class UserTermPoints(db.Model):
+    """Running point totals of a user for a term, kept up to date by PointsLedgerService."""
+    __tablename__ = 'tbluserterm_points'
+
+    # Keys
+    user_id = db.Column(db.Integer, db.ForeignKey('tblusers.id'), primary_key=True)
+    term_id = db.Column(db.Integer, db.ForeignKey('tblterms.id'), primary_key=True)
+
+    # Point Totals (SWTDs that start within the term)
+    valid_points = db.Column(db.Float, nullable=False, default=0)
+    pending_points = db.Column(db.Float, nullable=False, default=0)
+    invalid_points = db.Column(db.Float, nullable=False, default=0)
+
+    # SWTD Counts (every SWTD filed under the term)
+    pending_swtds = db.Column(db.Integer, nullable=False, default=0)
+    invalid_swtds = db.Column(db.Integer, nullable=False, default=0)
+
+    is_cleared = db.Column(db.Boolean, nullable=False, default=False)
+    date_modified = db.Column(db.DateTime, nullable=False, default=datetime.now)
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "user_id": self.user_id,
+            "term_id": self.term_id,
+            "valid_points": self.valid_points,
+            "pending_points": self.pending_points,
+            "invalid_points": self.invalid_points,
+            "pending_swtds": self.pending_swtds,
+            "invalid_swtds": self.invalid_swtds,
+            "is_cleared": self.is_cleared
+        }
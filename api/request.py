@@ -0,0 +1,23 @@
+from typing import IO, Any, Optional
+
+from flask import Request
+
+class APIRequest(Request):
+    """Request that streams uploaded files straight into hashed temporary files under DATA_DIR, in fixed-size chunks."""
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self.uploads = []
+
+    def _get_file_stream(self, total_content_length: Optional[int], content_type: Optional[str], filename: Optional[str]=None, content_length: Optional[int]=None) -> IO[bytes]:
+        from .services import ft_service
+
+        upload = ft_service.create_upload()
+        self.uploads.append(upload)
+        return upload
+
+    def close(self) -> None:
+        super().close()
+
+        # Also removes files from a request whose parsing failed part way, which never reached request.files.
+        for upload in self.uploads:
+            upload.close()
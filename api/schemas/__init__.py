@@ -0,0 +1,8 @@
+from .clearing_schema import ClearingSchema
+from .comment_schema import CommentSchema
+from .department_schema import DepartmentSchema
+from .notification_schema import NotificationSchema
+from .report_schema import ReportSchema
+from .swtd_schema import ProofSchema, SWTDSchema
+from .term_schema import TermSchema
+from .user_schema import UserSchema
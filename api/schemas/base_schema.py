@@ -0,0 +1,63 @@
+from typing import Any, Optional
+
+from marshmallow import Schema, fields, pre_dump
+
+DATETIME_FORMAT = "%m-%d-%Y %H:%M"
+DATE_FORMAT = "%m-%d-%Y"
+
+class Reference(fields.Nested):
+    """Nested entity that collapses to {"id": ...} past the maximum depth or when already serialized."""
+    def _serialize(self, nested_obj: Any, attr: str, obj: Any, **kwargs: dict[str, Any]) -> Any:
+        if nested_obj is None:
+            return None
+
+        if self.many:
+            return [self.serialize_entity(o) for o in nested_obj]
+
+        return self.serialize_entity(nested_obj)
+
+    def serialize_entity(self, entity: Any) -> dict[str, Any]:
+        state = self.context
+        depth = state.get("depth", 0)
+
+        if depth >= state.get("max_depth", 0) or (type(entity), entity.id) in state.get("seen", ()):
+            return {"id": entity.id}
+
+        state["depth"] = depth + 1
+        try:
+            return self.schema.dump(entity, many=False)
+        finally:
+            state["depth"] = depth
+
+class ModelSchema(Schema):
+    __model__ = None
+    registry = {}
+
+    # Named field sets, selected per endpoint. A view of None dumps every field.
+    views: dict[str, Optional[tuple[str, ...]]] = {}
+
+    def __init_subclass__(cls, **kwargs: dict[str, Any]) -> None:
+        super().__init_subclass__(**kwargs)
+
+        if cls.__model__ is not None:
+            ModelSchema.registry[cls.__model__] = cls
+
+    @pre_dump
+    def mark_seen(self, obj: Any, **kwargs: dict[str, Any]) -> Any:
+        self.context.setdefault("seen", set()).add((type(obj), obj.id))
+        return obj
+
+    @classmethod
+    def for_model(cls, model: type) -> Optional[type["ModelSchema"]]:
+        return cls.registry.get(model)
+
+    @classmethod
+    def serialize(cls, obj: Any, view: Optional[str]=None, many: bool=False, max_depth: int=2) -> Any:
+        context = {
+            "depth": 0,
+            "max_depth": max_depth,
+            "seen": set()
+        }
+
+        schema = cls(only=cls.views.get(view), many=many, context=context)
+        return schema.dump(obj)
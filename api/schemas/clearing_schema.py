@@ -0,0 +1,21 @@
+from marshmallow import fields
+
+from .base_schema import ModelSchema, Reference, DATETIME_FORMAT
+from .user_schema import USER_SUMMARY_FIELDS
+from ..models.clearing import Clearing
+
+class ClearingSchema(ModelSchema):
+    __model__ = Clearing
+
+    # Record Information
+    id = fields.Int()
+    date_created = fields.DateTime(format=DATETIME_FORMAT)
+    date_modified = fields.DateTime(format=DATETIME_FORMAT)
+    is_deleted = fields.Bool()
+
+    # Clearing Data
+    applied_points = fields.Float()
+
+    clearer = Reference("UserSchema", only=USER_SUMMARY_FIELDS)
+    user = Reference("UserSchema", only=("id", "firstname", "lastname", "employee_id"))
+    term = Reference("TermSchema", only=("id", "name"))
@@ -1,5 +1,9 @@
 from marshmallow import Schema, fields
 
+from .base_schema import ModelSchema, Reference, DATETIME_FORMAT
+from .user_schema import USER_SUMMARY_FIELDS
+from ..models.swtd_comment import SWTDComment
+
 class CreateCommentSchema(Schema):
     message = fields.Str(required=True)
     author_id = fields.Int(required=True)
@@ -7,3 +11,18 @@ class CreateCommentSchema(Schema):
 
 class UpdateCommentSchema(Schema):
     message = fields.Str(required=True)
+
+class CommentSchema(ModelSchema):
+    __model__ = SWTDComment
+
+    # Record Information
+    id = fields.Int()
+    date_created = fields.DateTime(format=DATETIME_FORMAT)
+    date_modified = fields.DateTime(format=DATETIME_FORMAT)
+    is_deleted = fields.Bool()
+
+    # Comment Data
+    message = fields.Str()
+    is_edited = fields.Bool()
+
+    author = Reference("UserSchema", only=USER_SUMMARY_FIELDS)
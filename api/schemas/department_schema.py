@@ -1,5 +1,8 @@
 from marshmallow import Schema, fields
 
+from .base_schema import ModelSchema, DATETIME_FORMAT
+from ..models.department import Department
+
 class CreateDepartmentSchema(Schema):
     name = fields.Str(required=True)
     required_points = fields.Float(required=True)
@@ -15,3 +18,20 @@ class UpdateDepartmentSchema(Schema):
     use_schoolyear = fields.Bool()
     head_id = fields.Int()
     level = fields.Str()
+
+class DepartmentSchema(ModelSchema):
+    __model__ = Department
+
+    # Record Information
+    id = fields.Int()
+    date_created = fields.DateTime(format=DATETIME_FORMAT)
+    date_modified = fields.DateTime(format=DATETIME_FORMAT)
+    is_deleted = fields.Bool()
+
+    # Department Data
+    name = fields.Str()
+    required_points = fields.Float()
+    level = fields.Str()
+    midyear_points = fields.Float()
+    has_midyear = fields.Bool()
+    use_schoolyear = fields.Bool()
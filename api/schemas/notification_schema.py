@@ -0,0 +1,14 @@
+from marshmallow import fields
+
+from .base_schema import ModelSchema, DATETIME_FORMAT
+from ..models.notification import Notification
+
+class NotificationSchema(ModelSchema):
+    __model__ = Notification
+
+    id = fields.Int()
+    date_created = fields.DateTime(format=DATETIME_FORMAT)
+    is_deleted = fields.Bool()
+
+    data = fields.Raw()
+    is_viewed = fields.Bool()
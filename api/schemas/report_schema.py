@@ -0,0 +1,30 @@
+from marshmallow import Schema, fields, validate
+
+from .base_schema import ModelSchema, DATETIME_FORMAT
+from ..models.report import Report
+
+class CreateReportSchema(Schema):
+    type = fields.Str(required=True, validate=validate.OneOf(["EMPLOYEE", "DEPARTMENT", "STAFF"]))
+    user_id = fields.Int()
+    department_id = fields.Int()
+    term_id = fields.Int()
+
+class ReportSchema(ModelSchema):
+    __model__ = Report
+
+    # Record Information
+    id = fields.Int()
+    date_created = fields.DateTime(format=DATETIME_FORMAT)
+    date_modified = fields.DateTime(format=DATETIME_FORMAT)
+
+    # Report Data
+    type = fields.Str()
+    status = fields.Str()
+    progress = fields.Float()
+    filename = fields.Str()
+    error = fields.Str()
+
+    requester_id = fields.Int()
+    user_id = fields.Int()
+    department_id = fields.Int()
+    term_id = fields.Int()
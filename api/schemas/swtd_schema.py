@@ -1,5 +1,10 @@
 from marshmallow import Schema, fields
 
+from .base_schema import ModelSchema, Reference, DATETIME_FORMAT, DATE_FORMAT
+from .user_schema import USER_SUMMARY_FIELDS
+from ..models.proof import Proof
+from ..models.swtd_form import SWTDForm
+
 class CreateSWTDSchema(Schema):
     title = fields.Str(required=True)
     venue = fields.Str(required=True)
@@ -24,3 +29,49 @@ class UpdateSWTDScehma(Schema):
     validation_status = fields.Str(missing="PENDING")
     validator_id = fields.Int()
     term_id = fields.Int()
+
+class ProofSchema(ModelSchema):
+    __model__ = Proof
+
+    id = fields.Int()
+    date_created = fields.DateTime(format=DATETIME_FORMAT)
+    filename = fields.Str()
+    content_type = fields.Str()
+    sha256 = fields.Str()
+    size = fields.Int()
+
+class SWTDSchema(ModelSchema):
+    __model__ = SWTDForm
+
+    views = {
+        "detail": None,
+        "list": (
+            "id", "date_created", "date_modified", "is_deleted", "title", "venue", "category", "start_date", "end_date",
+            "total_hours", "points", "date_validated", "validation_status", "author", "term"
+        )
+    }
+
+    # Record Information
+    id = fields.Int()
+    date_created = fields.DateTime(format=DATETIME_FORMAT)
+    date_modified = fields.DateTime(format=DATETIME_FORMAT)
+    is_deleted = fields.Bool()
+
+    # Form Data
+    title = fields.Str()
+    venue = fields.Str()
+    category = fields.Str()
+    start_date = fields.Date(format=DATE_FORMAT)
+    end_date = fields.Date(format=DATE_FORMAT)
+    total_hours = fields.Float()
+    points = fields.Float()
+    benefits = fields.Str()
+
+    # Form Validation
+    date_validated = fields.DateTime(format=DATETIME_FORMAT)
+    validation_status = fields.Str()
+
+    # Relationships
+    author = Reference("UserSchema", only=USER_SUMMARY_FIELDS)
+    proof = Reference(ProofSchema, many=True)
+    term = Reference("TermSchema")
@@ -1,5 +1,10 @@
+from datetime import datetime
+
 from marshmallow import Schema, fields
 
+from .base_schema import ModelSchema, DATETIME_FORMAT, DATE_FORMAT
+from ..models.term import Term
+
 class CreateTermSchema(Schema):
     name = fields.Str(required=True)
     start_date = fields.Date(format="%m-%d-%Y", required=True)
@@ -12,3 +17,22 @@ class UpdateTermSchema(Schema):
     start_date = fields.Date(format="%m-%d-%Y")
     end_date = fields.Date(format="%m-%d-%Y")
     type = fields.Str()
+
+class TermSchema(ModelSchema):
+    __model__ = Term
+
+    # Record Information
+    id = fields.Int()
+    date_created = fields.DateTime(format=DATETIME_FORMAT)
+    date_modified = fields.DateTime(format=DATETIME_FORMAT)
+    is_deleted = fields.Bool()
+
+    # Term Data
+    name = fields.Str()
+    start_date = fields.Date(format=DATE_FORMAT)
+    end_date = fields.Date(format=DATE_FORMAT)
+    type = fields.Str()
+    is_ongoing = fields.Method("get_is_ongoing")
+
+    def get_is_ongoing(self, term: Term) -> bool:
+        return term.start_date <= datetime.now().date() and term.end_date >= datetime.now().date()
@@ -1,5 +1,8 @@
 from marshmallow import Schema, fields
 
+from .base_schema import ModelSchema, Reference, DATETIME_FORMAT
+from ..models.user import User
+
 class RegistrationSchema(Schema):
     employee_id = fields.Str(required=True)
     email = fields.Email(required=True)
@@ -28,3 +31,43 @@ class UpdateUserSchema(Schema):
     is_ms_linked = fields.Bool()
     access_level = fields.Int()
     department_id = fields.Int()
+
+USER_SUMMARY_FIELDS = ("id", "employee_id", "firstname", "lastname", "department")
+
+class UserSchema(ModelSchema):
+    __model__ = User
+
+    views = {
+        "detail": None,
+        "list": (
+            "id", "date_created", "date_modified", "is_deleted", "email", "employee_id", "firstname", "lastname",
+            "is_head", "is_staff", "is_superuser", "point_balance", "is_ms_linked", "access_level", "department"
+        ),
+        "summary": USER_SUMMARY_FIELDS
+    }
+
+    # Record Information
+    id = fields.Int()
+    date_created = fields.DateTime(format=DATETIME_FORMAT)
+    date_modified = fields.DateTime(format=DATETIME_FORMAT)
+    is_deleted = fields.Bool()
+
+    # Credentials
+    email = fields.Str()
+
+    # Profile
+    employee_id = fields.Str()
+    firstname = fields.Str()
+    lastname = fields.Str()
+    is_head = fields.Bool()
+    is_staff = fields.Bool()
+    is_superuser = fields.Bool()
+    point_balance = fields.Float()
+
+    # Account Information
+    is_ms_linked = fields.Bool()
+    access_level = fields.Int()
+
+    # Relationships
+    clearances = Reference("ClearingSchema", many=True)
+    department = Reference("DepartmentSchema")
@@ -1,8 +1,16 @@
+import os
+
 from .password_encoder_service import PasswordEncoderService
 from .jwt_service import JWTService
+from .job_service import JobService
+from .template_service import TemplateService
 from .auth_service import AuthService
+from .storage_service import StorageService
+from .blob_service import BlobService
+from .preview_service import PreviewService
 from .ft_service import FTService
 from .mail_service import MailService
+from .points_ledger_service import PointsLedgerService
 from .user_service import UserService
 from .swtd_comment_service import SWTDCommentService
 from .term_service import TermService
@@ -10,18 +18,28 @@ from .swtd_service import SWTDService
 from .notification_service import NotificationService
 from .clearing_service import ClearingService
 from .department_service import DepartmentService
+from .report_service import ReportService
+from .table_export_service import TableExportService
 
 from .. import db, mail, socketio
 
 password_encoder_service = PasswordEncoderService()
-jwt_service = JWTService()
+jwt_service = JWTService(db)
+job_service = JobService(db)
+template_service = TemplateService(os.path.join(os.path.dirname(os.path.dirname(__file__)), "templates", "mail"))
 auth_service = AuthService(password_encoder_service, jwt_service)
-mail_service = MailService(mail, jwt_service)
+mail_service = MailService(mail, jwt_service, job_service, template_service)
 clearing_service = ClearingService(db)
-user_service = UserService(db, clearing_service)
+points_ledger_service = PointsLedgerService(db)
+user_service = UserService(db, clearing_service, jwt_service, points_ledger_service)
 swtd_comment_service = SWTDCommentService(db)
 term_service = TermService(db)
-ft_service = FTService(db, term_service, clearing_service, user_service)
-swtd_service = SWTDService(db, term_service)
+storage_service = StorageService()
+blob_service = BlobService(db, storage_service)
+preview_service = PreviewService(db, job_service, storage_service)
+ft_service = FTService(db, term_service, clearing_service, user_service, blob_service, preview_service)
+swtd_service = SWTDService(db, term_service, points_ledger_service)
 notification_service = NotificationService(db, socketio, term_service, user_service, mail_service)
 department_service = DepartmentService(db)
+table_export_service = TableExportService(db)
+report_service = ReportService(db, socketio, job_service, ft_service, user_service, department_service, term_service)
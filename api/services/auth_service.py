@@ -1,25 +1,53 @@
-from typing import Union
+from functools import wraps
+from typing import Any, Callable, Union
+
+from flask_jwt_extended import jwt_required, get_jwt
 
 from ..models.user import User
 from ..services.password_encoder_service import PasswordEncoderService
 from ..services.jwt_service import JWTService
 
+from ..exceptions.authorization import AuthorizationError
+
 class AuthService:
     def __init__(self, password_encoder_service: PasswordEncoderService, jwt_service: JWTService) -> None:
         self.password_encoder_service = password_encoder_service
         self.jwt_service = jwt_service
 
+    auth_levels = {
+        "head": 1,
+        "staff": 2,
+        "superuser": 3
+    }
+
     def has_permissions(self, user: User, minimum_auth: str, min_access_level: int=0) -> bool:
-        auth_levels = {
-            "head": 1,
-            "staff": 2,
-            "superuser": 3
-        }
+        return user.access_level >= self.auth_levels.get(minimum_auth, min_access_level)
+
+    def claims_required(self, minimum_auth: str=None, min_access_level: int=0) -> Callable:
+        """Like jwt_required(), but also enforces the access level from the token claims without a user lookup."""
+        def decorator(fn: Callable) -> Callable:
+            @wraps(fn)
+            @jwt_required()
+            def wrapper(*args: Any, **kwargs: Any) -> Any:
+                claims = get_jwt()
+
+                # Tokens issued before access levels were embedded fall back to a lookup.
+                if "access_level" in claims:
+                    access_level = claims.get("access_level")
+                else:
+                    access_level = self.jwt_service.get_requester().access_level
+
+                if access_level < self.auth_levels.get(minimum_auth, min_access_level):
+                    raise AuthorizationError()
+
+                return fn(*args, **kwargs)
+
+            return wrapper
 
-        return user.access_level >= auth_levels.get(minimum_auth, min_access_level)
+        return decorator
 
     def login(self, user: User, password: str) -> Union[str, None]:
         if user.is_deleted or not self.password_encoder_service.check_password(user.password, password):
             return None
 
-        return self.jwt_service.generate_token(user.email)
+        return self.jwt_service.generate_user_token(user)
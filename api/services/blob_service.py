@@ -0,0 +1,66 @@
+from typing import Callable, Iterable, Optional
+
+from flask_sqlalchemy import SQLAlchemy
+from sqlalchemy import update, delete
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Query
+
+from ..models.blob import Blob
+
+from ..services.storage_service import StorageService
+
+class BlobService:
+    """Content-addressed file store. Each distinct file is kept once in storage and shared by reference count."""
+    def __init__(self, db: SQLAlchemy, storage_service: StorageService) -> None:
+        self.db = db
+        self.storage_service = storage_service
+
+    def get_blob(self, filter_func: Callable[[Query, Blob], Iterable]) -> Blob:
+        return filter_func(Blob.query, Blob)
+
+    def get_key(self, sha256: str) -> str:
+        return f"blobs/{sha256[:2]}/{sha256[2:4]}/{sha256}"
+
+    def store(self, sha256: str, size: int, source: str, move: bool=False) -> tuple[Blob, bool]:
+        """Adds a reference to the blob with this hash, putting the file at source in storage if there is none yet.
+
+        Returns the blob and whether this call created it. The caller commits, and deletes the object of a created
+        blob if the transaction is rolled back.
+        """
+        blob = self.get_blob(lambda q, b: q.filter_by(sha256=sha256).first())
+
+        if blob:
+            self.add_reference(blob)
+            return blob, False
+
+        key = self.get_key(sha256)
+        self.storage_service.put(key, source, move)
+
+        blob = Blob(sha256=sha256, size=size, key=key, ref_count=1)
+
+        try:
+            with self.db.session.begin_nested():
+                self.db.session.add(blob)
+        except IntegrityError:
+            # Stored by a concurrent request in the meantime. The content is identical, so its object can be shared.
+            blob = self.get_blob(lambda q, b: q.filter_by(sha256=sha256).one())
+            self.add_reference(blob)
+            return blob, False
+
+        return blob, True
+
+    def add_reference(self, blob: Blob) -> None:
+        # Incremented in SQL so concurrent uploads of the same file cannot lose a reference.
+        self.db.session.execute(update(Blob).where(Blob.id == blob.id).values(ref_count=Blob.ref_count + 1))
+        self.db.session.expire(blob, ["ref_count"])
+
+    def release(self, blob: Blob) -> Optional[str]:
+        """Drops a reference and deletes the row once none are left. Returns the key to delete after the commit, if any."""
+        self.db.session.execute(update(Blob).where(Blob.id == blob.id).values(ref_count=Blob.ref_count - 1))
+        deleted = self.db.session.execute(delete(Blob).where(Blob.id == blob.id, Blob.ref_count <= 0)).rowcount
+
+        if not deleted:
+            self.db.session.expire(blob, ["ref_count"])
+            return None
+
+        return blob.key
@@ -2,9 +2,11 @@ from typing import Any, Callable, Iterable
 from datetime import datetime
 
 from flask_sqlalchemy import SQLAlchemy
+from sqlalchemy import insert
 from sqlalchemy.orm import Query
 
 from ..models.clearing import Clearing
+from ..models.loading_profile import apply_loading_profile
 
 from ..exceptions.validation import InvalidParameterError
 
@@ -25,8 +27,16 @@ class ClearingService(object):
         self.db.session.commit()
         return clearing
 
-    def get_clearing(self, filter_func: Callable[[Query, Clearing], Iterable]) -> Clearing:
-        return filter_func(Clearing.query, Clearing)
+    def create_clearings(self, rows: list[dict[str, Any]]) -> None:
+        """Inserts the clearings in one statement. Mapper events do not fire for them, and the caller commits."""
+        if not rows:
+            return
+
+        now = datetime.now()
+        self.db.session.execute(insert(Clearing.__table__), [{"date_created": now, "date_modified": now, **row} for row in rows])
+
+    def get_clearing(self, filter_func: Callable[[Query, Clearing], Iterable], profile: str=None) -> Clearing:
+        return filter_func(apply_loading_profile(Clearing.query, Clearing, profile), Clearing)
 
     def update_clearing(self, clearing: Clearing, **data: dict[str, Any]) -> Clearing:
         for key, value in data.items():
@@ -6,6 +6,7 @@ from sqlalchemy.orm import Query
 from sqlalchemy import delete
 
 from ..models.department import Department
+from ..models.loading_profile import apply_loading_profile
 from ..models.assoc_table import department_head
 
 from ..exceptions.validation import InvalidParameterError
@@ -27,8 +28,8 @@ class DepartmentService(object):
         self.db.session.commit()
         return department
 
-    def get_department(self, filter_func: Callable[[Query, Department], Iterable]):
-        return filter_func(Department.query, Department)
+    def get_department(self, filter_func: Callable[[Query, Department], Iterable], profile: str=None):
+        return filter_func(apply_loading_profile(Department.query, Department, profile), Department)
 
     def update_department(self, department: Department, **data: dict[str, Any]) -> Department:
         for key, value in data.items():
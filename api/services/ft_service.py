@@ -1,12 +1,26 @@
 import os
-from datetime import datetime
-from typing import Any, Callable, Iterable
+import json
+import shutil
+import hashlib
+import tempfile
+import zipfile
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+from datetime import date, datetime
+from typing import IO, Any, Callable, Iterable, Iterator, Optional
 
 from reportlab.lib.pagesizes import A4
 from reportlab.pdfgen import canvas
 from reportlab.lib import colors
 from reportlab.lib.units import mm
+from reportlab.lib.rl_accel import fp_str
+from reportlab.pdfbase import pdfmetrics
+from reportlab.pdfbase.ttfonts import TTFont, SUBSETN, FF_SYMBOLIC, FF_NONSYMBOLIC, makeToUnicodeCMap
+import reportlab
 from werkzeug.datastructures import FileStorage
+from werkzeug.utils import secure_filename
+from sqlalchemy import select, func, true
 from sqlalchemy.orm import Query
 import io
 
@@ -14,17 +28,40 @@ from ..models.proof import Proof
 from ..models.user import User
 from ..models.department import Department
 from ..models.term import Term
+from ..models.swtd_form import SWTDForm
+from ..models.clearing import Clearing
+from ..models.point_summary import PointSummary
 
-class PDFComposer:
-    def __init__(self):
+from ..services.storage_service import hash_file
+
+from ..exceptions.validation import FileTooLargeError
+
+# Vera Sans ships with reportlab. PDF_FONT can point to a font with wider coverage, e.g. DejaVu Sans or Noto Sans.
+DEFAULT_PDF_FONT = os.path.join(os.path.dirname(reportlab.__file__), "fonts", "Vera.ttf")
+
+pdf_fonts = {}
+
+def get_pdf_font(path: str) -> TTFont:
+    """Loads the TrueType font at path and registers it with reportlab, once per process."""
+    if path not in pdf_fonts:
+        font = TTFont(f"PDFFont-{hashlib.sha1(path.encode()).hexdigest()[:8]}", path)
+        pdfmetrics.registerFont(font)
+        pdf_fonts[path] = font
+
+    return pdf_fonts[path]
+
+class BasePDFComposer:
+    """Page layout shared by the PDF composers: margins, line advance, pagination and word wrapping.
+
+    Subclasses draw with write_line and write_rule, start pages in add_new_page and finalize the document in get_pdf.
+    """
+    def __init__(self, font_path: str=DEFAULT_PDF_FONT):
+        self.font = get_pdf_font(font_path)
         self.page_width, self.page_height = A4
         self.margin = 20 * mm  # margin of 20mm
         self.y_position = self.page_height - self.margin
-        self.buffer = io.BytesIO()  # Buffer to hold the PDF content in memory
-        self.canvas = canvas.Canvas(self.buffer, pagesize=A4)
         self.line_height = 14  # Line height for text
         self.font_size = 12
-        self.canvas.setFont("Helvetica", self.font_size)
 
     def add_text(self, text):
         """Add text to the PDF and handle pagination if necessary."""
@@ -32,15 +69,9 @@ class PDFComposer:
         for line in lines:
             if self.y_position <= self.margin:  # Check if we need a new page
                 self.add_new_page()
-            self.canvas.drawString(self.margin, self.y_position, line)
+            self.write_line(line)
             self.y_position -= self.line_height
 
-    def add_new_page(self):
-        """Handles adding a new page and resetting the y-position."""
-        self.canvas.showPage()
-        self.y_position = self.page_height - self.margin
-        self.canvas.setFont("Helvetica", self.font_size)
-
     def add_paragraph(self, paragraph, max_width=None):
         """Add a paragraph that wraps text within the page width."""
         if max_width is None:
@@ -51,7 +82,7 @@ class PDFComposer:
         line = ""
         for word in words:
             test_line = line + word + " "
-            if self.canvas.stringWidth(test_line, "Helvetica", self.font_size) < max_width:
+            if self.font.stringWidth(test_line, self.font_size) < max_width:
                 line = test_line
             else:
                 self.add_text(line.rstrip())
@@ -62,9 +93,42 @@ class PDFComposer:
         """Draws a horizontal line."""
         if self.y_position <= self.margin:
             self.add_new_page()
+        self.write_rule()
+        self.y_position -= self.line_height
+
+    def write_line(self, line):
+        """Draws one line of text at the current position."""
+        raise NotImplementedError()
+
+    def write_rule(self):
+        """Draws a horizontal rule across the page at the current position."""
+        raise NotImplementedError()
+
+    def add_new_page(self):
+        raise NotImplementedError()
+
+    def get_pdf(self):
+        raise NotImplementedError()
+
+class PDFComposer(BasePDFComposer):
+    def __init__(self, font_path: str=DEFAULT_PDF_FONT):
+        super().__init__(font_path)
+        self.buffer = io.BytesIO()  # Buffer to hold the PDF content in memory
+        self.canvas = canvas.Canvas(self.buffer, pagesize=A4)
+        self.canvas.setFont(self.font.fontName, self.font_size)
+
+    def write_line(self, line):
+        self.canvas.drawString(self.margin, self.y_position, line)
+
+    def write_rule(self):
         self.canvas.setStrokeColor(colors.black)
         self.canvas.line(self.margin, self.y_position, self.page_width - self.margin, self.y_position)
-        self.y_position -= self.line_height
+
+    def add_new_page(self):
+        """Handles adding a new page and resetting the y-position."""
+        self.canvas.showPage()
+        self.y_position = self.page_height - self.margin
+        self.canvas.setFont(self.font.fontName, self.font_size)
 
     def get_pdf(self):
         """Finalize the PDF and return the buffer content."""
@@ -72,13 +136,280 @@ class PDFComposer:
         self.buffer.seek(0)  # Move to the beginning of the buffer
         return self.buffer
 
+class StreamingPDFComposer(BasePDFComposer):
+    """PDFComposer that writes each finished page to a spooled temporary file, so only the current page is kept in memory.
+
+    Like reportlab, text is encoded into 256-character subsets of the TrueType font, which are embedded after the last
+    page with a ToUnicode map so the text can be copied and searched.
+    """
+    # Object numbers reserved for the objects written after the last page.
+    CATALOG_ID, PAGES_ID, RESOURCES_ID = 1, 2, 3
+
+    def __init__(self, spool_size: int=1024 * 1024, font_path: str=DEFAULT_PDF_FONT):
+        super().__init__(font_path)
+
+        self.output = tempfile.SpooledTemporaryFile(max_size=spool_size)
+        self.offsets = {}
+        self.page_ids = []
+        self.next_id = self.RESOURCES_ID + 1
+        self.page = []
+
+        self.write(b"%PDF-1.4\n%\xe2\xe3\xcf\xd3\n")
+
+    def write(self, data: bytes) -> None:
+        self.output.write(data)
+
+    def write_object(self, object_id: int, body: bytes) -> None:
+        self.offsets[object_id] = self.output.tell()
+        self.write(f"{object_id} 0 obj\n".encode() + body + b"\nendobj\n")
+
+    def write_stream(self, object_id: int, data: bytes, entries: bytes=b"") -> None:
+        self.write_object(object_id, b"<< /Length %d%s >>\nstream\n%s\nendstream" % (len(data), entries, data))
+
+    def new_id(self) -> int:
+        object_id = self.next_id
+        self.next_id += 1
+        return object_id
+
+    def escape(self, data: bytes) -> bytes:
+        """Escapes subset codes for a PDF string. Codes outside printable ASCII are written as octal escapes."""
+        return b"".join(
+            (b"\\" + bytes([c]) if c in b"\\()" else bytes([c])) if 32 <= c < 127 else b"\\%03o" % c
+            for c in data
+        )
+
+    def write_line(self, line):
+        text = b"".join(
+            b"/F%d %d Tf (%s) Tj " % (subset + 1, self.font_size, self.escape(data))
+            for subset, data in self.font.splitString(line, self)
+        )
+        self.page.append(b"BT %.2f %.2f Td %sET\n" % (self.margin, self.y_position, text))
+
+    def write_rule(self):
+        self.page.append(b"0 0 0 RG %.2f %.2f m %.2f %.2f l S\n" % (self.margin, self.y_position, self.page_width - self.margin, self.y_position))
+
+    def add_new_page(self):
+        """Writes out the current page and starts a new one."""
+        self.flush_page()
+        self.y_position = self.page_height - self.margin
+
+    def flush_page(self):
+        if not self.page:
+            return
+
+        content_id, page_id = self.new_id(), self.new_id()
+
+        self.write_stream(content_id, b"".join(self.page))
+        self.write_object(page_id, (
+            f"<< /Type /Page /Parent {self.PAGES_ID} 0 R /MediaBox [0 0 {self.page_width:.2f} {self.page_height:.2f}] "
+            f"/Resources {self.RESOURCES_ID} 0 R /Contents {content_id} 0 R >>"
+        ).encode())
+
+        self.page_ids.append(page_id)
+        self.page = []
+
+    def get_pdf(self):
+        """Finalize the PDF and return the file, positioned at the start."""
+        self.flush_page()
+
+        # Like reportlab, an empty document still gets one blank page.
+        if not self.page_ids:
+            self.page.append(b"")
+            self.flush_page()
+
+        kids = " ".join(f"{page_id} 0 R" for page_id in self.page_ids)
+        fonts = " ".join(f"/F{n + 1} {font_id} 0 R" for n, font_id in enumerate(self.write_fonts()))
+        self.write_object(self.RESOURCES_ID, f"<< /Font << {fonts} >> >>".encode())
+        self.write_object(self.PAGES_ID, f"<< /Type /Pages /Kids [{kids}] /Count {len(self.page_ids)} >>".encode())
+        self.write_object(self.CATALOG_ID, f"<< /Type /Catalog /Pages {self.PAGES_ID} 0 R >>".encode())
+
+        xref_offset = self.output.tell()
+        self.write(f"xref\n0 {self.next_id}\n0000000000 65535 f \n".encode())
+        for object_id in range(1, self.next_id):
+            self.write(b"%010d 00000 n \n" % self.offsets[object_id])
+
+        self.write(f"trailer\n<< /Size {self.next_id} /Root {self.CATALOG_ID} 0 R >>\nstartxref\n{xref_offset}\n%%EOF\n".encode())
+
+        self.output.seek(0)
+        return self.output
+
+    def write_fonts(self) -> list[int]:
+        """Embeds the font subsets used by the document and returns their object numbers."""
+        state = self.font.state.pop(self, None)
+        if not state:
+            return []
+
+        face = self.font.face
+        flags = face.flags & ~FF_NONSYMBOLIC | FF_SYMBOLIC
+        font_ids = []
+        for n, subset in enumerate(state.subsets):
+            font_id, descriptor_id, file_id, cmap_id = (self.new_id() for _ in range(4))
+            base_font = (SUBSETN(n) + b"+" + face.name + face.subfontNameX).decode("latin-1")
+
+            font_file = face.makeSubset(subset)
+            self.write_stream(file_id, font_file, b" /Length1 %d" % len(font_file))
+            self.write_stream(cmap_id, makeToUnicodeCMap(base_font, subset).encode("latin-1"))
+            self.write_object(descriptor_id, (
+                f"<< /Type /FontDescriptor /FontName /{base_font} /Flags {flags} /FontBBox [{fp_str(*face.bbox)}] "
+                f"/ItalicAngle {fp_str(face.italicAngle)} /Ascent {fp_str(face.ascent)} /Descent {fp_str(face.descent)} "
+                f"/CapHeight {fp_str(face.capHeight)} /StemV {fp_str(face.stemV)} /MissingWidth {fp_str(face.defaultWidth)} "
+                f"/FontFile2 {file_id} 0 R >>"
+            ).encode())
+            self.write_object(font_id, (
+                f"<< /Type /Font /Subtype /TrueType /BaseFont /{base_font} /FirstChar 0 /LastChar {len(subset) - 1} "
+                f"/Widths [{fp_str(*map(face.getCharWidth, subset))}] /FontDescriptor {descriptor_id} 0 R /ToUnicode {cmap_id} 0 R >>"
+            ).encode())
+            font_ids.append(font_id)
+
+        return font_ids
+
+def remove_file(path: str) -> None:
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+def remove_empty_dirs(path: str, root: str) -> None:
+    """Removes path and its parents while they are empty, stopping at root."""
+    root = os.path.abspath(root)
+    path = os.path.abspath(path)
+
+    while path.startswith(root + os.sep):
+        try:
+            os.rmdir(path)
+        except OSError:
+            break
+
+        path = os.path.dirname(path)
+
+class UploadFile:
+    """Temporary file that receives an upload in chunks, hashing it and enforcing the size limit as it is written."""
+    chunk_size = 64 * 1024
+
+    def __init__(self, directory: str, max_size: int) -> None:
+        fd, self.path = tempfile.mkstemp(dir=directory, suffix=".upload")
+        self.file = os.fdopen(fd, "w+b")
+        self.max_size = max_size
+        self.size = 0
+        self.hash = hashlib.sha256()
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.file, name)
+
+    @property
+    def sha256(self) -> str:
+        return self.hash.hexdigest()
+
+    def write(self, data: bytes) -> int:
+        self.size += len(data)
+
+        if self.max_size and self.size > self.max_size:
+            self.close()
+            raise FileTooLargeError(self.max_size)
+
+        self.hash.update(data)
+        return self.file.write(data)
+
+    def close(self) -> None:
+        self.file.close()
+
+        # Already gone if storage took the file over.
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
+
+class ReportCache:
+    """Size-bounded LRU cache of generated reports on disk, addressed by a hash of the report key."""
+    def __init__(self, path: str, max_size: int) -> None:
+        self.path = path
+        self.max_size = max_size
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_size > 0
+
+    def get_path(self, key: tuple) -> str:
+        digest = hashlib.sha256(json.dumps(key, default=str).encode()).hexdigest()
+        return os.path.join(self.path, f"{digest}.pdf")
+
+    def get(self, key: tuple) -> Optional[IO[bytes]]:
+        path = self.get_path(key)
+
+        try:
+            content = open(path, "rb")
+
+            # The modification time doubles as the last access time for eviction.
+            os.utime(path)
+        except FileNotFoundError:
+            return None
+
+        return content
+
+    def put(self, key: tuple, content: IO[bytes]) -> None:
+        os.makedirs(self.path, exist_ok=True)
+
+        # Written to a temporary file first so readers never see a partial report.
+        fd, tmp_path = tempfile.mkstemp(dir=self.path, suffix=".tmp")
+        with os.fdopen(fd, "wb") as f:
+            shutil.copyfileobj(content, f)
+
+        os.replace(tmp_path, self.get_path(key))
+        self.evict()
+
+    def evict(self) -> None:
+        entries = []
+        for entry in os.scandir(self.path):
+            if entry.name.endswith(".pdf"):
+                stat = entry.stat()
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+
+        total_size = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total_size <= self.max_size:
+                break
+
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+
+            total_size -= size
+
+    def get_or_create(self, key: tuple, build: Callable[[], IO[bytes]]) -> IO[bytes]:
+        if not self.enabled:
+            return build()
+
+        content = self.get(key)
+        if content:
+            return content
+
+        content = build()
+        self.put(key, content)
+
+        content.seek(0)
+        return content
+
 class FTService:
-    def __init__(self, db, term_service, clearing_service, user_service):
+    def __init__(self, db, term_service, clearing_service, user_service, blob_service, preview_service):
         self.data_dir = os.getenv('DATA_DIR', os.path.abspath('data'))
+        self.report_cache = ReportCache(
+            os.path.join(self.data_dir, "report_cache"),
+            max_size=int(os.getenv("REPORT_CACHE_SIZE", 256 * 1024 * 1024))
+        )
+        self.pdf_streaming = os.getenv("PDF_STREAMING", "true").lower() in ("true", "1")
+        self.pdf_spool_size = int(os.getenv("PDF_SPOOL_SIZE", 1024 * 1024))
+        self.pdf_font = os.getenv("PDF_FONT", DEFAULT_PDF_FONT)
+        self.report_workers = int(os.getenv("REPORT_WORKERS", os.cpu_count() or 1))
+        self.report_pool = None
+        self.report_pool_pid = None
+        self.max_upload_size = int(os.getenv("MAX_UPLOAD_FILE_SIZE", 10 * 1024 * 1024))
         self.db = db
         self.term_service = term_service
         self.clearing_service = clearing_service
         self.user_service = user_service
+        self.blob_service = blob_service
+        self.preview_service = preview_service
 
     def create_proof(self, **data: dict[str, Any]) -> Proof:
         proof = Proof(
@@ -96,34 +427,68 @@ class FTService:
         return filter_func(Proof.query, Proof)
 
     def save(self, user_id: int, swtd_id: int, file: FileStorage) -> Proof:
-        user_fp = os.path.join(self.data_dir, str(user_id))
+        return self.save_proofs(user_id, swtd_id, [file])[0]
 
-        if not os.path.exists(user_fp):
-            os.mkdir(user_fp)
+    def save_proofs(self, user_id: int, swtd_id: int, files: list[FileStorage]) -> list[Proof]:
+        """Stores each upload in the blob store and creates their proofs in a single commit.
 
-        user_swtd_fp = os.path.join(user_fp, str(swtd_id))
+        Files already stored by another proof are shared rather than written again.
+        """
+        uploads = [self.receive_upload(file) for file in files]
+        proofs = []
+        created = []
 
-        if not os.path.exists(user_swtd_fp):
-            os.mkdir(user_swtd_fp)
+        try:
+            for file, upload in zip(files, uploads):
+                upload.flush()
 
-        proof = self.create_proof(
-            path=os.path.join(user_swtd_fp, file.filename),
-            filename=file.filename,
-            content_type=file.content_type,
-            swtd_form_id=swtd_id
-        )
+                blob, is_new = self.blob_service.store(upload.sha256, upload.size, upload.path, move=True)
+                if is_new:
+                    created.append(blob.key)
+                    self.preview_service.enqueue(blob)
 
-        user_swtd_proof_fp = os.path.join(user_swtd_fp, str(proof.id))
+                proof = Proof(
+                    path=blob.key,
+                    filename=file.filename,
+                    content_type=file.content_type,
+                    sha256=upload.sha256,
+                    size=upload.size,
+                    swtd_form_id=swtd_id,
+                    blob=blob
+                )
 
-        if not os.path.exists(user_swtd_proof_fp):
-            os.mkdir(user_swtd_proof_fp)
+                self.db.session.add(proof)
+                proofs.append(proof)
 
-        fp = os.path.join(user_swtd_proof_fp, file.filename)
+            self.db.session.commit()
+        except Exception:
+            self.db.session.rollback()
 
-        proof = self.update_proof(proof, path=fp)
+            for key in created:
+                self.blob_service.storage_service.delete(key)
 
-        file.save(fp)
-        return proof
+            raise
+        finally:
+            for upload in uploads:
+                upload.close()
+
+        return proofs
+
+    def create_upload(self) -> "UploadFile":
+        # Kept under DATA_DIR so the final rename stays on the same filesystem.
+        directory = os.path.join(self.data_dir, "uploads")
+        os.makedirs(directory, exist_ok=True)
+
+        return UploadFile(directory, self.max_upload_size)
+
+    def receive_upload(self, file: FileStorage) -> "UploadFile":
+        """Returns the upload the request parser already streamed to disk, or copies the file in chunks."""
+        if isinstance(file.stream, UploadFile):
+            return file.stream
+
+        upload = self.create_upload()
+        shutil.copyfileobj(file.stream, upload, UploadFile.chunk_size)
+        return upload
 
     def update_proof(self, proof: Proof, **data: dict[str, Any]) -> Proof:
         for key, value in data.items():
@@ -136,17 +501,144 @@ class FTService:
         return proof
 
     def delete_proof(self, proof: Proof):
-        try:
-            os.remove(proof.path)  # Remove only the specific file
-            self.db.session.delete(proof)  # Optionally, remove the proof entry from the database
-            self.db.session.commit()  # Commit the changes to the database
-        except FileNotFoundError:
-            print(f"File {proof.path} not found.")
-        except Exception as e:
-            print(f"Error removing file: {e}")
-        
-    def export_for_employee(self, requester: User, user: User) -> io.BytesIO:
-        pdf = PDFComposer()
+        blob = proof.blob
+
+        self.db.session.delete(proof)
+        self.db.session.flush()
+
+        key = self.blob_service.release(blob) if blob else None
+        self.db.session.commit()
+
+        if key:
+            self.blob_service.storage_service.delete(key)
+            self.preview_service.delete_previews(key)
+        elif not blob:
+            # Proofs saved before the blob store own their file outright.
+            remove_file(proof.path)
+
+    def dedupe_proofs(self, batch_size: int=100, dry_run: bool=False) -> dict[str, int]:
+        """Moves proofs saved before the blob store into it. Duplicate files are folded into one shared blob."""
+        stats = {"proofs": 0, "blobs": 0, "duplicates": 0, "missing": 0, "bytes_reclaimed": 0}
+        seen = set()
+        last_id = 0
+
+        while True:
+            proofs = self.get_proof(lambda q, p: q.filter(p.blob_id == None, p.id > last_id).order_by(p.id).limit(batch_size).all())
+            if not proofs:
+                break
+
+            last_id = proofs[-1].id
+            created, duplicates = [], []
+
+            try:
+                for proof in proofs:
+                    if not os.path.isfile(proof.path):
+                        stats["missing"] += 1
+                        continue
+
+                    sha256, size = proof.sha256, proof.size
+                    if not sha256 or size is None:
+                        sha256, size = hash_file(proof.path)
+
+                    stats["proofs"] += 1
+                    is_duplicate = sha256 in seen or self.blob_service.get_blob(lambda q, b: q.filter_by(sha256=sha256).first()) is not None
+                    seen.add(sha256)
+
+                    if is_duplicate:
+                        stats["duplicates"] += 1
+                        stats["bytes_reclaimed"] += size
+                    else:
+                        stats["blobs"] += 1
+
+                    if dry_run:
+                        continue
+
+                    # Linked or uploaded rather than moved, so the original stays in place until the commit.
+                    blob, is_new = self.blob_service.store(sha256, size, proof.path)
+                    (created if is_new else duplicates).append((proof.path, blob.key))
+
+                    if is_new:
+                        self.preview_service.enqueue(blob)
+
+                    proof.blob = blob
+                    proof.path = blob.key
+                    proof.sha256 = sha256
+                    proof.size = size
+
+                self.db.session.commit()
+            except Exception:
+                self.db.session.rollback()
+
+                for _, key in created:
+                    self.blob_service.storage_service.delete(key)
+
+                raise
+
+            for source, _ in created + duplicates:
+                remove_file(source)
+                remove_empty_dirs(os.path.dirname(source), self.data_dir)
+
+        return stats
+
+    def create_composer(self) -> Any:
+        if self.pdf_streaming:
+            return StreamingPDFComposer(spool_size=self.pdf_spool_size, font_path=self.pdf_font)
+
+        return PDFComposer(font_path=self.pdf_font)
+
+    def get_data_version(self, user_ids: Any, term: Term=None) -> str:
+        """Fingerprint of the rows that feed a report. Any change to them produces a new version.
+
+        Every UPDATE increments a row's revision, so the sum of revisions changes even when two writes land within the
+        precision of date_modified. The count and sum of ids catch inserted, deleted and reassigned rows.
+        """
+        swtd_filter = [SWTDForm.author_id.in_(user_ids)]
+        clearing_filter = [Clearing.user_id.in_(user_ids)]
+
+        if term:
+            swtd_filter.append(SWTDForm.term_id == term.id)
+            clearing_filter.append(Clearing.term_id == term.id)
+
+        # Each aggregate returns a single row, so selecting from all three yields one row.
+        swtds = select(func.count(SWTDForm.id), func.sum(SWTDForm.id), func.sum(SWTDForm.revision)).where(*swtd_filter).subquery()
+        clearings = select(func.count(Clearing.id), func.sum(Clearing.id), func.sum(Clearing.revision)).where(*clearing_filter).subquery()
+        users = select(func.count(User.id), func.sum(User.id), func.sum(User.revision)).where(User.id.in_(user_ids)).subquery()
+
+        version = self.db.session.execute(
+            select(swtds, clearings, users).select_from(swtds.join(clearings, true()).join(users, true()))
+        ).one()
+        return hashlib.sha256(repr(tuple(version)).encode()).hexdigest()
+
+    def get_report_key(self, report_type: str, subject_id: int, term: Optional[Term], requester: User, version: str) -> tuple:
+        # Reports print the generation date and whether terms are ongoing, so entries only live for the day.
+        return (report_type, subject_id, term.id if term else None, requester.id, requester.revision, version, date.today().isoformat())
+
+    def export_for_employee(self, requester: User, user: User, progress: Callable[[float], None]=None) -> IO[bytes]:
+        key = self.get_report_key("EMPLOYEE", user.id, None, requester, self.get_employee_version(user))
+        return self.report_cache.get_or_create(key, lambda: self.build_employee_report(requester, user, progress))
+
+    def export_for_head(self, requester: User, department: Department, term: Term, progress: Callable[[float], None]=None) -> IO[bytes]:
+        key = self.get_report_key("DEPARTMENT", department.id, term, requester, self.get_department_version(department, term))
+        return self.report_cache.get_or_create(key, lambda: self.build_head_report(requester, department, term, progress))
+
+    def export_for_staff(self, requester: User, department: Department, term: Term, progress: Callable[[float], None]=None) -> IO[bytes]:
+        key = self.get_report_key("STAFF", department.id, term, requester, self.get_department_version(department, term))
+        return self.report_cache.get_or_create(key, lambda: self.build_staff_report(requester, department, term, progress))
+
+    def get_employee_version(self, user: User) -> str:
+        terms = self.db.session.execute(
+            select(func.count(Term.id), func.sum(Term.revision)).where(Term.id.in_(select(SWTDForm.term_id).where(SWTDForm.author_id == user.id)))
+        ).one()
+        department = user.department.revision if user.department else None
+
+        return f"{self.get_data_version([user.id])}:{tuple(terms)}:{department}"
+
+    def get_department_version(self, department: Department, term: Term) -> str:
+        members = select(User.id).where(User.department_id == department.id)
+        return f"{self.get_data_version(members, term)}:{department.revision}:{department.head_id}:{term.revision}"
+
+    def build_employee_report(self, requester: User, user: User, progress: Callable[[float], None]=None) -> IO[bytes]:
+        pdf = self.create_composer()
 
         term_ids = []
         for swtd_form in user.swtd_forms:
@@ -164,7 +656,7 @@ class FTService:
             "points": self.user_service.get_point_summary(user, term)
         } for term in terms]
 
-        for summary in term_summaries:
+        for i, summary in enumerate(term_summaries):
             term = summary.get("term")
 
             pdf.add_text("Pointwatch Employee Seminars, Workshops, Trainings, and Development Report.")
@@ -240,10 +732,12 @@ class FTService:
 
             pdf.add_new_page()
 
+            if progress: progress((i + 1) / len(term_summaries))
+
         return pdf.get_pdf()
 
-    def export_for_head(self, requester: User, department: Department, term: Term) -> io.BytesIO:
-        pdf = PDFComposer()
+    def build_head_report(self, requester: User, department: Department, term: Term, progress: Callable[[float], None]=None) -> IO[bytes]:
+        pdf = self.create_composer()
 
         pdf.add_text("Pointwatch Employee Seminars, Workshops, Trainings, and Development Report.")
         pdf.draw_line()
@@ -311,8 +805,12 @@ class FTService:
         pdf.add_text(f"     Total SWTDs For Revision: {total_swtds_for_revisions}")
         pdf.add_text("")
 
+        summaries = self.user_service.get_point_summaries(department.members, term)
+
         pdf.add_text("Department Members")
-        for member in department.members:
+        for i, member in enumerate(department.members):
+            if progress: progress(i / len(department.members))
+
             if member == department.head or member.is_deleted:
                 continue
 
@@ -330,7 +828,7 @@ class FTService:
                     break
 
             status = "CLEARED" if is_cleared else "NOT CLEARED"
-            points = self.user_service.get_point_summary(member, term)
+            points = summaries.get(member.id)
 
             pdf.add_text(f"     {member.employee_id} | {member.firstname} {member.lastname}")
             pdf.add_text(f"     Pending SWTDs: {pending_swtds} | SWTDs For Revision: {rejected_swtds} | Points: {points.valid_points} | Status: {status}")
@@ -338,84 +836,198 @@ class FTService:
 
         return pdf.get_pdf()
 
-    def export_for_staff(self, requester: User, department: User, term: Term) -> io.BytesIO:
-        pdf = PDFComposer()
+    def build_staff_report(self, requester: User, department: Department, term: Term, progress: Callable[[float], None]=None) -> IO[bytes]:
+        summaries = self.user_service.get_point_summaries(department.members, term)
+        data = self.get_staff_report_data(requester, department, term, summaries)
 
-        pdf.add_text("Pointwatch Employee Seminars, Workshops, Trainings, and Development Report.")
-        pdf.draw_line()
-        pdf.add_text(f"Generated by: {requester.employee_id} | {requester.firstname} {requester.lastname}")
-        pdf.add_text(f"Generated on: {datetime.now().strftime('%d %B %Y %I:%M %p')}")
-        pdf.draw_line()
+        return compose_staff_report(self.create_composer(), data, progress)
 
-        pdf.add_text("Term Information")
+    def get_staff_report_data(self, requester: User, department: Department, term: Term, summaries: dict[int, PointSummary]) -> dict[str, Any]:
+        """Collects everything a staff report shows as plain data, so it can be rendered outside the session."""
         term_info = term.to_dict()
-        pdf.add_text(f"     Name: {term_info.get('name')}")
-        pdf.add_text(f"     Start: {term.start_date.strftime('%B %Y')}")
-        pdf.add_text(f"     End: {term.end_date.strftime('%B %Y')}")
-        pdf.add_text(f"     Type: {term_info.get('type')}")
-        pdf.add_text(f"     Ongoing: {'Yes' if term_info.get('is_ongoing') else 'No'}")
-        pdf.add_text("")
-
-        pdf.add_text("Department Information")
-        pdf.add_text(f"     Name: {department.name}")
-        pdf.add_text(f"     Required points per {'Academic Year' if department.use_schoolyear else 'Semester'}: {department.required_points}")
-        if department.midyear_points > 0:
-            pdf.add_text(f"     Required points per Midyear/Summer: {department.midyear_points}")
-
-        fullname = f"{department.head.firstname} {department.head.lastname}" if department.head else None
-        pdf.add_text(f"     Head: {fullname}")
-        pdf.add_text("")
-
-        total_employees = len(list(filter(lambda u: u.is_deleted == False, department.members)))
-        cleared_employees  = 0
+        members = []
 
         for member in department.members:
             if member.is_deleted:
                 continue
 
-            for clearing in member.clearances:
-                if term != clearing.term or clearing.is_deleted:
-                    continue
+            clearances = [c for c in member.clearances if c.term == term and not c.is_deleted]
+
+            members.append({
+                "employee_id": member.employee_id,
+                "firstname": member.firstname,
+                "lastname": member.lastname,
+                "valid_points": summaries.get(member.id).valid_points,
+                "clearances": len(clearances)
+            })
+
+        return {
+            "requester": f"{requester.employee_id} | {requester.firstname} {requester.lastname}",
+            "generated_on": datetime.now().strftime('%d %B %Y %I:%M %p'),
+            "term": {
+                "name": term_info.get('name'),
+                "start": term.start_date.strftime('%B %Y'),
+                "end": term.end_date.strftime('%B %Y'),
+                "type": term_info.get('type'),
+                "is_ongoing": term_info.get('is_ongoing')
+            },
+            "department": {
+                "name": department.name,
+                "required_points": department.required_points,
+                "midyear_points": department.midyear_points,
+                "use_schoolyear": department.use_schoolyear,
+                "head": f"{department.head.firstname} {department.head.lastname}" if department.head else None
+            },
+            "members": members
+        }
+
+    def export_all_for_staff(self, requester: User, departments: list[Department], term: Term) -> Iterator[bytes]:
+        """Renders one staff report per department across a process pool and yields them as a ZIP archive."""
+        members = [m for d in departments for m in d.members]
+        summaries = self.user_service.get_point_summaries(members, term)
+
+        reports = [
+            (f"{secure_filename(d.name) or d.id}_Report.pdf", self.get_staff_report_data(requester, d, term, summaries))
+            for d in departments
+        ]
+
+        return self.stream_reports_zip(reports)
+
+    def stream_reports_zip(self, reports: list[tuple[str, dict[str, Any]]]) -> Iterator[bytes]:
+        work_dir = tempfile.mkdtemp()
 
-                cleared_employees += 1
-        
-        non_cleared_employees = total_employees - cleared_employees
-        percent_cleared = (cleared_employees / total_employees) * 100
+        try:
+            output = ZipOutput()
+            with zipfile.ZipFile(output, "w", compression=zipfile.ZIP_DEFLATED) as archive:
+                # Each report is sent as soon as it is added, rather than once the archive is complete.
+                for path, filename in self.render_reports(reports, work_dir):
+                    archive.write(path, arcname=filename)
+                    os.remove(path)
+
+                    yield output.drain()
+
+            yield output.drain()
+        finally:
+            shutil.rmtree(work_dir, ignore_errors=True)
+
+    def render_reports(self, reports: list[tuple[str, dict[str, Any]]], work_dir: str) -> Iterator[tuple[str, str]]:
+        """Yields the path and filename of each report in the order they finish rendering."""
+        jobs = [
+            (filename, (data, os.path.join(work_dir, f"{i}.pdf"), self.pdf_streaming, self.pdf_spool_size, self.pdf_font))
+            for i, (filename, data) in enumerate(reports)
+        ]
+
+        if self.report_workers <= 0:
+            for filename, args in jobs:
+                yield write_staff_report(*args), filename
+            return
+
+        futures = {}
+        pool = self.get_report_pool()
 
-        pdf.add_text("Department Summary")
-        pdf.add_text(f"     % of Employees Cleared: {percent_cleared}")
-        pdf.add_text(f"     No of cleared Employees: {cleared_employees}")
-        pdf.add_text(f"     No of Non-cleared Employees: {non_cleared_employees}")
+        try:
+            futures = {pool.submit(write_staff_report, *args): filename for filename, args in jobs}
+            for future in as_completed(futures):
+                yield future.result(), futures[future]
+        except BrokenProcessPool:
+            # A worker died, so the next export starts a new pool.
+            self.report_pool = None
+            raise
+        finally:
+            # Reports not yet started are dropped if the client disconnects.
+            for future in futures:
+                future.cancel()
+
+    def get_report_pool(self) -> ProcessPoolExecutor:
+        """Pool of REPORT_WORKERS processes that render reports, created on first use in each process.
+
+        Rendering is CPU-bound, so reports are built in separate processes rather than threads. The workers are spawned
+        rather than forked, so they do not inherit the gevent hub, sockets and locks of the API worker, and they are kept
+        for later exports instead of being started on every request.
+        """
+        if not self.report_pool or self.report_pool_pid != os.getpid():
+            self.report_pool = ProcessPoolExecutor(max_workers=self.report_workers, mp_context=multiprocessing.get_context("spawn"))
+            self.report_pool_pid = os.getpid()
+
+        return self.report_pool
+
+class ZipOutput:
+    """Write-only buffer for zipfile. Without tell() or seek(), zipfile writes entries sequentially so they can be sent as they finish."""
+    def __init__(self) -> None:
+        self.chunks = []
+
+    def write(self, data: bytes) -> int:
+        self.chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self) -> None:
+        pass
+
+    def drain(self) -> bytes:
+        data = b"".join(self.chunks)
+        self.chunks = []
+        return data
+
+def compose_staff_report(pdf: Any, data: dict[str, Any], progress: Callable[[float], None]=None) -> IO[bytes]:
+    term = data["term"]
+    department = data["department"]
+    members = data["members"]
+
+    pdf.add_text("Pointwatch Employee Seminars, Workshops, Trainings, and Development Report.")
+    pdf.draw_line()
+    pdf.add_text(f"Generated by: {data['requester']}")
+    pdf.add_text(f"Generated on: {data['generated_on']}")
+    pdf.draw_line()
+
+    pdf.add_text("Term Information")
+    pdf.add_text(f"     Name: {term['name']}")
+    pdf.add_text(f"     Start: {term['start']}")
+    pdf.add_text(f"     End: {term['end']}")
+    pdf.add_text(f"     Type: {term['type']}")
+    pdf.add_text(f"     Ongoing: {'Yes' if term['is_ongoing'] else 'No'}")
+    pdf.add_text("")
+
+    pdf.add_text("Department Information")
+    pdf.add_text(f"     Name: {department['name']}")
+    pdf.add_text(f"     Required points per {'Academic Year' if department['use_schoolyear'] else 'Semester'}: {department['required_points']}")
+    if department['midyear_points'] > 0:
+        pdf.add_text(f"     Required points per Midyear/Summer: {department['midyear_points']}")
+
+    pdf.add_text(f"     Head: {department['head']}")
+    pdf.add_text("")
+
+    total_employees = len(members)
+    cleared_employees = sum(member["clearances"] for member in members)
+
+    non_cleared_employees = total_employees - cleared_employees
+    percent_cleared = (cleared_employees / total_employees) * 100 if total_employees else 0
+
+    pdf.add_text("Department Summary")
+    pdf.add_text(f"     % of Employees Cleared: {percent_cleared}")
+    pdf.add_text(f"     No of cleared Employees: {cleared_employees}")
+    pdf.add_text(f"     No of Non-cleared Employees: {non_cleared_employees}")
+    pdf.add_text("")
+
+    pdf.add_text("Department Members")
+    for i, member in enumerate(members):
+        if progress: progress(i / len(members))
+
+        status = "CLEARED" if member["clearances"] else "NOT CLEARED"
+
+        pdf.add_text(f"     {member['employee_id']} | {member['firstname']} {member['lastname']}")
+        pdf.add_text(f"     Points: {member['valid_points']} | Status: {status}")
         pdf.add_text("")
 
-        pdf.add_text("Department Members")
-        for member in department.members:
-            if member.is_deleted:
-                continue
-
-            is_cleared = False
-            for clearance in member.clearances:
-                if clearance.is_deleted:
-                    continue
-
-                if clearance.term == term:
-                    is_cleared = True
-                    break
-
-            status = "CLEARED" if is_cleared else "NOT CLEARED"
-            points = self.user_service.get_point_summary(member, term)
-
-            pdf.add_text(f"     {member.employee_id} | {member.firstname} {member.lastname}")
-            pdf.add_text(f"     Points: {points.valid_points} | Status: {status}")
-            pdf.add_text("")
+    return pdf.get_pdf()
 
-            for clearing in member.clearances:
-                if term != clearing.term or clearing.is_deleted:
-                    continue
+def write_staff_report(data: dict[str, Any], path: str, streaming: bool, spool_size: int, font_path: str) -> str:
+    """Process pool entry point. Renders one staff report from plain data into path."""
+    pdf = StreamingPDFComposer(spool_size=spool_size, font_path=font_path) if streaming else PDFComposer(font_path=font_path)
 
-                cleared_employees += 1
+    with compose_staff_report(pdf, data) as content, open(path, "wb") as f:
+        shutil.copyfileobj(content, f)
 
-        return pdf.get_pdf()
+    return path
 
 # Sample usage
 # def generate_pdf():
@@ -0,0 +1,303 @@
+import time
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from itertools import count
+from threading import Lock, Timer
+from typing import Any, Callable, Optional
+
+from flask import Flask
+from flask_sqlalchemy import SQLAlchemy
+from sqlalchemy import event, select, update, delete, insert, or_, and_
+from sqlalchemy.orm import Session, SessionTransaction
+
+from ..models.job import Job
+from ..models.dead_letter_job import DeadLetterJob
+
+class RetryJob(Exception):
+    """Raised by a handler to retry the job with another payload, such as the items of a batch that failed.
+
+    The retry is a failed attempt of the same job, so the backoff and JOB_MAX_ATTEMPTS still apply.
+    """
+    def __init__(self, message: str, payload: dict[str, Any]) -> None:
+        super().__init__(message)
+        self.payload = payload
+
+class JobBackend:
+    def __init__(self, job_service: "JobService") -> None:
+        self.job_service = job_service
+
+    def submit(self, name: str, payload: dict[str, Any]) -> None:
+        raise NotImplementedError()
+
+    def shutdown(self) -> None:
+        pass
+
+class ThreadPoolBackend(JobBackend):
+    """Runs jobs on an in-process thread pool. Jobs still queued or waiting for a retry are lost on restart.
+
+    Once shut down, jobs waiting for a retry and jobs submitted late are moved to the dead letter table instead.
+    """
+    def __init__(self, job_service: "JobService") -> None:
+        super().__init__(job_service)
+        self.app = job_service.app
+        self.executor = ThreadPoolExecutor(max_workers=job_service.workers, thread_name_prefix="job")
+        self.lock = Lock()
+        self.closed = False
+        self.timers = {}
+        self.timer_ids = count()
+
+    def submit(self, name: str, payload: dict[str, Any], attempts: int=0) -> None:
+        with self.lock:
+            if not self.closed:
+                self.executor.submit(self.run, name, payload, attempts)
+                return
+
+        self.dead_letter(name, payload, attempts, "The job backend was shut down before the job ran.")
+
+    def run(self, name: str, payload: dict[str, Any], attempts: int) -> None:
+        error, payload = self.job_service.execute(name, payload)
+        if error is None:
+            return
+
+        attempts += 1
+        if attempts >= self.job_service.max_attempts:
+            self.dead_letter(name, payload, attempts, error)
+            return
+
+        with self.lock:
+            if not self.closed:
+                timer_id = next(self.timer_ids)
+                retry = Timer(self.job_service.get_backoff(attempts), self.retry, (timer_id, name, payload, attempts))
+                retry.daemon = True
+                self.timers[timer_id] = (retry, name, payload, attempts, error)
+                retry.start()
+                return
+
+        self.dead_letter(name, payload, attempts, error)
+
+    def retry(self, timer_id: int, name: str, payload: dict[str, Any], attempts: int) -> None:
+        with self.lock:
+            self.timers.pop(timer_id, None)
+
+        self.submit(name, payload, attempts)
+
+    def dead_letter(self, name: str, payload: dict[str, Any], attempts: int, error: str) -> None:
+        try:
+            self.job_service.dead_letter(name, payload, attempts, error, app=self.app)
+        except Exception:
+            self.app.logger.exception(f"Could not dead-letter job '{name}'.")
+
+    def shutdown(self) -> None:
+        with self.lock:
+            self.closed = True
+            timers = list(self.timers.values())
+            self.timers.clear()
+
+        for retry, name, payload, attempts, error in timers:
+            retry.cancel()
+            self.dead_letter(name, payload, attempts, error)
+
+        self.executor.shutdown(wait=False)
+
+class DatabaseBackend(JobBackend):
+    """Persists jobs in tbljobs. Jobs are executed by `flask jobs work`."""
+    def submit(self, name: str, payload: dict[str, Any]) -> None:
+        now = datetime.now()
+
+        # Uses its own connection so jobs can be queued from after_commit hooks.
+        with self.job_service.db.engine.begin() as connection:
+            connection.execute(insert(Job).values(
+                name=name,
+                payload=payload,
+                status="QUEUED",
+                attempts=0,
+                run_at=now,
+                date_created=now,
+                date_modified=now
+            ))
+
+    def claim(self) -> Optional[Any]:
+        while True:
+            now = datetime.now()
+            stale = now - timedelta(seconds=self.job_service.running_timeout)
+
+            with self.job_service.db.engine.begin() as connection:
+                job = connection.execute(
+                    select(Job.id, Job.name, Job.payload, Job.attempts, Job.status, Job.date_modified)
+                    .where(or_(
+                        and_(Job.status == "QUEUED", Job.run_at <= now),
+                        # Jobs left running by a worker that died are picked up again.
+                        and_(Job.status == "RUNNING", Job.date_modified <= stale)
+                    ))
+                    .order_by(Job.run_at, Job.id)
+                    .limit(1)
+                ).first()
+
+                if not job:
+                    return None
+
+                # Only succeeds if no other worker claimed the job since it was read.
+                claimed = connection.execute(
+                    update(Job)
+                    .where(Job.id == job.id, Job.status == job.status, Job.date_modified == job.date_modified)
+                    .values(status="RUNNING", date_modified=now)
+                ).rowcount
+
+            if claimed:
+                return job
+
+    def run_pending(self, limit: int=None) -> int:
+        processed = 0
+
+        while limit is None or processed < limit:
+            job = self.claim()
+            if not job:
+                break
+
+            error, payload = self.job_service.execute(job.name, job.payload)
+            self.finish(job, error, payload)
+            processed += 1
+
+        return processed
+
+    def finish(self, job: Any, error: Optional[str], payload: dict[str, Any]) -> None:
+        now = datetime.now()
+        attempts = job.attempts + 1
+
+        with self.job_service.db.engine.begin() as connection:
+            if error is None:
+                connection.execute(delete(Job).where(Job.id == job.id))
+            elif attempts >= self.job_service.max_attempts:
+                connection.execute(delete(Job).where(Job.id == job.id))
+                connection.execute(insert(DeadLetterJob).values(
+                    name=job.name,
+                    payload=payload,
+                    attempts=attempts,
+                    error=error,
+                    date_created=now
+                ))
+            else:
+                connection.execute(
+                    update(Job)
+                    .where(Job.id == job.id)
+                    .values(
+                        status="QUEUED",
+                        payload=payload,
+                        attempts=attempts,
+                        last_error=error,
+                        run_at=now + timedelta(seconds=self.job_service.get_backoff(attempts)),
+                        date_modified=now
+                    )
+                )
+
+    def work(self, poll_interval: float) -> None:
+        while True:
+            if not self.run_pending():
+                time.sleep(poll_interval)
+
+class JobService:
+    backends = {
+        "thread": ThreadPoolBackend,
+        "database": DatabaseBackend
+    }
+
+    def __init__(self, db: SQLAlchemy) -> None:
+        self.db = db
+        self.app = None
+        self.backend = None
+        self.handlers = {}
+        self.batch_sizes = {}
+
+        self.init_event_handlers()
+
+    def init_app(self, app: Flask) -> None:
+        self.app = app
+        self.max_attempts = int(app.config.get("JOB_MAX_ATTEMPTS", 5))
+        self.retry_backoff = float(app.config.get("JOB_RETRY_BACKOFF", 30))
+        self.running_timeout = float(app.config.get("JOB_RUNNING_TIMEOUT", 600))
+        self.workers = int(app.config.get("JOB_WORKERS", 4))
+
+        name = app.config.get("JOB_BACKEND", "thread")
+        if name not in self.backends:
+            raise ValueError(f"Unknown job backend '{name}'.")
+
+        if self.backend:
+            self.backend.shutdown()
+
+        self.backend = self.backends[name](self)
+
+    def init_event_handlers(self) -> None:
+        event.listen(Session, 'after_commit', self.handle_after_commit)
+        event.listen(Session, 'after_soft_rollback', self.handle_after_rollback)
+
+    def register(self, name: str, handler: Callable[..., None], batch_size: int=None) -> None:
+        """Registers a job handler. Batched handlers receive up to batch_size payloads as `items`."""
+        self.handlers[name] = handler
+
+        if batch_size:
+            self.batch_sizes[name] = batch_size
+
+    def enqueue(self, name: str, **payload: dict[str, Any]) -> None:
+        self.enqueue_many(name, [payload])
+
+    def enqueue_many(self, name: str, payloads: list[dict[str, Any]]) -> None:
+        if name not in self.handlers:
+            raise ValueError(f"No handler registered for job '{name}'.")
+
+        batch_size = self.batch_sizes.get(name)
+        if not batch_size:
+            for payload in payloads:
+                self.backend.submit(name, payload)
+            return
+
+        for i in range(0, len(payloads), batch_size):
+            self.backend.submit(name, {"items": payloads[i:i + batch_size]})
+
+    def enqueue_after_commit(self, name: str, **payload: dict[str, Any]) -> None:
+        """Queues the job once the current transaction commits. A rollback discards it."""
+        session = self.db.session()
+
+        # Begin explicitly so that a later commit or rollback always fires its event.
+        if not session.in_transaction():
+            session.begin()
+
+        session.info.setdefault("pending_jobs", []).append((name, payload))
+
+    def handle_after_commit(self, session: Session) -> None:
+        # Also fired when a savepoint is released. Jobs wait for the enclosing transaction.
+        if session.in_nested_transaction():
+            return
+
+        pending = {}
+        for name, payload in session.info.pop("pending_jobs", []):
+            pending.setdefault(name, []).append(payload)
+
+        # Jobs queued by the same transaction are submitted together so batched handlers can coalesce them.
+        for name, payloads in pending.items():
+            self.enqueue_many(name, payloads)
+
+    def handle_after_rollback(self, session: Session, previous_transaction: SessionTransaction) -> None:
+        # Rolling back a savepoint leaves the enclosing transaction, and its jobs, intact.
+        if not previous_transaction.nested:
+            session.info.pop("pending_jobs", None)
+
+    def execute(self, name: str, payload: dict[str, Any]) -> tuple[Optional[str], dict[str, Any]]:
+        """Runs a job handler. Returns the formatted error if it failed, and the payload to retry it with."""
+        with self.app.app_context():
+            try:
+                self.handlers[name](**payload)
+            except RetryJob as e:
+                return traceback.format_exc(), e.payload
+            except Exception:
+                return traceback.format_exc(), payload
+
+        return None, payload
+
+    def get_backoff(self, attempts: int) -> float:
+        return self.retry_backoff * 2 ** (attempts - 1)
+
+    def dead_letter(self, name: str, payload: dict[str, Any], attempts: int, error: str, app: Flask=None) -> None:
+        with (app or self.app).app_context():
+            self.db.session.add(DeadLetterJob(name=name, payload=payload, attempts=attempts, error=error))
+            self.db.session.commit()
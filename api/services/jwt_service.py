@@ -1,20 +1,136 @@
+import time
+from collections import OrderedDict
 from datetime import timedelta
+from threading import Lock
+from typing import Any, Optional
 
-from flask_jwt_extended import create_access_token, get_jwt_identity
+from flask import Flask, g
+from flask_jwt_extended import create_access_token, get_jwt, get_jwt_identity
+from flask_sqlalchemy import SQLAlchemy
+from sqlalchemy import inspect, select
+from sqlalchemy.orm import make_transient_to_detached
 
 from ..models.user import User
 
 from ..exceptions.authentication import AuthenticationError
 
+class RequesterCache:
+    """Process-level LRU cache of requester column snapshots that expire after a TTL.
+
+    Each worker process holds its own entries, so invalidating one only affects the current process. Snapshots are
+    checked against the stored token_version before use, which keeps revocations immediate in every process. Other
+    changes to the user may be served stale until the TTL expires.
+    """
+    def __init__(self, ttl: float, max_size: int) -> None:
+        self.ttl = ttl
+        self.max_size = max_size
+        self.entries = OrderedDict()
+        self.lock = Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl > 0 and self.max_size > 0
+
+    def get(self, identity: str) -> Optional[dict[str, Any]]:
+        with self.lock:
+            entry = self.entries.get(identity)
+            if not entry:
+                return None
+
+            expires_at, snapshot = entry
+            if expires_at < time.monotonic():
+                del self.entries[identity]
+                return None
+
+            self.entries.move_to_end(identity)
+            return snapshot
+
+    def set(self, identity: str, snapshot: dict[str, Any]) -> None:
+        with self.lock:
+            self.entries[identity] = (time.monotonic() + self.ttl, snapshot)
+            self.entries.move_to_end(identity)
+
+            while len(self.entries) > self.max_size:
+                self.entries.popitem(last=False)
+
+    def delete(self, identity: str) -> None:
+        with self.lock:
+            self.entries.pop(identity, None)
+
 class JWTService:
-    def __init__(self) -> None:
-        pass
+    def __init__(self, db: SQLAlchemy) -> None:
+        self.db = db
+        self.requester_cache = RequesterCache(ttl=0, max_size=1024)
+
+    def init_app(self, app: Flask) -> None:
+        self.requester_cache = RequesterCache(
+            ttl=float(app.config.get("REQUESTER_CACHE_TTL", 0)),
+            max_size=int(app.config.get("REQUESTER_CACHE_SIZE", 1024))
+        )
+
+    def generate_token(self, identity: str, **claims: dict[str, Any]) -> str:
+        return create_access_token(identity=identity, additional_claims=claims, expires_delta=timedelta(hours=1), fresh=True)
+
+    def generate_user_token(self, user: User) -> str:
+        # Embedded claims let endpoints authorize from the token alone. "ver" revokes the token once
+        # the user's token_version is incremented.
+        return self.generate_token(
+            user.email,
+            uid=user.id,
+            access_level=user.access_level,
+            department_id=user.department_id,
+            headed_department_id=user.headed_department.id if user.headed_department else None,
+            ver=user.token_version
+        )
 
-    def generate_token(self, identity: str) -> str:
-        return create_access_token(identity=identity, expires_delta=timedelta(hours=1), fresh=True)
+    def get_requester(self) -> User:
+        identity = get_jwt_identity()
 
-    def get_requester(self) -> str:
-        user = User.query.filter_by(email=get_jwt_identity(), is_deleted=False).first()
-        if not user: raise AuthenticationError()
+        # Memoize per request so repeated lookups within one request are free.
+        requesters = g.setdefault("requesters", {})
+        if identity in requesters:
+            return requesters[identity]
 
+        user = self.load_cached_requester(identity)
+
+        if not user:
+            user = User.query.filter_by(email=identity, is_deleted=False).first()
+            if not user: raise AuthenticationError()
+
+            if self.requester_cache.enabled:
+                self.requester_cache.set(identity, self.snapshot(user))
+
+        claims = get_jwt()
+        if "ver" in claims and claims.get("ver") != user.token_version:
+            raise AuthenticationError("Token has been revoked.")
+
+        requesters[identity] = user
         return user
+
+    def load_cached_requester(self, identity: str) -> Optional[User]:
+        if not self.requester_cache.enabled:
+            return None
+
+        snapshot = self.requester_cache.get(identity)
+        if not snapshot:
+            return None
+
+        # A one-column read through the email index. The token version may have been bumped by another process.
+        token_version = self.db.session.scalar(select(User.token_version).where(User.email == identity, User.is_deleted == False))
+        if token_version != snapshot.get("token_version"):
+            self.requester_cache.delete(identity)
+            return None
+
+        # Attach the cached row to the current session without a SELECT.
+        user = User(**snapshot)
+        make_transient_to_detached(user)
+        return self.db.session.merge(user, load=False)
+
+    def snapshot(self, user: User) -> dict[str, Any]:
+        return {attr.key: getattr(user, attr.key) for attr in inspect(User).column_attrs}
+
+    def invalidate_requester(self, identity: str) -> None:
+        self.requester_cache.delete(identity)
+
+        if "requesters" in g:
+            g.requesters.pop(identity, None)
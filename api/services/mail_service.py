@@ -1,60 +1,289 @@
 import os
-from typing import Any
+import smtplib
+import time
+from collections import deque
+from threading import Condition, Lock
+from typing import Any, Optional
 
-from flask import current_app
-from flask_mail import Message, Mail
+from flask import Flask, current_app
+from flask_mail import Message, Mail, Connection
 
+from ..models.user import User
 from ..services.jwt_service import JWTService
+from ..services.job_service import JobService, RetryJob
+from ..services.template_service import TemplateService
 
-class MailService:
-    def __init__(self, mail: Mail, jwt_service: JWTService) -> None:
+def is_disconnect(error: Exception) -> bool:
+    """Whether the error leaves the SMTP session unusable."""
+    if isinstance(error, smtplib.SMTPResponseException):
+        return error.smtp_code == 421
+
+    return isinstance(error, smtplib.SMTPServerDisconnected) or (isinstance(error, OSError) and not isinstance(error, smtplib.SMTPException))
+
+class MailMetrics:
+    def __init__(self, samples: int=1000) -> None:
+        self.lock = Lock()
+        self.latencies = deque(maxlen=samples)
+        self.connections_opened = 0
+        self.reconnects = 0
+        self.messages_sent = 0
+        self.messages_failed = 0
+
+    def record_send(self, latency: float) -> None:
+        with self.lock:
+            self.messages_sent += 1
+            self.latencies.append(latency)
+
+    def to_dict(self) -> dict[str, Any]:
+        with self.lock:
+            latencies = sorted(self.latencies)
+
+            return {
+                "connections_opened": self.connections_opened,
+                "reconnects": self.reconnects,
+                "messages_sent": self.messages_sent,
+                "messages_failed": self.messages_failed,
+                "messages_per_connection": self.messages_sent / self.connections_opened if self.connections_opened else 0,
+                "send_latency_ms": {
+                    "avg": sum(latencies) / len(latencies) * 1000 if latencies else 0,
+                    "p95": latencies[int(len(latencies) * 0.95)] * 1000 if latencies else 0,
+                    "max": latencies[-1] * 1000 if latencies else 0
+                }
+            }
+
+class PooledConnection:
+    def __init__(self, connection: Connection, state: Any) -> None:
+        self.connection = connection
+        self.state = state
+        self.messages = 0
+        self.last_used = time.monotonic()
+
+class SMTPPool:
+    """Keeps authenticated SMTP sessions open and reuses them across messages."""
+    def __init__(self, mail: Mail, size: int, max_messages: int, idle_timeout: float) -> None:
         self.mail = mail
-        self.jwt_service = jwt_service
+        self.size = size
+        self.max_messages = max_messages
+        self.idle_timeout = idle_timeout
+        self.metrics = MailMetrics()
+
+        self.condition = Condition()
+        self.idle = []
+        self.open = 0
+        self.state = None
+
+    def acquire(self) -> PooledConnection:
+        state = current_app.extensions["mail"]
+
+        with self.condition:
+            # Sessions opened with a different mail configuration are dropped.
+            if state is not self.state:
+                self.state = state
+                while self.idle:
+                    self.close(self.idle.pop())
+                    self.open -= 1
+
+            while True:
+                while self.idle:
+                    pooled = self.idle.pop()
+                    if time.monotonic() - pooled.last_used < self.idle_timeout:
+                        return pooled
+
+                    self.close(pooled)
+                    self.open -= 1
 
-    def send_mail(self, subject: str, recipients: list[str], body: str) -> None:
-        msg = Message(subject, sender='mail.wildpark@gmail.com', recipients=recipients)
-        msg.body = body
+                if self.open < self.size:
+                    self.open += 1
+                    break
+
+                self.condition.wait()
 
         try:
-            self.mail.send(msg)
+            return self.connect()
         except Exception:
-            print("Failed to send mail.")
+            self.discard(None)
+            raise
+
+    def release(self, pooled: PooledConnection) -> None:
+        with self.condition:
+            if pooled.messages >= self.max_messages or pooled.state is not self.state:
+                self.close(pooled)
+                self.open -= 1
+            else:
+                pooled.last_used = time.monotonic()
+                self.idle.append(pooled)
+
+            self.condition.notify()
+
+    def discard(self, pooled: Optional[PooledConnection]) -> None:
+        if pooled:
+            self.close(pooled)
+
+        with self.condition:
+            self.open -= 1
+            self.condition.notify()
+
+    def connect(self) -> PooledConnection:
+        connection = self.mail.connect()
+        connection.__enter__()
+
+        with self.metrics.lock:
+            self.metrics.connections_opened += 1
+
+        return PooledConnection(connection, connection.mail)
+
+    def close(self, pooled: PooledConnection) -> None:
+        try:
+            pooled.connection.__exit__(None, None, None)
+        except (smtplib.SMTPException, OSError):
+            pass
+
+    def send(self, pooled: PooledConnection, message: Message) -> None:
+        start = time.perf_counter()
+        pooled.connection.send(message)
+
+        pooled.messages += 1
+        self.metrics.record_send(time.perf_counter() - start)
+
+    def send_many(self, messages: list[Message]) -> list[tuple[int, Exception]]:
+        """Sends the messages over one session and returns the index and error of each failed message."""
+        failures = []
+        connected = True
+        pooled = self.acquire()
 
-    def send_recovery_mail(self, email: str, firstname: str) -> None:
-        token = self.jwt_service.generate_token(email)
+        try:
+            for i, message in enumerate(messages):
+                try:
+                    if pooled.messages >= self.max_messages:
+                        pooled = self.reconnect(pooled, count=False)
+
+                    try:
+                        self.send(pooled, message)
+                    except Exception as e:
+                        if not is_disconnect(e): raise
+
+                        pooled = self.reconnect(pooled)
+                        self.send(pooled, message)
+                except Exception as e:
+                    failures.append((i, e))
+
+                    # The server is unreachable, so the rest of the batch fails too.
+                    if is_disconnect(e):
+                        failures += [(j, e) for j in range(i + 1, len(messages))]
+                        connected = False
+                        break
+        finally:
+            if connected:
+                self.release(pooled)
+            else:
+                self.discard(pooled)
+
+        with self.metrics.lock:
+            self.metrics.messages_failed += len(failures)
+
+        return failures
+
+    def reconnect(self, pooled: PooledConnection, count: bool=True) -> PooledConnection:
+        self.close(pooled)
+
+        if count:
+            with self.metrics.lock:
+                self.metrics.reconnects += 1
+
+        return self.connect()
+
+class MailService:
+    def __init__(self, mail: Mail, jwt_service: JWTService, job_service: JobService, template_service: TemplateService) -> None:
+        self.mail = mail
+        self.jwt_service = jwt_service
+        self.job_service = job_service
+        self.template_service = template_service
+        self.pool = SMTPPool(mail, size=4, max_messages=100, idle_timeout=60)
+
+        self.job_service.register("mail.send", self.deliver, batch_size=50)
 
-        with current_app.open_resource('templates/account_recovery_instructions_template.txt', 'r') as f:
-            mail_template = f.read()
+    def init_app(self, app: Flask) -> None:
+        with self.pool.condition:
+            self.pool.size = int(app.config.get("MAIL_POOL_SIZE", 4))
+            self.pool.max_messages = int(app.config.get("MAIL_POOL_MAX_MESSAGES", 100))
+            self.pool.idle_timeout = float(app.config.get("MAIL_POOL_IDLE_TIMEOUT", 60))
+            self.pool.condition.notify_all()
 
-        mail_body = mail_template.format(reset_link=os.getenv("APP_URL"), username=firstname, token=token)
-        self.send_mail('Account Recovery | PointWatch', [email,], mail_body)
+        self.job_service.register("mail.send", self.deliver, batch_size=int(app.config.get("MAIL_BATCH_SIZE", 50)))
 
-    def send_swtd_validation_mail(self, email: str, **data: dict[str, Any]) -> None:
-        with current_app.open_resource('templates/validation_update_template.txt', 'r') as f:
-            mail_template = f.read()
+    def send_mail(self, subject: str, recipients: list[str], body: str, html: str=None, after_commit: bool=False) -> None:
+        if after_commit:
+            self.job_service.enqueue_after_commit("mail.send", subject=subject, recipients=recipients, body=body, html=html)
+        else:
+            self.job_service.enqueue("mail.send", subject=subject, recipients=recipients, body=body, html=html)
 
-        mail_body = mail_template.format(
+    def deliver(self, items: list[dict[str, Any]]) -> None:
+        messages = []
+        for item in items:
+            msg = Message(item.get("subject"), sender='mail.wildpark@gmail.com', recipients=item.get("recipients"))
+            msg.body = item.get("body")
+            msg.html = item.get("html")
+            messages.append(msg)
+
+        failures = self.pool.send_many(messages)
+        if not failures:
+            return
+
+        # Errors propagate so the job queue can retry the delivery.
+        if len(failures) == len(items):
+            raise failures[0][1]
+
+        # Only the failed messages are retried so the rest are not sent twice.
+        raise RetryJob(
+            f"{len(failures)} of {len(items)} messages failed.",
+            {"items": [items[i] for i, _ in failures]}
+        ) from failures[0][1]
+
+    def get_metrics(self) -> dict[str, Any]:
+        return self.pool.metrics.to_dict()
+
+    def send_template_mail(self, name: str, recipients: list[str], after_commit: bool=False, **context: dict[str, Any]) -> None:
+        mail = self.template_service.render(name, **context)
+        self.send_mail(mail.subject, recipients, mail.text, html=mail.html, after_commit=after_commit)
+
+    def send_recovery_mail(self, user: User) -> None:
+        token = self.jwt_service.generate_user_token(user)
+        self.send_template_mail("account_recovery", [user.email,], reset_link=os.getenv("APP_URL"), username=user.firstname, token=token)
+
+    def send_swtd_validation_mail(self, email: str, after_commit: bool=False, **data: dict[str, Any]) -> None:
+        self.send_template_mail(
+            "validation_update",
+            [email,],
+            after_commit=after_commit,
             firstname=data.get("firstname"),
             swtd_id=data.get("swtd_id"),
             title=data.get("title"),
-            date_created=data.get("date_created").strftime("%d %B %Y %I:%M %p"),
+            date_created=data.get("date_created"),
             status=data.get("status"),
-            validation_date=data.get("validation_date").strftime("%d %B %Y %I:%M %p"),
+            validation_date=data.get("validation_date"),
             validator_name=data.get("validator_name"),
             app_url=os.getenv("APP_URL")
         )
 
-        self.send_mail('SWTD Validation Update | PointWatch', [email,], mail_body)
-
-    def send_clearance_update_mail(self, email: str, **data: dict[str, Any]) -> None:
-        with current_app.open_resource('templates/clearing_granted_template.txt', 'r') as f:
-            mail_template = f.read()
+    def send_swtd_validation_summary_mail(self, email: str, after_commit: bool=False, **data: dict[str, Any]) -> None:
+        self.send_template_mail(
+            "validation_summary",
+            [email,],
+            after_commit=after_commit,
+            firstname=data.get("firstname"),
+            swtds=data.get("swtds"),
+            validation_date=data.get("validation_date"),
+            validator_name=data.get("validator_name"),
+            app_url=os.getenv("APP_URL")
+        )
 
-        mail_body = mail_template.format(
+    def send_clearance_update_mail(self, email: str, after_commit: bool=False, **data: dict[str, Any]) -> None:
+        self.send_template_mail(
+            "clearing_granted",
+            [email,],
+            after_commit=after_commit,
             firstname=data.get("firstname"),
             term_name=data.get("term_name"),
-            date_created=data.get("date_created").strftime("%d %B %Y %I:%M %p"),
+            date_created=data.get("date_created"),
             clearer_name=data.get("clearer_name")
         )
-
-        self.send_mail('Term Clearance Update | PointWatch', [email,], mail_body)
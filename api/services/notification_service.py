@@ -1,7 +1,7 @@
 from typing import Any
 from datetime import datetime
 
-from sqlalchemy import event
+from sqlalchemy import event, insert
 from sqlalchemy.orm import Mapper
 from sqlalchemy.engine import Connection
 from flask_sqlalchemy import SQLAlchemy
@@ -10,6 +10,7 @@ from flask_socketio import SocketIO
 from ..models.notification import Notification
 from ..models.clearing import Clearing
 from ..models.swtd_form import SWTDForm
+from ..models.user import User
 
 from ..services.term_service import TermService
 from ..services.user_service import UserService
@@ -50,8 +51,10 @@ class NotificationService:
         )
 
         if swtd_form.validation_status != "PENDING":
+            # Mail is queued once the transaction commits, so SMTP never runs inside the flush.
             self.mail_service.send_swtd_validation_mail(
                 swtd_form.author.email,
+                after_commit=True,
                 firstname=swtd_form.author.firstname,
                 swtd_id=swtd_form.id,
                 title=swtd_form.title,
@@ -76,6 +79,7 @@ class NotificationService:
 
         self.mail_service.send_clearance_update_mail(
             target.email,
+            after_commit=True,
             firstname=target.firstname,
             term_name=term.name,
             date_created=clearing.date_created,
@@ -84,6 +88,115 @@ class NotificationService:
 
         self.trigger_ws_event('term_clearing_update', notification.to_dict())
 
+    def notify_clearances(self, clearings: list[Clearing]) -> None:
+        """Notifies the users of clearings granted in bulk, which bypass handle_after_insert_clearing.
+
+        The notifications are inserted together and the mail is queued as one batch when they commit. Socket events are
+        emitted after the commit.
+        """
+        if not clearings:
+            return
+
+        now = datetime.now()
+        rows = [
+            {"date_created": now, "actor_id": clearing.clearer_id, "target_id": clearing.user_id, "data": clearing.term.to_dict()}
+            for clearing in clearings
+        ]
+
+        # One statement for every notification. Adding them to the session would insert them one by one.
+        self.db.session.execute(insert(Notification.__table__), rows)
+
+        for clearing in clearings:
+            self.mail_service.send_clearance_update_mail(
+                clearing.user.email,
+                after_commit=True,
+                firstname=clearing.user.firstname,
+                term_name=clearing.term.name,
+                date_created=clearing.date_created,
+                clearer_name=f"{clearing.clearer.firstname} {clearing.clearer.lastname}"
+            )
+
+        self.db.session.commit()
+
+        for row in rows:
+            self.trigger_ws_event('term_clearing_update', self.get_bulk_payload(row))
+
+    def notify_validations(self, validator: User, swtd_forms: list[SWTDForm]) -> None:
+        """Notifies the authors of SWTDs validated in bulk, which bypass handle_after_update_swtd.
+
+        Each author gets one notification and at most one mail covering all of their SWTDs, however many there are.
+        """
+        if not swtd_forms:
+            return
+
+        forms_by_author = {}
+        for swtd_form in swtd_forms:
+            forms_by_author.setdefault(swtd_form.author_id, []).append(swtd_form)
+
+        now = datetime.now()
+        validator_name = f"{validator.firstname} {validator.lastname}"
+        rows = []
+
+        for author_id, forms in forms_by_author.items():
+            author = forms[0].author
+            statuses = {swtd_form.validation_status for swtd_form in forms}
+
+            # A single SWTD keeps the shape of the per-form notification.
+            rows.append({
+                "date_created": now,
+                "actor_id": validator.id,
+                "target_id": author_id,
+                "data": {
+                    "title": forms[0].title if len(forms) == 1 else f"{len(forms)} SWTD Forms",
+                    "status": statuses.pop() if len(statuses) == 1 else "MIXED",
+                    "swtds": [{"id": swtd_form.id, "title": swtd_form.title, "status": swtd_form.validation_status} for swtd_form in forms]
+                }
+            })
+
+            validated = [swtd_form for swtd_form in forms if swtd_form.validation_status != "PENDING"]
+
+            if len(validated) == 1:
+                swtd_form = validated[0]
+                self.mail_service.send_swtd_validation_mail(
+                    author.email,
+                    after_commit=True,
+                    firstname=author.firstname,
+                    swtd_id=swtd_form.id,
+                    title=swtd_form.title,
+                    date_created=swtd_form.date_created,
+                    status=swtd_form.validation_status,
+                    validation_date=swtd_form.date_validated,
+                    validator_name=validator_name
+                )
+            elif validated:
+                self.mail_service.send_swtd_validation_summary_mail(
+                    author.email,
+                    after_commit=True,
+                    firstname=author.firstname,
+                    swtds=[(swtd_form.title, swtd_form.validation_status) for swtd_form in validated],
+                    validation_date=now,
+                    validator_name=validator_name
+                )
+
+        self.db.session.execute(insert(Notification.__table__), rows)
+        self.db.session.commit()
+
+        for row in rows:
+            self.trigger_ws_event('swtd_validation_update', self.get_bulk_payload(row))
+
+    def get_bulk_payload(self, row: dict[str, Any]) -> dict[str, Any]:
+        """The socket payload of a notification inserted in bulk, shaped like Notification.to_dict().
+
+        It is built from the inserted row, since the row cannot be read back reliably. The id is left out because a bulk
+        insert does not return it on every database.
+        """
+        return {
+            "date_created": row["date_created"].strftime("%m-%d-%Y %H:%M"),
+            "is_deleted": False,
+            "data": row["data"],
+            "is_viewed": False
+        }
+
     def create_notification(self, **data: dict[str, Any]) -> Notification:
         notification = Notification(
             date_created=datetime.now(),
@@ -1,13 +1,63 @@
+import os
+from typing import Any, Callable
+
 import bcrypt
+from flask import Flask
+
+try:
+    from gevent import monkey
+    from gevent.threadpool import ThreadPool
+except ImportError:
+    monkey = ThreadPool = None
 
 class PasswordEncoderService:
+    """Hashes and checks passwords with bcrypt, at a cost of BCRYPT_ROUNDS.
+
+    A hash keeps a CPU busy for its whole duration. Under gevent that would stall every other greenlet of the worker, so
+    the work is handed to a pool of BCRYPT_WORKERS OS threads that the hub waits on cooperatively. Without gevent it runs
+    inline, since bcrypt releases the GIL while hashing.
+    """
     def __init__(self) -> None:
-        pass
+        self.rounds = 12
+        self.workers = 4
+        self.pool = None
+        self.pool_pid = None
+
+    def init_app(self, app: Flask) -> None:
+        rounds = int(app.config.get("BCRYPT_ROUNDS", 12))
+        if not 4 <= rounds <= 31:
+            raise ValueError(f"BCRYPT_ROUNDS must be between 4 and 31, got {rounds}.")
+
+        self.rounds = rounds
+        self.workers = int(app.config.get("BCRYPT_WORKERS", 4))
+
+        if self.pool:
+            self.pool.kill()
+            self.pool = None
+
+    def run(self, func: Callable[..., Any], *args: Any) -> Any:
+        if not monkey or not monkey.is_module_patched("threading"):
+            return func(*args)
+
+        # Created on first use in each process, so forked workers do not share the parent's threads.
+        if not self.pool or self.pool_pid != os.getpid():
+            self.pool = ThreadPool(self.workers)
+            self.pool_pid = os.getpid()
+
+        return self.pool.apply(func, args)
 
     def encode_password(self, password: str) -> str:
-        salt = bcrypt.gensalt()
-        hashed_password = bcrypt.hashpw(password.encode('utf-8'), salt)
+        salt = bcrypt.gensalt(rounds=self.rounds)
+        hashed_password = self.run(bcrypt.hashpw, password.encode('utf-8'), salt)
         return hashed_password.decode('utf-8')
 
     def check_password(self, encoded_password: str, password: str) -> bool:
-        return bcrypt.checkpw(password.encode('utf-8'), encoded_password.encode('utf-8'))
+        return self.run(bcrypt.checkpw, password.encode('utf-8'), encoded_password.encode('utf-8'))
+
+    def needs_rehash(self, encoded_password: str) -> bool:
+        """Whether a hash was made with another cost or bcrypt variant than new hashes are."""
+        try:
+            _, prefix, rounds, _ = encoded_password.split("$")
+            return prefix != "2b" or int(rounds) != self.rounds
+        except ValueError:
+            return True
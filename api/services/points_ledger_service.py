@@ -0,0 +1,321 @@
+from typing import Any, Iterable, Optional
+from datetime import datetime
+
+from flask_sqlalchemy import SQLAlchemy
+from sqlalchemy import event, select, delete, update, insert, func, case, and_, or_
+from sqlalchemy.orm import Mapper
+from sqlalchemy.orm.attributes import get_history
+from sqlalchemy.engine import Connection
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.dialects import sqlite, mysql, postgresql
+from sqlalchemy.sql import Select
+
+from ..models.user_term_points import UserTermPoints
+from ..models.swtd_form import SWTDForm
+from ..models.clearing import Clearing
+from ..models.term import Term
+
+# Ledger columns that each validation status adds to.
+POINT_COLUMNS = {"APPROVED": "valid_points", "PENDING": "pending_points", "REJECTED": "invalid_points"}
+COUNT_COLUMNS = {"PENDING": "pending_swtds", "REJECTED": "invalid_swtds"}
+TOTAL_COLUMNS = ["valid_points", "pending_points", "invalid_points", "pending_swtds", "invalid_swtds"]
+
+# SWTD attributes that decide which ledger row it counts towards, and by how much.
+TRACKED_ATTRIBUTES = ["author_id", "term_id", "validation_status", "points", "is_deleted", "start_date"]
+
+class PointsLedgerService:
+    """Keeps tbluserterm_points in step with SWTDs and clearings, so point totals are read from one row per user and term.
+
+    Rows are adjusted by the change of each flushed SWTD, on the flush's own connection, so they commit or roll back
+    with it. Bulk statements that bypass the ORM must call refresh() for the rows they touch.
+    """
+    # Allowed difference between a ledger total and the recomputed one, for float rounding.
+    tolerance = 1e-6
+
+    def __init__(self, db: SQLAlchemy) -> None:
+        self.db = db
+
+        self.init_event_handlers()
+
+    def init_event_handlers(self) -> None:
+        event.listen(SWTDForm, 'after_insert', self.handle_after_insert_swtd)
+        event.listen(SWTDForm, 'after_update', self.handle_after_update_swtd)
+        event.listen(SWTDForm, 'after_delete', self.handle_after_delete_swtd)
+        event.listen(Clearing, 'after_insert', self.handle_after_change_clearing)
+        event.listen(Clearing, 'after_update', self.handle_after_change_clearing)
+        event.listen(Term, 'after_update', self.handle_after_update_term)
+
+    def get_points(self, user_ids: list[int], term_id: int) -> dict[int, Any]:
+        """Ledger rows of the users for the term, keyed by user. Users without a row have no SWTDs or clearing."""
+        if not user_ids:
+            return {}
+
+        # Read as plain rows. ORM instances could be stale, since the ledger is written underneath the session.
+        rows = self.db.session.execute(
+            select(UserTermPoints.__table__).where(UserTermPoints.term_id == term_id, UserTermPoints.user_id.in_(user_ids))
+        ).all()
+
+        return {row.user_id: row for row in rows}
+
+    def handle_after_insert_swtd(self, mapper: Mapper, connection: Connection, swtd_form: SWTDForm) -> None:
+        values = {attribute: getattr(swtd_form, attribute) for attribute in TRACKED_ATTRIBUTES}
+        self.apply_changes(connection, [(values, 1)])
+
+    def handle_after_delete_swtd(self, mapper: Mapper, connection: Connection, swtd_form: SWTDForm) -> None:
+        values = {attribute: getattr(swtd_form, attribute) for attribute in TRACKED_ATTRIBUTES}
+        self.apply_changes(connection, [(values, -1)])
+
+    def handle_after_update_swtd(self, mapper: Mapper, connection: Connection, swtd_form: SWTDForm) -> None:
+        old, new = {}, {}
+
+        for attribute in TRACKED_ATTRIBUTES:
+            history = get_history(swtd_form, attribute)
+            new[attribute] = getattr(swtd_form, attribute)
+
+            if history.deleted:
+                old[attribute] = history.deleted[0]
+            elif not history.added:
+                old[attribute] = new[attribute]
+
+        if old == new:
+            return
+
+        # A value changed without its previous one being loaded, so the change cannot be computed.
+        if len(old) < len(TRACKED_ATTRIBUTES):
+            pairs = {(new["author_id"], new["term_id"])}
+            if "author_id" in old and "term_id" in old:
+                pairs.add((old["author_id"], old["term_id"]))
+
+            self.refresh(pairs, connection)
+            return
+
+        self.apply_changes(connection, [(old, -1), (new, 1)])
+
+    def handle_after_change_clearing(self, mapper: Mapper, connection: Connection, clearing: Clearing) -> None:
+        is_cleared = connection.execute(
+            select(func.count(Clearing.id)).where(
+                Clearing.user_id == clearing.user_id,
+                Clearing.term_id == clearing.term_id,
+                Clearing.is_deleted == False
+            )
+        ).scalar() > 0
+
+        self.upsert(connection, [{"user_id": clearing.user_id, "term_id": clearing.term_id, "is_cleared": is_cleared}], ["is_cleared"])
+
+    def handle_after_update_term(self, mapper: Mapper, connection: Connection, term: Term) -> None:
+        # Moving the term's dates changes which of its SWTDs count towards the point totals.
+        if get_history(term, "start_date").has_changes() or get_history(term, "end_date").has_changes():
+            self.refresh_term(term.id, connection)
+
+    def apply_changes(self, connection: Connection, changes: list[tuple[dict[str, Any], int]]) -> None:
+        """Adds each SWTD state's contribution, multiplied by its sign, to the row of its author and term."""
+        deltas = {}
+
+        for values, sign in changes:
+            contribution = self.get_contribution(connection, values)
+            row = deltas.setdefault((values["author_id"], values["term_id"]), dict.fromkeys(TOTAL_COLUMNS, 0))
+
+            for column, value in contribution.items():
+                row[column] += sign * value
+
+        rows = [
+            {"user_id": user_id, "term_id": term_id, **totals}
+            for (user_id, term_id), totals in deltas.items()
+            if any(totals.values())
+        ]
+
+        self.upsert(connection, rows, TOTAL_COLUMNS, increment=True)
+
+    def get_contribution(self, connection: Connection, values: dict[str, Any]) -> dict[str, float]:
+        if values["is_deleted"]:
+            return {}
+
+        contribution = {}
+        status = values["validation_status"]
+
+        if status in COUNT_COLUMNS:
+            contribution[COUNT_COLUMNS[status]] = 1
+
+        if status in POINT_COLUMNS and values["points"]:
+            term = connection.execute(select(Term.start_date, Term.end_date).where(Term.id == values["term_id"])).first()
+
+            # Attributes set on the instance may still hold the datetime they were assigned.
+            start_date = values["start_date"]
+            if isinstance(start_date, datetime):
+                start_date = start_date.date()
+
+            # Like the reports, points only count when the SWTD starts within its term.
+            if term and term.start_date <= start_date <= term.end_date:
+                contribution[POINT_COLUMNS[status]] = values["points"]
+
+        return contribution
+
+    def upsert(self, connection: Connection, rows: list[dict[str, Any]], columns: list[str], increment: bool=False) -> None:
+        """Inserts the rows, or on conflict sets the given columns, or adds to them with increment."""
+        if not rows:
+            return
+
+        table = UserTermPoints.__table__
+        now = datetime.now()
+        rows = [{**dict.fromkeys(TOTAL_COLUMNS, 0), "is_cleared": False, **row, "date_modified": now} for row in rows]
+
+        def get_values(new: Any) -> dict[str, Any]:
+            values = {column: table.c[column] + new[column] if increment else new[column] for column in columns}
+            return {**values, "date_modified": new["date_modified"]}
+
+        dialect = connection.dialect.name
+
+        if dialect in ("sqlite", "postgresql"):
+            statement = (sqlite.insert if dialect == "sqlite" else postgresql.insert)(table)
+            connection.execute(statement.on_conflict_do_update(index_elements=["user_id", "term_id"], set_=get_values(statement.excluded)), rows)
+        elif dialect in ("mysql", "mariadb"):
+            statement = mysql.insert(table)
+            connection.execute(statement.on_duplicate_key_update(get_values(statement.inserted)), rows)
+        else:
+            for row in rows:
+                values = {column: table.c[column] + row[column] if increment else row[column] for column in columns}
+                updated = connection.execute(
+                    update(table).where(table.c.user_id == row["user_id"], table.c.term_id == row["term_id"]).values(**values, date_modified=now)
+                ).rowcount
+
+                if not updated:
+                    connection.execute(insert(table).values(row))
+
+    def get_totals_query(self) -> Select:
+        """Recomputes ledger rows from the SWTDs, one per author and term."""
+        active = SWTDForm.is_deleted == False
+        in_term = and_(active, SWTDForm.start_date >= Term.start_date, SWTDForm.start_date <= Term.end_date)
+
+        def total(status: str) -> Any:
+            return func.coalesce(func.sum(case((and_(in_term, SWTDForm.validation_status == status), SWTDForm.points), else_=0)), 0)
+
+        def count(status: str) -> Any:
+            return func.coalesce(func.sum(case((and_(active, SWTDForm.validation_status == status), 1), else_=0)), 0)
+
+        return (
+            select(
+                SWTDForm.author_id.label("user_id"),
+                SWTDForm.term_id.label("term_id"),
+                total("APPROVED").label("valid_points"),
+                total("PENDING").label("pending_points"),
+                total("REJECTED").label("invalid_points"),
+                count("PENDING").label("pending_swtds"),
+                count("REJECTED").label("invalid_swtds")
+            )
+            .join(Term, Term.id == SWTDForm.term_id)
+            .group_by(SWTDForm.author_id, SWTDForm.term_id)
+        )
+
+    def compute_rows(self, connection: Connection, swtd_filter: Any=None, clearing_filter: Any=None) -> dict[tuple[int, int], dict[str, Any]]:
+        totals_query = self.get_totals_query()
+        clearings_query = select(Clearing.user_id, Clearing.term_id).where(Clearing.is_deleted == False).distinct()
+
+        if swtd_filter is not None:
+            totals_query = totals_query.where(swtd_filter)
+            clearings_query = clearings_query.where(clearing_filter)
+
+        rows = {}
+        for row in connection.execute(totals_query):
+            rows[(row.user_id, row.term_id)] = {**row._asdict(), "is_cleared": False}
+
+        for user_id, term_id in connection.execute(clearings_query):
+            row = rows.setdefault((user_id, term_id), {"user_id": user_id, "term_id": term_id, **dict.fromkeys(TOTAL_COLUMNS, 0)})
+            row["is_cleared"] = True
+
+        return rows
+
+    def refresh(self, pairs: Iterable[tuple[int, int]], connection: Optional[Connection]=None) -> None:
+        """Recomputes the rows of the given (user_id, term_id) pairs. Runs in the session's transaction by default."""
+        pairs = set(pairs)
+        if not pairs:
+            return
+
+        connection = connection or self.db.session.connection()
+
+        rows = self.compute_rows(
+            connection,
+            or_(*[and_(SWTDForm.author_id == user_id, SWTDForm.term_id == term_id) for user_id, term_id in pairs]),
+            or_(*[and_(Clearing.user_id == user_id, Clearing.term_id == term_id) for user_id, term_id in pairs])
+        )
+
+        # Pairs left without SWTDs or a clearing are reset to zero.
+        for user_id, term_id in pairs:
+            rows.setdefault((user_id, term_id), {"user_id": user_id, "term_id": term_id})
+
+        self.upsert(connection, list(rows.values()), [*TOTAL_COLUMNS, "is_cleared"])
+
+    def refresh_term(self, term_id: int, connection: Optional[Connection]=None) -> None:
+        connection = connection or self.db.session.connection()
+
+        connection.execute(
+            update(UserTermPoints.__table__)
+            .where(UserTermPoints.term_id == term_id)
+            .values(**dict.fromkeys(TOTAL_COLUMNS, 0), is_cleared=False, date_modified=datetime.now())
+        )
+
+        rows = self.compute_rows(connection, SWTDForm.term_id == term_id, Clearing.term_id == term_id)
+        self.upsert(connection, list(rows.values()), [*TOTAL_COLUMNS, "is_cleared"])
+
+    def rebuild(self, batch_size: int=1000) -> int:
+        """Replaces the whole ledger with rows recomputed from the SWTDs and clearings, in one transaction."""
+        connection = self.db.session.connection()
+        rows = list(self.compute_rows(connection).values())
+        now = datetime.now()
+
+        connection.execute(delete(UserTermPoints.__table__))
+        for i in range(0, len(rows), batch_size):
+            connection.execute(insert(UserTermPoints.__table__), [{**row, "date_modified": now} for row in rows[i:i + batch_size]])
+
+        self.db.session.commit()
+        return len(rows)
+
+    def rebuild_if_empty(self) -> bool:
+        """Rebuilds the ledger if it has no rows while SWTDs or clearings exist, as when db.create_all() has just added the
+        table to an existing database. Returns whether it was rebuilt."""
+        session = self.db.session
+
+        if session.scalar(select(UserTermPoints.user_id).limit(1)) is not None:
+            return False
+
+        if session.scalar(select(SWTDForm.id).limit(1)) is None and session.scalar(select(Clearing.id).limit(1)) is None:
+            return False
+
+        try:
+            self.rebuild()
+        except IntegrityError:
+            # Another process filled the ledger first.
+            session.rollback()
+            return False
+
+        return True
+
+    def verify(self) -> list[dict[str, Any]]:
+        """Compares the ledger with recomputed rows. Returns the expected and stored values of every row that differs."""
+        connection = self.db.session.connection()
+        expected = self.compute_rows(connection)
+
+        stored = {
+            (row.user_id, row.term_id): row._asdict()
+            for row in connection.execute(select(UserTermPoints.__table__))
+        }
+
+        # A missing row reads the same as one with nothing in it.
+        empty = {**dict.fromkeys(TOTAL_COLUMNS, 0), "is_cleared": False}
+
+        mismatches = []
+        for pair in sorted(expected.keys() | stored.keys()):
+            want = expected.get(pair, empty)
+            have = stored.get(pair, empty)
+
+            if bool(have["is_cleared"]) != bool(want["is_cleared"]) or any(
+                abs(have[column] - want[column]) > self.tolerance for column in TOTAL_COLUMNS
+            ):
+                mismatches.append({
+                    "user_id": pair[0],
+                    "term_id": pair[1],
+                    "expected": {column: want[column] for column in empty},
+                    "stored": {column: have[column] for column in empty}
+                })
+
+        self.db.session.rollback()
+        return mismatches
@@ -0,0 +1,140 @@
+import os
+import shutil
+import tempfile
+import subprocess
+from typing import Callable, Iterable, Optional
+
+from PIL import Image, ImageOps, UnidentifiedImageError
+from flask_sqlalchemy import SQLAlchemy
+from sqlalchemy.orm import Query
+
+from ..models.blob import Blob
+
+from ..services.job_service import JobService
+from ..services.storage_service import StorageService
+
+class PreviewService:
+    """Renders downscaled JPEG variants of proof files in the background and stores them next to the original blob."""
+    # Variants are rendered largest first, each from the previous one.
+    variants = {
+        "preview": (1280, 1280),
+        "thumb": (256, 256)
+    }
+    quality = 80
+
+    def __init__(self, db: SQLAlchemy, job_service: JobService, storage_service: StorageService) -> None:
+        self.data_dir = os.getenv('DATA_DIR', os.path.abspath('data'))
+        # Used to rasterize the first page of PDFs. PDF proofs get no previews without it.
+        self.pdftoppm = shutil.which(os.getenv("PDFTOPPM_PATH", "pdftoppm"))
+        self.db = db
+        self.job_service = job_service
+        self.storage_service = storage_service
+
+        self.job_service.register("proof.previews", self.generate)
+
+    def get_blob(self, filter_func: Callable[[Query, Blob], Iterable]) -> Blob:
+        return filter_func(Blob.query, Blob)
+
+    def get_key(self, key: str, variant: str) -> str:
+        return f"{key}.{variant}.jpg"
+
+    def enqueue(self, blob: Blob) -> None:
+        self.job_service.enqueue_after_commit("proof.previews", blob_id=blob.id)
+
+    def enqueue_missing(self, batch_size: int=100) -> int:
+        """Queues previews for blobs that have none yet, such as those stored before previews existed."""
+        count = 0
+        last_id = 0
+
+        while True:
+            ids = self.get_blob(lambda q, b: q.with_entities(b.id).filter(b.preview_status == None, b.id > last_id).order_by(b.id).limit(batch_size).all())
+            if not ids:
+                break
+
+            last_id = ids[-1].id
+            self.job_service.enqueue_many("proof.previews", [{"blob_id": row.id} for row in ids])
+            count += len(ids)
+
+        return count
+
+    def delete_previews(self, key: str) -> None:
+        for variant in self.variants:
+            self.storage_service.delete(self.get_key(key, variant))
+
+    def generate(self, blob_id: int) -> None:
+        blob = self.get_blob(lambda q, b: q.filter_by(id=blob_id).first())
+        if not blob or blob.preview_status == "DONE":
+            return
+
+        # Kept under DATA_DIR so that local storage can move the rendered files into place.
+        os.makedirs(self.data_dir, exist_ok=True)
+        work_dir = tempfile.mkdtemp(dir=self.data_dir, prefix="previews-")
+
+        try:
+            path = self.storage_service.get_local_path(blob.key)
+            if not path:
+                path = os.path.join(work_dir, "source")
+                with self.storage_service.open(blob.key) as content, open(path, "wb") as f:
+                    shutil.copyfileobj(content, f)
+
+            image = self.open_image(path, work_dir)
+            if image is None:
+                blob.preview_status = "UNSUPPORTED"
+                self.db.session.commit()
+                return
+
+            with image:
+                self.render(image, blob.key, work_dir)
+
+            blob.preview_status = "DONE"
+            self.db.session.commit()
+        finally:
+            shutil.rmtree(work_dir, ignore_errors=True)
+
+    def open_image(self, path: str, work_dir: str) -> Optional[Image.Image]:
+        """Opens the file as an image, rasterizing the first page of PDFs. Returns None for other files."""
+        with open(path, "rb") as f:
+            is_pdf = f.read(5) == b"%PDF-"
+
+        if is_pdf:
+            if not self.pdftoppm:
+                return None
+
+            # Rendered straight at preview size rather than at the page's full resolution.
+            output = os.path.join(work_dir, "page")
+            subprocess.run(
+                [self.pdftoppm, "-f", "1", "-l", "1", "-singlefile", "-png", "-scale-to", str(max(max(self.variants.values()))), path, output],
+                check=True, capture_output=True, timeout=60
+            )
+
+            path = f"{output}.png"
+
+        try:
+            image = Image.open(path)
+        except (UnidentifiedImageError, Image.DecompressionBombError):
+            return None
+
+        # Lets JPEG decode at a fraction of its resolution when that is still larger than the biggest variant.
+        image.draft("RGB", max(self.variants.values()))
+        return image
+
+    def render(self, image: Image.Image, key: str, work_dir: str) -> None:
+        image = ImageOps.exif_transpose(image)
+
+        for variant, size in self.variants.items():
+            image.thumbnail(size, Image.Resampling.LANCZOS)
+
+            path = os.path.join(work_dir, f"{variant}.jpg")
+            flatten(image).save(path, "JPEG", quality=self.quality, optimize=True, progressive=True)
+
+            self.storage_service.put(self.get_key(key, variant), path, move=True)
+
+def flatten(image: Image.Image) -> Image.Image:
+    """Converts the image to RGB, placing transparent images on a white background."""
+    if image.mode in ("RGBA", "LA") or (image.mode == "P" and "transparency" in image.info):
+        image = image.convert("RGBA")
+        background = Image.new("RGB", image.size, (255, 255, 255))
+        background.paste(image, mask=image.getchannel("A"))
+        return background
+
+    return image.convert("RGB")
@@ -0,0 +1,185 @@
+import os
+import shutil
+from datetime import datetime, timedelta
+from typing import Any, Callable, Iterable, Optional
+
+from flask import Flask, current_app
+from flask_jwt_extended import decode_token
+from flask_jwt_extended.exceptions import JWTExtendedException
+from flask_sqlalchemy import SQLAlchemy
+from flask_socketio import SocketIO, join_room
+from jwt.exceptions import PyJWTError
+from sqlalchemy import update
+from sqlalchemy.orm import Query
+
+from ..models.report import Report
+
+from ..services.job_service import JobService
+from ..services.ft_service import FTService
+from ..services.user_service import UserService
+from ..services.department_service import DepartmentService
+from ..services.term_service import TermService
+from ..services.ft_service import remove_file
+
+from ..exceptions.validation import InvalidParameterError
+
+class ReportService:
+    # Minimum change in progress between two updates.
+    progress_step = 0.05
+
+    def __init__(self, db: SQLAlchemy, socketio: SocketIO, job_service: JobService, ft_service: FTService, user_service: UserService, department_service: DepartmentService, term_service: TermService) -> None:
+        self.data_dir = os.getenv('DATA_DIR', os.path.abspath('data'))
+        self.retention = 7 * 24 * 3600
+        self.db = db
+        self.socketio = socketio
+        self.job_service = job_service
+        self.ft_service = ft_service
+        self.user_service = user_service
+        self.department_service = department_service
+        self.term_service = term_service
+
+        self.job_service.register("report.generate", self.generate)
+        self.socketio.on_event("connect", self.handle_connect, namespace="/notifications")
+
+    def init_app(self, app: Flask) -> None:
+        self.retention = float(app.config.get("REPORT_RETENTION", 7 * 24 * 3600))
+
+    def handle_connect(self, auth: Optional[dict[str, Any]]=None) -> None:
+        """Joins clients that connect with an access token to the room of their user, where their report progress is sent.
+
+        Clients without a valid token are still accepted, and only receive the broadcast notifications.
+        """
+        token = (auth or {}).get("token")
+        if not token:
+            return
+
+        try:
+            claims = decode_token(token)
+        except (JWTExtendedException, PyJWTError):
+            return
+
+        identity = claims.get(current_app.config.get("JWT_IDENTITY_CLAIM", "sub"))
+        user = self.user_service.get_user(lambda q, u: q.filter_by(email=identity, is_deleted=False).first())
+        if not user or claims.get("ver", user.token_version) != user.token_version:
+            return
+
+        join_room(self.get_user_room(user.id))
+
+    def get_user_room(self, user_id: int) -> str:
+        return f"user:{user_id}"
+
+    def create_report(self, **data: dict[str, Any]) -> Report:
+        report = Report(
+            type=data.get("type"),
+            requester_id=data.get("requester_id"),
+            user_id=data.get("user_id"),
+            department_id=data.get("department_id"),
+            term_id=data.get("term_id")
+        )
+
+        self.db.session.add(report)
+        self.db.session.flush()
+
+        self.job_service.enqueue_after_commit("report.generate", report_id=report.id)
+        self.db.session.commit()
+        return report
+
+    def get_report(self, filter_func: Callable[[Query, Report], Iterable]) -> Report:
+        return filter_func(Report.query, Report)
+
+    def update_report(self, report: Report, **data: dict[str, Any]) -> Report:
+        for key, value in data.items():
+            if not hasattr(report, key):
+                raise InvalidParameterError(key)
+
+            setattr(report, key, value)
+
+        report.date_modified = datetime.now()
+        self.db.session.commit()
+        return report
+
+    def generate(self, report_id: int) -> None:
+        report = self.get_report(lambda q, r: q.filter_by(id=report_id).first())
+        if not report or report.status == "DONE":
+            return
+
+        self.update_report(report, status="RUNNING", progress=0.0, error=None)
+        self.trigger_progress_event(report.id, report.requester_id, "RUNNING", 0.0)
+
+        try:
+            content, filename = self.render(report)
+
+            path = os.path.join(self.data_dir, "reports", f"{report.id}.pdf")
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+
+            with content, open(path, "wb") as f:
+                shutil.copyfileobj(content, f)
+
+            self.update_report(report, status="DONE", progress=1.0, path=path, filename=filename)
+        except Exception as e:
+            self.db.session.rollback()
+            self.update_report(report, status="FAILED", error=str(e))
+
+        self.trigger_progress_event(report.id, report.requester_id, report.status, report.progress)
+
+        if self.retention > 0:
+            self.cleanup()
+
+    def cleanup(self, max_age: float=None) -> int:
+        """Deletes finished reports and their files once they are older than max_age seconds, REPORT_RETENTION by default."""
+        cutoff = datetime.now() - timedelta(seconds=self.retention if max_age is None else max_age)
+        reports = self.get_report(lambda q, r: q.filter(r.status.in_(["DONE", "FAILED"]), r.date_modified < cutoff).all())
+
+        paths = [report.path for report in reports if report.path]
+        for report in reports:
+            self.db.session.delete(report)
+
+        self.db.session.commit()
+
+        for path in paths:
+            remove_file(path)
+
+        return len(reports)
+
+    def render(self, report: Report) -> tuple[Any, str]:
+        progress = self.create_progress_callback(report.id, report.requester_id)
+
+        if report.type == "EMPLOYEE":
+            user = self.user_service.get_user(lambda q, u: q.filter_by(id=report.user_id).first(), profile="export")
+            return self.ft_service.export_for_employee(report.requester, user, progress=progress), f"{user.employee_id}_SWTDReport.pdf"
+
+        department = self.department_service.get_department(lambda q, d: q.filter_by(id=report.department_id).first(), profile="export")
+        term = self.term_service.get_term(lambda q, t: q.filter_by(id=report.term_id).first())
+
+        if report.type == "DEPARTMENT":
+            content = self.ft_service.export_for_head(report.requester, department, term, progress=progress)
+        else:
+            content = self.ft_service.export_for_staff(report.requester, department, term, progress=progress)
+
+        return content, f"{department.name}_Report.pdf"
+
+    def create_progress_callback(self, report_id: int, requester_id: int) -> Callable[[float], None]:
+        last = {"progress": 0.0}
+
+        def progress(value: float) -> None:
+            if value - last["progress"] < self.progress_step:
+                return
+
+            last["progress"] = value
+
+            # Written on a separate connection, since committing the session would expire the
+            # entities still being rendered.
+            with self.db.engine.begin() as connection:
+                connection.execute(update(Report).where(Report.id == report_id).values(progress=value, date_modified=datetime.now()))
+
+            self.trigger_progress_event(report_id, requester_id, "RUNNING", value)
+
+        return progress
+
+    def trigger_progress_event(self, report_id: int, requester_id: int, status: str, progress: float) -> None:
+        self.socketio.emit('report_progress', {
+            "id": report_id,
+            "requester_id": requester_id,
+            "status": status,
+            "progress": progress
+        }, namespace='/notifications', to=self.get_user_room(requester_id))
@@ -0,0 +1,249 @@
+import os
+import hmac
+import shutil
+import hashlib
+from datetime import datetime, timezone
+from typing import IO, Optional
+from urllib.error import HTTPError
+from urllib.parse import quote, urlsplit
+from urllib.request import Request, urlopen
+
+from flask import Flask
+
+class StorageBackend:
+    def put(self, key: str, source: str, move: bool=False) -> None:
+        """Stores the local file at source under key. With move, the source file may be consumed."""
+        raise NotImplementedError()
+
+    def open(self, key: str) -> IO[bytes]:
+        """Opens the object for reading. Raises FileNotFoundError if it does not exist."""
+        raise NotImplementedError()
+
+    def delete(self, key: str) -> None:
+        raise NotImplementedError()
+
+    def exists(self, key: str) -> bool:
+        raise NotImplementedError()
+
+    def get_local_path(self, key: str) -> Optional[str]:
+        """Path of the object on this node's filesystem, if it is stored there."""
+        return None
+
+    def get_url(self, key: str, filename: str, content_type: str) -> Optional[str]:
+        """Time-limited URL clients can download the object from directly, if the backend supports one."""
+        return None
+
+class LocalStorageBackend(StorageBackend):
+    """Stores objects as files under DATA_DIR."""
+    def __init__(self, root: str) -> None:
+        self.root = root
+
+    def get_local_path(self, key: str) -> str:
+        return os.path.join(self.root, *key.split("/"))
+
+    def put(self, key: str, source: str, move: bool=False) -> None:
+        path = self.get_local_path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+
+        if move:
+            os.replace(source, path)
+        else:
+            link_file(source, path)
+
+    def open(self, key: str) -> IO[bytes]:
+        return open(self.get_local_path(key), "rb")
+
+    def delete(self, key: str) -> None:
+        try:
+            os.remove(self.get_local_path(key))
+        except FileNotFoundError:
+            pass
+
+    def exists(self, key: str) -> bool:
+        return os.path.isfile(self.get_local_path(key))
+
+class S3StorageBackend(StorageBackend):
+    """Stores objects in an S3-compatible bucket (AWS S3, MinIO, Ceph), addressed path-style and signed with SigV4."""
+    def __init__(self, endpoint_url: str, bucket: str, region: str, access_key: str, secret_key: str, prefix: str="", url_expires: int=300, redirect: bool=True) -> None:
+        self.endpoint_url = endpoint_url.rstrip("/")
+        self.bucket = bucket
+        self.region = region
+        self.access_key = access_key
+        self.secret_key = secret_key
+        self.prefix = prefix
+        self.url_expires = url_expires
+        self.redirect = redirect
+
+    def get_object_path(self, key: str) -> str:
+        return f"{urlsplit(self.endpoint_url).path}/{self.bucket}/{self.prefix}{key}"
+
+    def request(self, method: str, key: str, body: IO[bytes]=None, headers: dict[str, str]=None, payload_hash: str=None) -> IO[bytes]:
+        split = urlsplit(self.endpoint_url)
+        path = self.get_object_path(key)
+
+        headers = {
+            **(headers or {}),
+            "host": split.netloc,
+            "x-amz-date": datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ"),
+            "x-amz-content-sha256": payload_hash or hashlib.sha256(b"").hexdigest()
+        }
+        headers["authorization"] = sign_request(method, path, {}, headers, headers["x-amz-content-sha256"], self.region, self.access_key, self.secret_key)
+
+        request = Request(f"{split.scheme}://{split.netloc}{quote(path, safe='/~')}", data=body, method=method, headers=headers)
+        return urlopen(request)
+
+    def put(self, key: str, source: str, move: bool=False) -> None:
+        size = os.path.getsize(source)
+
+        with open(source, "rb") as f:
+            self.request("PUT", key, body=f, headers={"content-length": str(size)}, payload_hash=hash_file(source)[0]).close()
+
+        if move:
+            os.remove(source)
+
+    def open(self, key: str) -> IO[bytes]:
+        try:
+            return self.request("GET", key)
+        except HTTPError as e:
+            if e.code == 404:
+                raise FileNotFoundError(key)
+
+            raise
+
+    def delete(self, key: str) -> None:
+        self.request("DELETE", key).close()
+
+    def exists(self, key: str) -> bool:
+        try:
+            self.request("HEAD", key).close()
+            return True
+        except HTTPError as e:
+            if e.code == 404:
+                return False
+
+            raise
+
+    def get_url(self, key: str, filename: str, content_type: str) -> Optional[str]:
+        if not self.redirect:
+            return None
+
+        split = urlsplit(self.endpoint_url)
+        query = {
+            "response-content-disposition": f"inline; filename*=UTF-8''{quote(filename)}",
+            "response-content-type": content_type
+        }
+
+        return presign_url(split.scheme, split.netloc, self.get_object_path(key), query, self.region, self.access_key, self.secret_key, self.url_expires)
+
+class StorageService:
+    backends = {
+        "local": LocalStorageBackend,
+        "s3": S3StorageBackend
+    }
+
+    def __init__(self) -> None:
+        self.backend = None
+
+    def init_app(self, app: Flask) -> None:
+        name = app.config.get("STORAGE_BACKEND", "local")
+        if name not in self.backends:
+            raise ValueError(f"Unknown storage backend '{name}'.")
+
+        if name == "s3":
+            self.backend = S3StorageBackend(
+                endpoint_url=app.config.get("S3_ENDPOINT_URL"),
+                bucket=app.config.get("S3_BUCKET"),
+                region=app.config.get("S3_REGION", "us-east-1"),
+                access_key=app.config.get("S3_ACCESS_KEY_ID"),
+                secret_key=app.config.get("S3_SECRET_ACCESS_KEY"),
+                prefix=app.config.get("S3_PREFIX", ""),
+                url_expires=int(app.config.get("S3_URL_EXPIRES", 300)),
+                redirect=app.config.get("S3_REDIRECT_DOWNLOADS", True)
+            )
+        else:
+            self.backend = LocalStorageBackend(os.getenv('DATA_DIR', os.path.abspath('data')))
+
+    def put(self, key: str, source: str, move: bool=False) -> None:
+        self.backend.put(key, source, move)
+
+    def open(self, key: str) -> IO[bytes]:
+        return self.backend.open(key)
+
+    def delete(self, key: str) -> None:
+        self.backend.delete(key)
+
+    def exists(self, key: str) -> bool:
+        return self.backend.exists(key)
+
+    def get_local_path(self, key: str) -> Optional[str]:
+        return self.backend.get_local_path(key)
+
+    def get_url(self, key: str, filename: str, content_type: str) -> Optional[str]:
+        return self.backend.get_url(key, filename, content_type)
+
+def hash_file(path: str) -> tuple[str, int]:
+    digest = hashlib.sha256()
+    size = 0
+
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(64 * 1024), b""):
+            digest.update(chunk)
+            size += len(chunk)
+
+    return digest.hexdigest(), size
+
+def link_file(source: str, path: str) -> None:
+    """Hard links source to path, replacing any file left there. Falls back to a copy across filesystems."""
+    tmp_path = f"{path}.tmp"
+    if os.path.exists(tmp_path):
+        os.remove(tmp_path)
+
+    try:
+        os.link(source, tmp_path)
+    except OSError:
+        shutil.copyfile(source, tmp_path)
+
+    os.replace(tmp_path, path)
+
+def get_signing_key(secret_key: str, date: str, region: str) -> bytes:
+    key = f"AWS4{secret_key}".encode()
+    for part in (date, region, "s3", "aws4_request"):
+        key = hmac.new(key, part.encode(), hashlib.sha256).digest()
+
+    return key
+
+def get_signature(method: str, path: str, query: dict[str, str], headers: dict[str, str], payload_hash: str, amz_date: str, region: str, secret_key: str) -> tuple[str, str, str]:
+    """Computes an AWS Signature Version 4. Returns the credential scope, signed headers and signature."""
+    canonical_query = "&".join(f"{quote(k, safe='-_.~')}={quote(v, safe='-_.~')}" for k, v in sorted(query.items()))
+    canonical_headers = "".join(f"{k}:{' '.join(v.split())}\n" for k, v in sorted(headers.items()))
+    signed_headers = ";".join(sorted(headers))
+
+    canonical_request = "\n".join([method, quote(path, safe="/~"), canonical_query, canonical_headers, signed_headers, payload_hash])
+
+    scope = f"{amz_date[:8]}/{region}/s3/aws4_request"
+    string_to_sign = "\n".join(["AWS4-HMAC-SHA256", amz_date, scope, hashlib.sha256(canonical_request.encode()).hexdigest()])
+
+    signature = hmac.new(get_signing_key(secret_key, amz_date[:8], region), string_to_sign.encode(), hashlib.sha256).hexdigest()
+    return scope, signed_headers, signature
+
+def sign_request(method: str, path: str, query: dict[str, str], headers: dict[str, str], payload_hash: str, region: str, access_key: str, secret_key: str) -> str:
+    """Returns the Authorization header for a request. headers must use lowercase names and include host and x-amz-date."""
+    scope, signed_headers, signature = get_signature(method, path, query, headers, payload_hash, headers["x-amz-date"], region, secret_key)
+    return f"AWS4-HMAC-SHA256 Credential={access_key}/{scope}, SignedHeaders={signed_headers}, Signature={signature}"
+
+def presign_url(scheme: str, host: str, path: str, query: dict[str, str], region: str, access_key: str, secret_key: str, expires: int, amz_date: str=None) -> str:
+    amz_date = amz_date or datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+
+    query = {
+        **query,
+        "X-Amz-Algorithm": "AWS4-HMAC-SHA256",
+        "X-Amz-Credential": f"{access_key}/{amz_date[:8]}/{region}/s3/aws4_request",
+        "X-Amz-Date": amz_date,
+        "X-Amz-Expires": str(expires),
+        "X-Amz-SignedHeaders": "host"
+    }
+
+    _, _, signature = get_signature("GET", path, query, {"host": host}, "UNSIGNED-PAYLOAD", amz_date, region, secret_key)
+
+    canonical_query = "&".join(f"{quote(k, safe='-_.~')}={quote(v, safe='-_.~')}" for k, v in sorted(query.items()))
+    return f"{scheme}://{host}{quote(path, safe='/~')}?{canonical_query}&X-Amz-Signature={signature}"
@@ -5,6 +5,7 @@ from flask_sqlalchemy import SQLAlchemy
 from sqlalchemy.orm import Query
 
 from ..models.swtd_comment import SWTDComment
+from ..models.loading_profile import apply_loading_profile
 
 from ..exceptions.validation import InvalidParameterError
 
@@ -25,8 +26,8 @@ class SWTDCommentService:
         self.db.session.commit()
         return comment
 
-    def get_comment(self, filter_func: Callable[[Query, SWTDComment], Iterable]) -> SWTDComment:
-        return filter_func(SWTDComment.query, SWTDComment)
+    def get_comment(self, filter_func: Callable[[Query, SWTDComment], Iterable], profile: str=None) -> SWTDComment:
+        return filter_func(apply_loading_profile(SWTDComment.query, SWTDComment, profile), SWTDComment)
 
     def update_comment(self, comment: SWTDComment, **data: dict[str, Any]) -> None:
         for key, value in data.items():
@@ -2,17 +2,22 @@ from typing import Any, Union, Callable, Iterable
 from datetime import datetime
 
 from flask_sqlalchemy import SQLAlchemy
+from sqlalchemy import select, update, case
 from sqlalchemy.orm import Query
 
 from ..models.swtd_form import SWTDForm
+from ..models.user import User
+from ..models.loading_profile import apply_loading_profile
 from ..services.term_service import TermService
+from ..services.points_ledger_service import PointsLedgerService
 
 from ..exceptions.validation import InvalidParameterError
 
 class SWTDService:
-    def __init__(self, db: SQLAlchemy, term_service: TermService) -> None:
+    def __init__(self, db: SQLAlchemy, term_service: TermService, points_ledger_service: PointsLedgerService) -> None:
         self.db = db
         self.term_service = term_service
+        self.points_ledger_service = points_ledger_service
 
     def create_swtd(self, **data: dict[str, Any]) -> SWTDForm:
         swtd_form = SWTDForm()
@@ -27,8 +32,8 @@ class SWTDService:
         self.db.session.commit()
         return swtd_form
 
-    def get_swtd(self, filter_func: Callable[[Query, SWTDForm], Iterable]) -> Union[SWTDForm, None]:
-        return filter_func(SWTDForm.query, SWTDForm)
+    def get_swtd(self, filter_func: Callable[[Query, SWTDForm], Iterable], profile: str=None) -> Union[SWTDForm, None]:
+        return filter_func(apply_loading_profile(SWTDForm.query, SWTDForm, profile), SWTDForm)
 
     def update_swtd(self, swtd_form: SWTDForm, **data: dict[str, Any]) -> SWTDForm:
         for key, value in data.items():
@@ -41,5 +46,37 @@ class SWTDService:
         self.db.session.commit()
         return swtd_form
 
+    def validate_swtds(self, validator: User, statuses: dict[int, str]) -> list[SWTDForm]:
+        """Sets the validation status of many SWTDs, keyed by id, with one UPDATE and commits.
+
+        The per-form mapper handlers do not fire. Returns the updated SWTDs for NotificationService.notify_validations.
+        """
+        if not statuses:
+            return []
+
+        now = datetime.now()
+        swtd_forms = SWTDForm.__table__
+        is_pending = swtd_forms.c.id.in_([id for id, status in statuses.items() if status == "PENDING"])
+
+        self.db.session.execute(
+            update(swtd_forms)
+            .where(swtd_forms.c.id.in_(statuses))
+            .values(
+                validation_status=case(statuses, value=swtd_forms.c.id),
+                validator_id=case((is_pending, None), else_=validator.id),
+                date_validated=case((is_pending, None), else_=now),
+                date_modified=now
+            )
+        )
+
+        pairs = self.db.session.execute(
+            select(swtd_forms.c.author_id, swtd_forms.c.term_id).where(swtd_forms.c.id.in_(statuses)).distinct()
+        ).all()
+
+        self.points_ledger_service.refresh(pairs)
+        self.db.session.commit()
+
+        return self.get_swtd(lambda q, s: q.filter(s.id.in_(statuses)).order_by(s.id).all(), profile="list")
+
     def delete_swtd(self, swtd_form):
         self.update_swtd(swtd_form, is_deleted=True)
@@ -0,0 +1,217 @@
+import io
+import re
+import csv
+import zipfile
+from decimal import Decimal
+from typing import Any, Iterable, Iterator, Optional
+from xml.sax.saxutils import escape
+
+from flask import current_app
+from flask_sqlalchemy import SQLAlchemy
+from sqlalchemy import select, func, case, and_
+from sqlalchemy.sql import Select
+
+from ..models.user import User
+from ..models.department import Department
+from ..models.term import Term
+from ..models.user_term_points import UserTermPoints
+
+from ..services.ft_service import ZipOutput
+
+class TableExportService:
+    """Builds CSV and XLSX reports straight from aggregate queries. Rows are streamed without loading ORM entities."""
+    formats = {
+        "csv": "text/csv",
+        "xlsx": "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+    }
+
+    summary_columns = [
+        "Cleared", "Required Points", "Approved Points", "Pending Points", "For Revision Points", "Pending SWTDs", "For Revision SWTDs"
+    ]
+    member_columns = ["Employee ID", "First Name", "Last Name", "Department", *summary_columns]
+
+    def __init__(self, db: SQLAlchemy) -> None:
+        self.db = db
+
+    def export(self, format: str, columns: list[str], query: Select, title: str="Report") -> Iterator[bytes]:
+        rows = self.fetch(query)
+
+        if format == "xlsx":
+            return write_xlsx(columns, rows, title)
+
+        return write_csv(columns, rows)
+
+    def fetch(self, query: Select) -> Iterator[tuple]:
+        # yield_per fetches through a server-side cursor, so only one batch of rows is held at a time.
+        batch_size = current_app.config.get("STREAM_BATCH_SIZE", 100)
+        for row in self.db.session.execute(query.execution_options(yield_per=batch_size)):
+            yield tuple(row)
+
+    def export_for_employee(self, format: str, user: User) -> Iterator[bytes]:
+        """One row per term the user has points ledger entries for."""
+        required_points = case(
+            (Department.id == None, -1),
+            (Term.type == "MIDYEAR/SUMMER", Department.midyear_points),
+            else_=Department.required_points
+        )
+
+        query = (
+            select(
+                User.employee_id, User.firstname, User.lastname, Department.name, Term.name, Term.start_date, Term.end_date, Term.type,
+                UserTermPoints.is_cleared, required_points, *self.get_ledger_columns()
+            )
+            .select_from(UserTermPoints)
+            .join(Term, Term.id == UserTermPoints.term_id)
+            .join(User, User.id == UserTermPoints.user_id)
+            .outerjoin(Department, Department.id == User.department_id)
+            .where(UserTermPoints.user_id == user.id, Term.is_deleted == False)
+            .order_by(Term.start_date, Term.id)
+        )
+
+        columns = ["Employee ID", "First Name", "Last Name", "Department", "Term", "Term Start", "Term End", "Term Type", *self.summary_columns]
+        return self.export(format, columns, query, title=user.employee_id)
+
+    def export_for_head(self, format: str, department: Department, term: Term) -> Iterator[bytes]:
+        members = [User.department_id == department.id]
+
+        # The head report lists the department's members other than its head.
+        if department.head:
+            members.append(User.id != department.head.id)
+
+        return self.export(format, self.member_columns, self.get_member_query(members, term), title=department.name)
+
+    def export_for_staff(self, format: str, term: Term, department: Optional[Department]=None) -> Iterator[bytes]:
+        """Lists every member of the department, or every employee with a department when none is given."""
+        members = [User.department_id == department.id] if department else [User.department_id != None]
+        return self.export(format, self.member_columns, self.get_member_query(members, term), title=department.name if department else term.name)
+
+    def get_member_query(self, members: list[Any], term: Term) -> Select:
+        # Each member's totals are a single points ledger row.
+        required_points = Department.midyear_points if term.type == "MIDYEAR/SUMMER" else Department.required_points
+
+        return (
+            select(
+                User.employee_id, User.firstname, User.lastname, Department.name, func.coalesce(UserTermPoints.is_cleared, False),
+                func.coalesce(required_points, -1), *[func.coalesce(column, 0) for column in self.get_ledger_columns()]
+            )
+            .outerjoin(Department, Department.id == User.department_id)
+            .outerjoin(UserTermPoints, and_(UserTermPoints.user_id == User.id, UserTermPoints.term_id == term.id))
+            .where(User.is_deleted == False, *members)
+            .order_by(Department.name, User.lastname, User.firstname, User.id)
+        )
+
+    def get_ledger_columns(self) -> list[Any]:
+        return [
+            UserTermPoints.valid_points, UserTermPoints.pending_points, UserTermPoints.invalid_points,
+            UserTermPoints.pending_swtds, UserTermPoints.invalid_swtds
+        ]
+
+# Leading characters that make spreadsheet applications read a cell as a formula.
+FORMULA_PREFIXES = ("=", "+", "-", "@", "\t", "\r")
+
+def format_value(value: Any) -> Any:
+    if isinstance(value, bool):
+        return "Yes" if value else "No"
+
+    # User-entered text is quoted so that it is shown as is rather than evaluated.
+    if isinstance(value, str) and value.startswith(FORMULA_PREFIXES):
+        return "'" + value
+
+    return value
+
+def write_csv(columns: list[str], rows: Iterable[tuple]) -> Iterator[bytes]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+
+    # Starts with a byte order mark so that Excel detects UTF-8.
+    writer.writerow(columns)
+    yield "\ufeff".encode("utf-8") + buffer.getvalue().encode("utf-8")
+
+    for row in rows:
+        buffer.seek(0)
+        buffer.truncate()
+
+        writer.writerow([format_value(value) for value in row])
+        yield buffer.getvalue().encode("utf-8")
+
+# Characters that are not allowed in XML 1.0 documents.
+INVALID_XML_CHARS = re.compile("[\x00-\x08\x0b\x0c\x0e-\x1f]")
+
+XLSX_PARTS = {
+    "[Content_Types].xml": (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+        '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+        '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+        '<Default Extension="xml" ContentType="application/xml"/>'
+        '<Override PartName="/xl/workbook.xml" ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+        '<Override PartName="/xl/worksheets/sheet1.xml" ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+        '</Types>'
+    ),
+    "_rels/.rels": (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+        '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+        '<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" Target="xl/workbook.xml"/>'
+        '</Relationships>'
+    ),
+    "xl/_rels/workbook.xml.rels": (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+        '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+        '<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/worksheet" Target="worksheets/sheet1.xml"/>'
+        '</Relationships>'
+    )
+}
+
+def xlsx_cell(value: Any) -> str:
+    if value is None:
+        return '<c/>'
+
+    if isinstance(value, bool):
+        return f'<c t="b"><v>{int(value)}</v></c>'
+
+    if isinstance(value, (int, float, Decimal)):
+        return f'<c><v>{value}</v></c>'
+
+    text = escape(INVALID_XML_CHARS.sub("", str(format_value(value))))
+    return f'<c t="inlineStr"><is><t xml:space="preserve">{text}</t></is></c>'
+
+def xlsx_row(values: Iterable[Any]) -> str:
+    return "<row>" + "".join(xlsx_cell(value) for value in values) + "</row>"
+
+def write_xlsx(columns: list[str], rows: Iterable[tuple], title: str="Report", batch_size: int=500) -> Iterator[bytes]:
+    """Writes a single-sheet workbook. Cells use inline strings, so the sheet can be written row by row without a shared string table."""
+    # Sheet names are limited to 31 characters and cannot contain []:*?/\
+    sheet_name = escape(re.sub(r"[\[\]:*?/\\]", " ", title)[:31].strip() or "Report", {'"': "&quot;"})
+
+    output = ZipOutput()
+    with zipfile.ZipFile(output, "w", compression=zipfile.ZIP_DEFLATED) as archive:
+        for name, content in XLSX_PARTS.items():
+            archive.writestr(name, content)
+
+        archive.writestr("xl/workbook.xml", (
+            '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+            '<workbook xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" '
+            'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships">'
+            f'<sheets><sheet name="{sheet_name}" sheetId="1" r:id="rId1"/></sheets>'
+            '</workbook>'
+        ))
+
+        with archive.open("xl/worksheets/sheet1.xml", "w", force_zip64=True) as sheet:
+            sheet.write((
+                '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+                '<worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main"><sheetData>'
+                + xlsx_row(columns)
+            ).encode("utf-8"))
+
+            batch = []
+            for row in rows:
+                batch.append(xlsx_row(row))
+
+                if len(batch) >= batch_size:
+                    sheet.write("".join(batch).encode("utf-8"))
+                    batch = []
+
+                    yield output.drain()
+
+            sheet.write(("".join(batch) + '</sheetData></worksheet>').encode("utf-8"))
+
+    yield output.drain()
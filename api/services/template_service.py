@@ -0,0 +1,63 @@
+import os
+from datetime import datetime
+from typing import Any, NamedTuple, Optional
+
+from flask import Flask
+from jinja2 import Environment, FileSystemLoader, StrictUndefined, Template
+
+class RenderedMail(NamedTuple):
+    subject: str
+    text: str
+    html: str
+
+class TemplateService:
+    """Compiles every mail template once. Each source is compiled twice, as plain text and as autoescaped HTML."""
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self.auto_reload = False
+        self.templates = {}
+
+        self.text_env = self.create_environment(autoescape=False)
+        self.html_env = self.create_environment(autoescape=True)
+
+    def create_environment(self, autoescape: bool) -> Environment:
+        env = Environment(
+            loader=FileSystemLoader(self.path),
+            autoescape=autoescape,
+            undefined=StrictUndefined,
+            trim_blocks=True,
+            lstrip_blocks=True,
+            auto_reload=False
+        )
+
+        env.filters["datetime"] = self.format_datetime
+        return env
+
+    def init_app(self, app: Flask) -> None:
+        # Templates are only checked for changes in debug mode.
+        self.auto_reload = app.debug
+        self.text_env.auto_reload = self.auto_reload
+        self.html_env.auto_reload = self.auto_reload
+
+        self.templates = {
+            name: (self.text_env.get_template(name), self.html_env.get_template(name))
+            for name in self.text_env.list_templates(extensions=["j2"])
+        }
+
+    def get_templates(self, name: str) -> tuple[Template, Template]:
+        if self.auto_reload:
+            return self.text_env.get_template(name), self.html_env.get_template(name)
+
+        return self.templates[name]
+
+    def render(self, name: str, **context: dict[str, Any]) -> RenderedMail:
+        text_template, html_template = self.get_templates(f"{name}.j2")
+
+        return RenderedMail(
+            subject=text_template.render(part="subject", **context).strip(),
+            text=text_template.render(part="text", **context).strip() + "\n",
+            html=html_template.render(part="html", **context).strip()
+        )
+
+    def format_datetime(self, value: Optional[datetime]) -> str:
+        return value.strftime("%d %B %Y %I:%M %p") if value else ""
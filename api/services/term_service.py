@@ -5,6 +5,7 @@ from flask_sqlalchemy import SQLAlchemy
 from sqlalchemy.orm import Query
 
 from ..models.term import Term
+from ..models.loading_profile import apply_loading_profile
 
 from ..exceptions.validation import InvalidParameterError
 
@@ -25,8 +26,8 @@ class TermService:
         self.db.session.commit()
         return term
 
-    def get_term(self, filter_func: Callable[[Query, Term], Iterable]) -> Term:
-        return filter_func(Term.query, Term)
+    def get_term(self, filter_func: Callable[[Query, Term], Iterable], profile: str=None) -> Term:
+        return filter_func(apply_loading_profile(Term.query, Term, profile), Term)
 
     def update_term(self, term: Term, **data: dict[str, Any]) -> Term:
         for key, value in data.items():
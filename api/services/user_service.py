@@ -2,22 +2,31 @@ from typing import Union, Any, Callable, Iterable
 from datetime import datetime
 
 from flask_sqlalchemy import SQLAlchemy
+from sqlalchemy import select, update, exists, func, and_, bindparam, tuple_
 from sqlalchemy.orm import Query
 
 from ..models.point_summary import PointSummary
+from ..models.clearing import Clearing
+from ..models.department import Department
 from ..models.term import Term
 from ..models.user import User
+from ..models.user_term_points import UserTermPoints
+from ..models.loading_profile import apply_loading_profile
 
 from ..services.clearing_service import ClearingService
+from ..services.jwt_service import JWTService
+from ..services.points_ledger_service import PointsLedgerService
 
 from ..exceptions.conflct import ResourceAlreadyExistsError
 from ..exceptions.resource import ResourceNotFoundError
 from ..exceptions.validation import InvalidParameterError, InsufficientPointsError
 
 class UserService:
-    def __init__(self, db: SQLAlchemy, clearing_service: ClearingService) -> None:
+    def __init__(self, db: SQLAlchemy, clearing_service: ClearingService, jwt_service: JWTService, points_ledger_service: PointsLedgerService) -> None:
         self.db = db
         self.clearing_service = clearing_service
+        self.jwt_service = jwt_service
+        self.points_ledger_service = points_ledger_service
 
     # Create
     def create_user(self, **data: dict[str, Any]) -> User:
@@ -34,8 +43,8 @@ class UserService:
         return user
 
     # Read One
-    def get_user(self, filter_func: Callable[[Query, User], Iterable]) -> Union[User, None]:
-        return filter_func(User.query, User)
+    def get_user(self, filter_func: Callable[[Query, User], Iterable], profile: str=None) -> Union[User, None]:
+        return filter_func(apply_loading_profile(User.query, User, profile), User)
 
     # Update
     def update_user(self, user: User, **data: dict[str, Any]) -> User:
@@ -45,52 +54,82 @@ class UserService:
 
             setattr(user, key, value)
 
+        # Changes to credentials or token claims revoke previously issued tokens.
+        if any(key in data for key in ("password", "access_level", "is_deleted", "department", "department_id")):
+            user.token_version += 1
+
         user.date_modified = datetime.now()
         self.db.session.commit()
+
+        self.jwt_service.invalidate_requester(user.email)
         return user
     
+    def rehash_password(self, user: User, encoded_password: str) -> None:
+        """Stores a new hash of the user's current password, such as one with a new bcrypt cost. Tokens stay valid.
+
+        The hash is only replaced if the password has not changed since the user was loaded.
+        """
+        users = User.__table__
+
+        self.db.session.execute(
+            update(users).where(users.c.id == user.id, users.c.password == user.password).values(password=encoded_password)
+        )
+        self.db.session.commit()
+
+        self.jwt_service.invalidate_requester(user.email)
+
     def delete_user(self, user) -> None:
         self.update_user(user, is_deleted=True)
 
+    def revoke_tokens(self, *users: User) -> None:
+        for user in users:
+            user.token_version += 1
+
+        self.db.session.commit()
+
+        for user in users:
+            self.jwt_service.invalidate_requester(user.email)
+
     def get_point_summary(self, user: User, term: Term) -> PointSummary:
-        swtd_forms = list(filter(
-            lambda form: (form.is_deleted == False) & 
-            (form.start_date >= term.start_date) & 
-            (form.start_date <= term.end_date) &
-            (form.author == user),
-            term.swtd_forms
-        ))
-
-        points = PointSummary()
-        # Compute VALID, PENDING, and INVALID points
-        for form in swtd_forms:
-            status = form.validation_status
-
-            if status == 'APPROVED':
-                points.valid_points += form.points
-            elif status == 'PENDING':
-                points.pending_points += form.points
-            elif status == 'REJECTED':
-                points.invalid_points += form.points
-
-        points.required_points = -1
-
-        if user.department:
-            if term.type == "MIDYEAR/SUMMER":
-                points.required_points = user.department.midyear_points
-            else:
-                points.required_points = user.department.required_points
-
-        return points
+        return self.get_point_summaries([user], term).get(user.id)
+
+    def get_point_summaries(self, users: list[User], term: Term) -> dict[int, PointSummary]:
+        totals = self.sum_points(term, [u.id for u in users])
+
+        summaries = {}
+        for user in users:
+            points = totals.get(user.id, PointSummary())
+            points.required_points = self.get_required_points(user, term)
+            summaries[user.id] = points
+
+        return summaries
+
+    def sum_points(self, term: Term, user_ids: list[int]) -> dict[int, PointSummary]:
+        # Read from the points ledger, one row per user.
+        rows = self.points_ledger_service.get_points(user_ids, term.id)
+
+        return {
+            user_id: PointSummary(valid_points=row.valid_points, pending_points=row.pending_points, invalid_points=row.invalid_points)
+            for user_id, row in rows.items()
+        }
+
+    def get_required_points(self, user: User, term: Term) -> float:
+        if not user.department:
+            return -1
+
+        if term.type == "MIDYEAR/SUMMER":
+            return user.department.midyear_points
+
+        return user.department.required_points
     
     def get_term_summary(self, user: User, term: Term) -> dict[str, Any]:
-        points = self.get_point_summary(user, term)
-        clearing = self.clearing_service.get_clearing(
-            lambda q, c: q.filter_by(user_id=user.id, term_id=term.id, is_deleted=False).first()
-        )
+        row = self.points_ledger_service.get_points([user.id], term.id).get(user.id)
+
+        points = PointSummary(valid_points=row.valid_points, pending_points=row.pending_points, invalid_points=row.invalid_points) if row else PointSummary()
+        points.required_points = self.get_required_points(user, term)
 
         return {
-            "is_cleared": clearing is not None,
+            "is_cleared": bool(row and row.is_cleared),
             "points": points
         }
 
@@ -114,8 +153,80 @@ class UserService:
             applied_points=points.lacking_points
         )
 
+        self.jwt_service.invalidate_requester(target.email)
+
         return clearing
 
+    def grant_clearances(self, user: User, department: Department, term: Term, user_ids: list[int]=None) -> tuple[list[Clearing], list[dict[str, Any]]]:
+        """Clears every eligible member of the department for the term, or only those in user_ids, in one transaction.
+
+        Returns the new clearings and the members that were skipped, with the reason. The clearings are inserted in bulk,
+        so the per-clearing notification handlers do not fire. Pass them to NotificationService.notify_clearances.
+        """
+        required_points = department.midyear_points if term.type == "MIDYEAR/SUMMER" else department.required_points
+        is_cleared = exists().where(Clearing.user_id == User.id, Clearing.term_id == term.id, Clearing.is_deleted == False)
+
+        # Eligibility of every member in one query, from the points ledger.
+        query = (
+            select(User.id, User.email, User.point_balance, func.coalesce(UserTermPoints.valid_points, 0), is_cleared)
+            .outerjoin(UserTermPoints, and_(UserTermPoints.user_id == User.id, UserTermPoints.term_id == term.id))
+            .where(User.department_id == department.id, User.is_deleted == False)
+        )
+
+        if user_ids is not None:
+            query = query.where(User.id.in_(user_ids))
+
+        members = self.db.session.execute(query).all()
+
+        found = {member.id for member in members}
+        skipped = [{"user_id": user_id, "reason": "NOT_FOUND"} for user_id in dict.fromkeys(user_ids or []) if user_id not in found]
+
+        granted = []
+        for user_id, email, point_balance, valid_points, cleared in members:
+            if cleared:
+                skipped.append({"user_id": user_id, "reason": "ALREADY_CLEARED"})
+                continue
+
+            points = PointSummary(valid_points=valid_points, required_points=required_points)
+            if valid_points + point_balance < required_points:
+                skipped.append({"user_id": user_id, "reason": "INSUFFICIENT_POINTS", "lacking_points": points.lacking_points})
+                continue
+
+            granted.append((user_id, email, points))
+
+        if not granted:
+            return [], skipped
+
+        now = datetime.now()
+        users = User.__table__
+
+        # Adds to the stored balance rather than overwriting it with the value read above.
+        self.db.session.execute(
+            update(users)
+            .where(users.c.id == bindparam("b_id"))
+            .values(point_balance=users.c.point_balance + bindparam("b_delta"), date_modified=now),
+            [{"b_id": user_id, "b_delta": points.excess_points - points.lacking_points} for user_id, _, points in granted]
+        )
+
+        self.clearing_service.create_clearings([
+            {"user_id": user_id, "term_id": term.id, "clearer_id": user.id, "applied_points": points.lacking_points}
+            for user_id, _, points in granted
+        ])
+
+        pairs = [(user_id, term.id) for user_id, _, _ in granted]
+        self.points_ledger_service.refresh(pairs)
+        self.db.session.commit()
+
+        for _, email, _ in granted:
+            self.jwt_service.invalidate_requester(email)
+
+        clearings = self.clearing_service.get_clearing(
+            lambda q, c: q.filter(tuple_(c.user_id, c.term_id).in_(pairs), c.is_deleted == False).all(),
+            profile="detail"
+        )
+
+        return clearings, skipped
+
     def revoke_clearance(self, target: User, term: Term) -> None:
         points = self.get_point_summary(target, term)
 
@@ -127,4 +238,6 @@ class UserService:
         self.db.session.commit()
 
         clearing = self.clearing_service.update_clearing(clearing, is_deleted=True)
+
+        self.jwt_service.invalidate_requester(target.email)
         return clearing
@@ -0,0 +1,50 @@
+"""Add composite indexes for SWTD, clearing and notification lookups
+
+Revision ID: 4b1e7c9d2a6f
+Revises:
+Create Date: 2026-10-18 10:12:41.513074
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '4b1e7c9d2a6f'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+INDEXES = [
+    ('ix_swtdforms_author_term', 'tblswtdforms', ['author_id', 'term_id', 'is_deleted', 'validation_status']),
+    ('ix_swtdforms_term_author', 'tblswtdforms', ['term_id', 'author_id']),
+    ('ix_clearings_user_term', 'tblclearings', ['user_id', 'term_id', 'is_deleted']),
+    ('ix_notifications_target', 'tblnotifications', ['target_id', 'is_deleted', 'date_created']),
+]
+
+
+def get_index_names(table):
+    return {index['name'] for index in sa.inspect(op.get_bind()).get_indexes(table)}
+
+
+def upgrade():
+    # Databases created by db.create_all() after the models declared these indexes already have them.
+    for name, table, columns in INDEXES:
+        if name not in get_index_names(table):
+            op.create_index(name, table, columns)
+
+
+def downgrade():
+    is_mysql = op.get_bind().dialect.name == 'mysql'
+
+    for name, table, columns in reversed(INDEXES):
+        existing = get_index_names(table)
+        if name not in existing:
+            continue
+
+        # MySQL drops the index it created for a foreign key once another index starts with the same column, and
+        # refuses to drop that index while the key depends on it. The single column index is restored first.
+        if is_mysql and columns[0] not in existing:
+            op.create_index(columns[0], table, [columns[0]])
+
+        op.drop_index(name, table_name=table)
@@ -0,0 +1,108 @@
+"""Add the per-user, per-term points ledger
+
+Revision ID: 7c3d5e1f9a20
+Revises: 4b1e7c9d2a6f
+Create Date: 2026-10-18 14:37:05.209381
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '7c3d5e1f9a20'
+down_revision = '4b1e7c9d2a6f'
+branch_labels = None
+depends_on = None
+
+
+def fill_ledger():
+    """Computes every ledger row from the SWTDs and clearings, like `flask points rebuild`, in one INSERT ... SELECT."""
+    swtds = sa.table(
+        'tblswtdforms',
+        sa.column('author_id', sa.Integer), sa.column('term_id', sa.Integer), sa.column('start_date', sa.Date),
+        sa.column('points', sa.Float), sa.column('validation_status', sa.String), sa.column('is_deleted', sa.Boolean)
+    )
+    terms = sa.table('tblterms', sa.column('id', sa.Integer), sa.column('start_date', sa.Date), sa.column('end_date', sa.Date))
+    clearings = sa.table('tblclearings', sa.column('user_id', sa.Integer), sa.column('term_id', sa.Integer), sa.column('is_deleted', sa.Boolean))
+    ledger = sa.table(
+        'tbluserterm_points',
+        sa.column('user_id'), sa.column('term_id'), sa.column('valid_points'), sa.column('pending_points'), sa.column('invalid_points'),
+        sa.column('pending_swtds'), sa.column('invalid_swtds'), sa.column('is_cleared'), sa.column('date_modified')
+    )
+
+    active = swtds.c.is_deleted == sa.false()
+    in_term = sa.and_(active, swtds.c.start_date >= terms.c.start_date, swtds.c.start_date <= terms.c.end_date)
+
+    def total(status):
+        return sa.func.coalesce(sa.func.sum(sa.case((sa.and_(in_term, swtds.c.validation_status == status), swtds.c.points), else_=0)), 0)
+
+    def count(status):
+        return sa.func.coalesce(sa.func.sum(sa.case((sa.and_(active, swtds.c.validation_status == status), 1), else_=0)), 0)
+
+    totals = (
+        sa.select(
+            swtds.c.author_id.label('user_id'),
+            swtds.c.term_id.label('term_id'),
+            total('APPROVED').label('valid_points'),
+            total('PENDING').label('pending_points'),
+            total('REJECTED').label('invalid_points'),
+            count('PENDING').label('pending_swtds'),
+            count('REJECTED').label('invalid_swtds')
+        )
+        .select_from(swtds.join(terms, terms.c.id == swtds.c.term_id))
+        .group_by(swtds.c.author_id, swtds.c.term_id)
+        .subquery()
+    )
+    cleared = sa.select(clearings.c.user_id, clearings.c.term_id).where(clearings.c.is_deleted == sa.false()).distinct().subquery()
+    keys = sa.union(
+        sa.select(totals.c.user_id, totals.c.term_id),
+        sa.select(cleared.c.user_id, cleared.c.term_id)
+    ).subquery()
+
+    columns = ['valid_points', 'pending_points', 'invalid_points', 'pending_swtds', 'invalid_swtds']
+    query = (
+        sa.select(
+            keys.c.user_id,
+            keys.c.term_id,
+            *[sa.func.coalesce(totals.c[column], 0) for column in columns],
+            sa.case((cleared.c.user_id != None, sa.true()), else_=sa.false()),
+            sa.func.now()
+        )
+        .select_from(
+            keys
+            .outerjoin(totals, sa.and_(totals.c.user_id == keys.c.user_id, totals.c.term_id == keys.c.term_id))
+            .outerjoin(cleared, sa.and_(cleared.c.user_id == keys.c.user_id, cleared.c.term_id == keys.c.term_id))
+        )
+    )
+
+    op.execute(ledger.insert().from_select(['user_id', 'term_id', *columns, 'is_cleared', 'date_modified'], query))
+
+
+def upgrade():
+    bind = op.get_bind()
+
+    # Databases created by db.create_all() after the model was added already have the table, possibly still empty.
+    if not sa.inspect(bind).has_table('tbluserterm_points'):
+        op.create_table(
+            'tbluserterm_points',
+            sa.Column('user_id', sa.Integer(), nullable=False),
+            sa.Column('term_id', sa.Integer(), nullable=False),
+            sa.Column('valid_points', sa.Float(), nullable=False),
+            sa.Column('pending_points', sa.Float(), nullable=False),
+            sa.Column('invalid_points', sa.Float(), nullable=False),
+            sa.Column('pending_swtds', sa.Integer(), nullable=False),
+            sa.Column('invalid_swtds', sa.Integer(), nullable=False),
+            sa.Column('is_cleared', sa.Boolean(), nullable=False),
+            sa.Column('date_modified', sa.DateTime(), nullable=False),
+            sa.ForeignKeyConstraint(['term_id'], ['tblterms.id']),
+            sa.ForeignKeyConstraint(['user_id'], ['tblusers.id']),
+            sa.PrimaryKeyConstraint('user_id', 'term_id')
+        )
+
+    if not bind.execute(sa.text('SELECT 1 FROM tbluserterm_points LIMIT 1')).first():
+        fill_ledger()
+
+
+def downgrade():
+    op.drop_table('tbluserterm_points')
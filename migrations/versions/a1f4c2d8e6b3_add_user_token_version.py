@@ -0,0 +1,32 @@
+"""Add the token version of users
+
+Revision ID: a1f4c2d8e6b3
+Revises: 7c3d5e1f9a20
+Create Date: 2026-10-18 16:02:11.482930
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a1f4c2d8e6b3'
+down_revision = '7c3d5e1f9a20'
+branch_labels = None
+depends_on = None
+
+
+def get_column_names(table):
+    return {column['name'] for column in sa.inspect(op.get_bind()).get_columns(table)}
+
+
+def upgrade():
+    # db.create_all() never adds columns to an existing table, so older databases lack it.
+    if 'token_version' not in get_column_names('tblusers'):
+        with op.batch_alter_table('tblusers') as batch_op:
+            batch_op.add_column(sa.Column('token_version', sa.Integer(), nullable=False, server_default='0'))
+
+
+def downgrade():
+    with op.batch_alter_table('tblusers') as batch_op:
+        batch_op.drop_column('token_version')
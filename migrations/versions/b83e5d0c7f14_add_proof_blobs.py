@@ -0,0 +1,59 @@
+"""Add content addressed blobs for proof files
+
+Revision ID: b83e5d0c7f14
+Revises: a1f4c2d8e6b3
+Create Date: 2026-10-18 16:04:37.105622
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b83e5d0c7f14'
+down_revision = 'a1f4c2d8e6b3'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    inspector = sa.inspect(op.get_bind())
+
+    # Databases created by db.create_all() after the model was added already have the table.
+    if not inspector.has_table('tblblobs'):
+        op.create_table(
+            'tblblobs',
+            sa.Column('id', sa.Integer(), nullable=False),
+            sa.Column('date_created', sa.DateTime(), nullable=False),
+            sa.Column('sha256', sa.String(length=64), nullable=False),
+            sa.Column('size', sa.BigInteger(), nullable=False),
+            sa.Column('key', sa.Text(), nullable=False),
+            sa.Column('ref_count', sa.Integer(), nullable=False),
+            sa.PrimaryKeyConstraint('id'),
+            sa.UniqueConstraint('sha256')
+        )
+
+    # db.create_all() never adds columns to an existing table. Proofs saved before the blob store keep NULL here
+    # until `flask proofs dedupe` moves them into it.
+    columns = {column['name'] for column in inspector.get_columns('tblproofs')}
+    if 'blob_id' not in columns:
+        with op.batch_alter_table('tblproofs') as batch_op:
+            batch_op.add_column(sa.Column('sha256', sa.String(length=64), nullable=True))
+            batch_op.add_column(sa.Column('size', sa.BigInteger(), nullable=True))
+            batch_op.add_column(sa.Column('blob_id', sa.Integer(), nullable=True))
+            batch_op.create_foreign_key('fk_tblproofs_blob_id', 'tblblobs', ['blob_id'], ['id'])
+
+
+def downgrade():
+    # The key is unnamed when db.create_all() made the column.
+    foreign_keys = sa.inspect(op.get_bind()).get_foreign_keys('tblproofs')
+    names = [key['name'] for key in foreign_keys if key['referred_table'] == 'tblblobs' and key['name']]
+
+    with op.batch_alter_table('tblproofs') as batch_op:
+        for name in names:
+            batch_op.drop_constraint(name, type_='foreignkey')
+        batch_op.drop_column('blob_id')
+        batch_op.drop_column('size')
+        batch_op.drop_column('sha256')
+
+    op.drop_table('tblblobs')
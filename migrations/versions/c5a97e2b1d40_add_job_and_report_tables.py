@@ -0,0 +1,87 @@
+"""Add the job queue and report tables, and blob preview status
+
+Revision ID: c5a97e2b1d40
+Revises: b83e5d0c7f14
+Create Date: 2026-10-18 16:11:52.730418
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c5a97e2b1d40'
+down_revision = 'b83e5d0c7f14'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    inspector = sa.inspect(op.get_bind())
+
+    # Databases created by db.create_all() after the models were added already have these tables.
+    if not inspector.has_table('tbljobs'):
+        op.create_table(
+            'tbljobs',
+            sa.Column('id', sa.Integer(), nullable=False),
+            sa.Column('date_created', sa.DateTime(), nullable=False),
+            sa.Column('date_modified', sa.DateTime(), nullable=False),
+            sa.Column('name', sa.String(length=255), nullable=False),
+            sa.Column('payload', sa.JSON(), nullable=False),
+            sa.Column('status', sa.Enum('QUEUED', 'RUNNING'), nullable=False),
+            sa.Column('attempts', sa.Integer(), nullable=False),
+            sa.Column('run_at', sa.DateTime(), nullable=False),
+            sa.Column('last_error', sa.Text(), nullable=True),
+            sa.PrimaryKeyConstraint('id')
+        )
+        op.create_index('ix_tbljobs_run_at', 'tbljobs', ['run_at'])
+
+    if not inspector.has_table('tbldeadletterjobs'):
+        op.create_table(
+            'tbldeadletterjobs',
+            sa.Column('id', sa.Integer(), nullable=False),
+            sa.Column('date_created', sa.DateTime(), nullable=False),
+            sa.Column('name', sa.String(length=255), nullable=False),
+            sa.Column('payload', sa.JSON(), nullable=False),
+            sa.Column('attempts', sa.Integer(), nullable=False),
+            sa.Column('error', sa.Text(), nullable=True),
+            sa.PrimaryKeyConstraint('id')
+        )
+
+    if not inspector.has_table('tblreports'):
+        op.create_table(
+            'tblreports',
+            sa.Column('id', sa.Integer(), nullable=False),
+            sa.Column('date_created', sa.DateTime(), nullable=False),
+            sa.Column('date_modified', sa.DateTime(), nullable=False),
+            sa.Column('type', sa.Enum('EMPLOYEE', 'DEPARTMENT', 'STAFF'), nullable=False),
+            sa.Column('status', sa.Enum('QUEUED', 'RUNNING', 'DONE', 'FAILED'), nullable=False),
+            sa.Column('progress', sa.Float(), nullable=False),
+            sa.Column('path', sa.String(length=255), nullable=True),
+            sa.Column('filename', sa.String(length=255), nullable=True),
+            sa.Column('error', sa.Text(), nullable=True),
+            sa.Column('requester_id', sa.Integer(), nullable=False),
+            sa.Column('user_id', sa.Integer(), nullable=True),
+            sa.Column('department_id', sa.Integer(), nullable=True),
+            sa.Column('term_id', sa.Integer(), nullable=True),
+            sa.ForeignKeyConstraint(['department_id'], ['tbldepartments.id']),
+            sa.ForeignKeyConstraint(['requester_id'], ['tblusers.id']),
+            sa.ForeignKeyConstraint(['term_id'], ['tblterms.id']),
+            sa.ForeignKeyConstraint(['user_id'], ['tblusers.id']),
+            sa.PrimaryKeyConstraint('id')
+        )
+
+    columns = {column['name'] for column in inspector.get_columns('tblblobs')}
+    if 'preview_status' not in columns:
+        with op.batch_alter_table('tblblobs') as batch_op:
+            batch_op.add_column(sa.Column('preview_status', sa.String(length=16), nullable=True))
+
+
+def downgrade():
+    with op.batch_alter_table('tblblobs') as batch_op:
+        batch_op.drop_column('preview_status')
+
+    op.drop_table('tblreports')
+    op.drop_table('tbldeadletterjobs')
+    op.drop_index('ix_tbljobs_run_at', table_name='tbljobs')
+    op.drop_table('tbljobs')
@@ -0,0 +1,37 @@
+"""Add the revision counters used to version reports
+
+Revision ID: d2e8f61a9b35
+Revises: c5a97e2b1d40
+Create Date: 2026-10-18 17:02:14.518203
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd2e8f61a9b35'
+down_revision = 'c5a97e2b1d40'
+branch_labels = None
+depends_on = None
+
+TABLES = ['tblusers', 'tbldepartments', 'tblterms', 'tblswtdforms', 'tblclearings']
+
+
+def upgrade():
+    inspector = sa.inspect(op.get_bind())
+
+    for table in TABLES:
+        # Databases created by db.create_all() after the column was added already have it.
+        columns = {column['name'] for column in inspector.get_columns(table)}
+        if 'revision' in columns:
+            continue
+
+        with op.batch_alter_table(table) as batch_op:
+            batch_op.add_column(sa.Column('revision', sa.Integer(), nullable=False, server_default='1'))
+
+
+def downgrade():
+    for table in reversed(TABLES):
+        with op.batch_alter_table(table) as batch_op:
+            batch_op.drop_column('revision')
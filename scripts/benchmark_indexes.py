@@ -0,0 +1,234 @@
+"""Seeds a synthetic dataset and compares query plans and timings of the hot service queries with and without the
+composite indexes declared on the models.
+
+    python scripts/benchmark_indexes.py --users 5000 --output benchmark.json
+
+Runs against a throwaway SQLite file unless --database-url is given. Every table in that database is dropped.
+"""
+import os
+import sys
+import json
+import random
+import argparse
+import tempfile
+import statistics
+import time
+from datetime import date, datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from flask import Flask
+from sqlalchemy import select, insert, func, text
+from sqlalchemy.sql import Select
+
+from api import db
+from api.models.user import User
+from api.models.department import Department
+from api.models.term import Term
+from api.models.swtd_form import SWTDForm
+from api.models.clearing import Clearing
+from api.models.notification import Notification
+from api.services.table_export_service import TableExportService
+
+INDEXED_MODELS = [SWTDForm, Clearing, Notification]
+STATUSES = ["APPROVED", "PENDING", "REJECTED"]
+
+def create_app(database_url: str) -> Flask:
+    app = Flask(__name__)
+    app.config["SQLALCHEMY_DATABASE_URI"] = database_url
+    db.init_app(app)
+    return app
+
+def seed(users: int, terms: int, swtds_per_user: int, departments: int, batch_size: int=5000) -> None:
+    rng = random.Random(0)
+    now = datetime.now()
+
+    db.session.execute(insert(Department), [
+        {"name": f"Department {i}", "required_points": 20, "level": "COLLEGE", "midyear_points": 5, "use_schoolyear": False}
+        for i in range(departments)
+    ])
+
+    start = date(2020, 1, 1)
+    db.session.execute(insert(Term), [
+        {"name": f"Term {i}", "start_date": start + timedelta(days=120 * i), "end_date": start + timedelta(days=120 * i + 110), "type": "SEMESTER"}
+        for i in range(terms)
+    ])
+
+    department_ids = db.session.scalars(select(Department.id)).all()
+    term_ids = db.session.scalars(select(Term.id)).all()
+    term_starts = dict(db.session.execute(select(Term.id, Term.start_date)).all())
+
+    def insert_batches(model, rows):
+        batch = []
+        for row in rows:
+            batch.append(row)
+
+            if len(batch) >= batch_size:
+                db.session.execute(insert(model), batch)
+                batch = []
+
+        if batch:
+            db.session.execute(insert(model), batch)
+
+    insert_batches(User, (
+        {
+            "email": f"user{i}@example.com", "employee_id": f"E{i:07d}", "password": "x", "firstname": "First", "lastname": f"Last {i}",
+            "department_id": rng.choice(department_ids), "date_created": now, "date_modified": now
+        }
+        for i in range(users)
+    ))
+
+    user_ids = db.session.scalars(select(User.id)).all()
+
+    def swtds():
+        for user_id in user_ids:
+            for _ in range(swtds_per_user):
+                term_id = rng.choice(term_ids)
+                start_date = term_starts[term_id] + timedelta(days=rng.randrange(100))
+
+                yield {
+                    "title": "Seminar", "venue": "Venue", "category": "Seminar", "start_date": start_date, "end_date": start_date,
+                    "total_hours": 8, "points": rng.choice([1, 2, 4]), "benefits": "Benefits", "validation_status": rng.choice(STATUSES),
+                    "is_deleted": rng.random() < 0.05, "author_id": user_id, "term_id": term_id, "date_created": now, "date_modified": now
+                }
+
+    insert_batches(SWTDForm, swtds())
+
+    insert_batches(Clearing, (
+        {"clearer_id": user_ids[0], "user_id": user_id, "term_id": term_id, "applied_points": 0, "date_created": now, "date_modified": now}
+        for user_id in user_ids for term_id in term_ids if rng.random() < 0.3
+    ))
+
+    insert_batches(Notification, (
+        {"data": {"type": "SWTD_VALIDATION"}, "actor_id": user_ids[0], "target_id": rng.choice(user_ids), "date_created": now - timedelta(minutes=i)}
+        for i in range(len(user_ids) * 5)
+    ))
+
+    db.session.commit()
+
+def analyze() -> None:
+    dialect = db.engine.dialect.name
+
+    with db.engine.begin() as connection:
+        if dialect == "mysql":
+            for model in [User, *INDEXED_MODELS]:
+                connection.execute(text(f"ANALYZE TABLE {model.__tablename__}"))
+        else:
+            connection.execute(text("ANALYZE"))
+
+def get_queries() -> dict[str, Select]:
+    """The lookups the services run most, with parameters taken from the seeded data."""
+    user_id = db.session.scalar(select(SWTDForm.author_id).limit(1))
+    term = db.session.scalar(select(Term).order_by(Term.id.desc()).limit(1))
+    department = db.session.scalar(select(Department).limit(1))
+    member_ids = select(User.id).where(User.department_id == department.id)
+
+    return {
+        # SWTDService listing of one author's forms.
+        "swtd_list_by_author": (
+            select(SWTDForm).where(SWTDForm.author_id == user_id, SWTDForm.is_deleted == False).order_by(SWTDForm.date_created, SWTDForm.id)
+        ),
+        # Point totals of a department's members, as summed before the points ledger.
+        "sum_points": (
+            select(SWTDForm.author_id, SWTDForm.validation_status, func.sum(SWTDForm.points))
+            .where(
+                SWTDForm.author_id.in_(member_ids),
+                SWTDForm.term_id == term.id,
+                SWTDForm.is_deleted == False,
+                SWTDForm.start_date >= term.start_date,
+                SWTDForm.start_date <= term.end_date
+            )
+            .group_by(SWTDForm.author_id, SWTDForm.validation_status)
+        ),
+        # TableExportService report of every member for a term.
+        "member_report": TableExportService(db).get_member_query([User.department_id != None], term),
+        # ClearingService lookup of a user's clearance for a term.
+        "clearing_lookup": select(Clearing).where(Clearing.user_id == user_id, Clearing.term_id == term.id, Clearing.is_deleted == False),
+        # User.received_notifications, newest first.
+        "notifications_for_target": (
+            select(Notification).where(Notification.target_id == user_id, Notification.is_deleted == False).order_by(Notification.date_created.desc())
+        )
+    }
+
+def explain(query: Select) -> list[str]:
+    dialect = db.engine.dialect
+    sql = str(query.compile(dialect=dialect, compile_kwargs={"literal_binds": True}))
+    prefix = "EXPLAIN QUERY PLAN" if dialect.name == "sqlite" else "EXPLAIN"
+
+    return [" | ".join(str(value) for value in row) for row in db.session.execute(text(f"{prefix} {sql}"))]
+
+def measure(query: Select, repeat: int) -> dict[str, float]:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        db.session.execute(query).all()
+        timings.append((time.perf_counter() - start) * 1000)
+
+    return {"median_ms": round(statistics.median(timings), 3), "min_ms": round(min(timings), 3)}
+
+def set_indexes(enabled: bool) -> None:
+    # Ends the session's transaction so the next queries are planned against the new schema.
+    db.session.commit()
+
+    for model in INDEXED_MODELS:
+        for index in model.__table__.indexes:
+            if enabled:
+                index.create(db.engine, checkfirst=True)
+            else:
+                index.drop(db.engine, checkfirst=True)
+
+    analyze()
+
+def run(queries: dict[str, Select], repeat: int) -> dict[str, dict]:
+    return {name: {"plan": explain(query), **measure(query, repeat)} for name, query in queries.items()}
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--database-url", help="Database to seed. All of its tables are dropped. Defaults to a temporary SQLite file.")
+    parser.add_argument("--users", type=int, default=2000)
+    parser.add_argument("--terms", type=int, default=24)
+    parser.add_argument("--swtds-per-user", type=int, default=25)
+    parser.add_argument("--departments", type=int, default=20)
+    parser.add_argument("--repeat", type=int, default=20, help="Runs per query. The median is reported.")
+    parser.add_argument("--output", help="Writes the plans and timings to this JSON file.")
+    args = parser.parse_args()
+
+    database_url = args.database_url or f"sqlite:///{tempfile.mkstemp(suffix='.db')[1]}"
+    app = create_app(database_url)
+
+    with app.app_context():
+        db.drop_all()
+        db.create_all()
+
+        started = time.perf_counter()
+        seed(args.users, args.terms, args.swtds_per_user, args.departments)
+        print(f"Seeded {args.users} users and {args.users * args.swtds_per_user} SWTDs in {time.perf_counter() - started:.1f}s on {db.engine.dialect.name}.")
+
+        dialect = db.engine.dialect.name
+        queries = get_queries()
+
+        set_indexes(False)
+        before = run(queries, args.repeat)
+
+        set_indexes(True)
+        after = run(queries, args.repeat)
+
+    print(f"\n{'query':<26}{'before (ms)':>14}{'after (ms)':>14}{'speedup':>10}")
+    for name in queries:
+        speedup = before[name]["median_ms"] / max(after[name]["median_ms"], 0.001)
+        print(f"{name:<26}{before[name]['median_ms']:>14.3f}{after[name]['median_ms']:>14.3f}{speedup:>9.1f}x")
+
+    for name in queries:
+        print(f"\n{name}\n  before:")
+        for line in before[name]["plan"]:
+            print(f"    {line}")
+        print("  after:")
+        for line in after[name]["plan"]:
+            print(f"    {line}")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({"dialect": dialect, "args": vars(args), "before": before, "after": after}, f, indent=2)
+
+if __name__ == "__main__":
+    main()
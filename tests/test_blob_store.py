@@ -0,0 +1,103 @@
+import io
+import os
+
+from utils import BaseTestCase, create_term, create_department, create_member, create_swtd_form
+
+from api import db
+from api.models.blob import Blob
+from api.models.proof import Proof
+from api.services import ft_service, storage_service
+
+class TestBlobStore(BaseTestCase):
+    def setUp(self):
+        super().setUp()
+
+        self.department_id = create_department(self.app, 'CCS')
+        self.term_id = create_term(self.app, '1st Semester 2324', '01-24-2024', '05-30-2024')
+        self.user_id, self.user_token = create_member(self.app, 'user@email.com', 'password', self.department_id)
+        self.swtd_ids = [create_swtd_form(self.app, self.user_id, self.term_id) for _ in range(2)]
+
+        self.headers = {
+            'Authorization': f'Bearer {self.user_token}'
+        }
+
+    def tearDown(self):
+        super().tearDown()
+
+    def upload(self, swtd_id, content):
+        response = self.client.post(f'/swtds/{swtd_id}/proof', headers=self.headers, data={
+            'files': (io.BytesIO(content), 'certificate.pdf', 'application/pdf')
+        })
+        self.assertEqual(response.status_code, 200)
+
+        return response.json.get('proof')[0].get('id')
+
+    def get_blob(self, sha256):
+        with self.app.app_context():
+            return Blob.query.filter_by(sha256=sha256).first()
+
+    def test_shared_blob(self):
+        content = b'same certificate ' + os.urandom(16)
+        proof_ids = [self.upload(swtd_id, content) for swtd_id in self.swtd_ids]
+
+        with self.app.app_context():
+            proofs = [db.session.get(Proof, proof_id) for proof_id in proof_ids]
+            keys = {proof.path for proof in proofs}
+            sha256 = proofs[0].sha256
+
+        self.assertEqual(len(keys), 1)
+        self.assertEqual(self.get_blob(sha256).ref_count, 2)
+
+        response = self.client.delete(f'/swtds/{self.swtd_ids[0]}/proof/{proof_ids[0]}', headers=self.headers)
+        self.assertEqual(response.status_code, 200)
+
+        # The file is kept while another proof references it.
+        self.assertTrue(storage_service.exists(keys.pop()))
+        self.assertEqual(self.get_blob(sha256).ref_count, 1)
+
+        response = self.client.delete(f'/swtds/{self.swtd_ids[1]}/proof/{proof_ids[1]}', headers=self.headers)
+        self.assertEqual(response.status_code, 200)
+
+        self.assertIsNone(self.get_blob(sha256))
+        self.assertFalse(storage_service.exists(ft_service.blob_service.get_key(sha256)))
+
+    def test_dedupe_legacy_proofs(self):
+        content = b'legacy certificate ' + os.urandom(16)
+        legacy_paths = []
+
+        with self.app.app_context():
+            for i, swtd_id in enumerate(self.swtd_ids):
+                directory = os.path.join(ft_service.data_dir, str(self.user_id), str(swtd_id), str(i))
+                os.makedirs(directory, exist_ok=True)
+
+                path = os.path.join(directory, 'certificate.pdf')
+                with open(path, 'wb') as f:
+                    f.write(content)
+
+                legacy_paths.append(path)
+                db.session.add(Proof(path=path, filename='certificate.pdf', content_type='application/pdf', swtd_form_id=swtd_id))
+
+            db.session.commit()
+
+        runner = self.app.test_cli_runner()
+
+        result = runner.invoke(args=['proofs', 'dedupe', '--dry-run'])
+        self.assertIn('Would migrate 2 proof(s) into 1 blob(s).', result.output)
+        self.assertTrue(all(os.path.isfile(path) for path in legacy_paths))
+
+        result = runner.invoke(args=['proofs', 'dedupe'])
+        self.assertIn('Migrated 2 proof(s) into 1 blob(s).', result.output)
+        self.assertIn(f'Duplicates: 1 ({len(content)} bytes reclaimed).', result.output)
+
+        with self.app.app_context():
+            proofs = Proof.query.filter(Proof.swtd_form_id.in_(self.swtd_ids)).all()
+            self.assertEqual(len({proof.blob_id for proof in proofs}), 1)
+
+            blob = proofs[0].blob
+            self.assertEqual(blob.ref_count, 2)
+
+            with storage_service.open(blob.key) as f:
+                self.assertEqual(f.read(), content)
+
+        self.assertFalse(any(os.path.exists(path) for path in legacy_paths))
+        self.assertFalse(os.path.exists(os.path.dirname(legacy_paths[0])))
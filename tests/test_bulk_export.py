@@ -0,0 +1,77 @@
+import io
+import zipfile
+
+from utils import BaseTestCase, create_term, create_department, create_member, create_swtd_form, count_queries
+
+from api.services import ft_service
+
+class TestBulkExport(BaseTestCase):
+    def setUp(self):
+        super().setUp()
+
+        self.uri = '/departments/staff/export'
+
+        self.term_id = create_term(self.app, '1st Semester 2324', '01-24-2024', '05-30-2024')
+        self.department_ids = [create_department(self.app, name) for name in ('CCS', 'CEA')]
+        self.staff_id, self.staff_token = create_member(self.app, 'staff@email.com', 'password', self.department_ids[0], access_level=2)
+
+        for i, department_id in enumerate(self.department_ids):
+            user_id, _ = create_member(self.app, f'user{i}@email.com', 'password', department_id)
+            create_swtd_form(self.app, user_id, self.term_id)
+
+        self.headers = {
+            'Authorization': f'Bearer {self.staff_token}'
+        }
+
+    def tearDown(self):
+        super().tearDown()
+
+    def test_export_all_staff_data(self):
+        response = self.client.get(self.uri, headers=self.headers, query_string={'term_id': self.term_id})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.mimetype, 'application/zip')
+
+        with zipfile.ZipFile(io.BytesIO(response.data)) as archive:
+            self.assertEqual(sorted(archive.namelist()), ['CCS_Report.pdf', 'CEA_Report.pdf'])
+
+            for name in archive.namelist():
+                self.assertTrue(archive.read(name).startswith(b'%PDF'))
+
+    def test_report_pool_is_reused(self):
+        if ft_service.report_workers <= 0:
+            self.skipTest("Reports are rendered in the request.")
+
+        for _ in range(2):
+            response = self.client.get(self.uri, headers=self.headers, query_string={'term_id': self.term_id})
+            self.assertEqual(response.status_code, 200)
+
+            pool = ft_service.report_pool
+            self.assertEqual(pool._mp_context.get_start_method(), 'spawn')
+
+        self.assertIs(ft_service.get_report_pool(), pool)
+
+    def test_export_all_staff_data_queries(self):
+        counts = []
+
+        for i in range(2):
+            create_department(self.app, f'Department {i}')
+
+            with count_queries(self.app) as statements:
+                response = self.client.get(self.uri, headers=self.headers, query_string={'term_id': self.term_id})
+                response.get_data()
+
+            self.assertEqual(response.status_code, 200)
+            counts.append(len(statements))
+
+        self.assertEqual(counts[0], counts[1], f"Query count grows with department count: {counts}")
+
+    def test_export_all_staff_data_unauthorized(self):
+        _, token = create_member(self.app, 'member@email.com', 'password', self.department_ids[0])
+
+        response = self.client.get(self.uri, headers={'Authorization': f'Bearer {token}'}, query_string={'term_id': self.term_id})
+        self.assertEqual(response.status_code, 403)
+
+    def test_export_all_staff_data_missing_term(self):
+        response = self.client.get(self.uri, headers=self.headers)
+        self.assertEqual(response.status_code, 400)
@@ -0,0 +1,127 @@
+from unittest import mock
+
+from utils import BaseTestCase, create_term, create_department, create_member, create_swtd_form, count_queries
+
+from api import db
+from api.models.job import Job
+from api.models.user import User
+from api.models.clearing import Clearing
+from api.models.notification import Notification
+from api.services import job_service, jwt_service, notification_service, points_ledger_service
+
+class TestDepartmentClearances(BaseTestCase):
+    def setUp(self):
+        super().setUp()
+
+        self.app.config.update(JOB_BACKEND='database')
+        job_service.init_app(self.app)
+
+        self.department_id = create_department(self.app, 'CCS', required_points=10)
+        self.term_id = create_term(self.app, '1st Semester 2324', '01-24-2024', '05-30-2024')
+
+        self.head_id, _ = create_member(self.app, 'head@email.com', 'password', self.department_id)
+        self.user_id, self.user_token = create_member(self.app, 'user@email.com', 'password', self.department_id)
+
+        with self.app.app_context():
+            head = db.session.get(User, self.head_id)
+            head.department.head = head
+            db.session.commit()
+
+            # Heading a department revokes the previous token.
+            self.head_token = jwt_service.generate_user_token(head)
+
+        self.uri = f'/departments/{self.department_id}/clearances'
+        self.headers = {
+            'Authorization': f'Bearer {self.head_token}'
+        }
+        self.member_count = 0
+
+    def tearDown(self):
+        super().tearDown()
+
+    def add_member(self, points):
+        self.member_count += 1
+        user_id, _ = create_member(self.app, f'member{self.member_count}@email.com', 'password', self.department_id)
+
+        if points:
+            create_swtd_form(self.app, user_id, self.term_id, points=points, validation_status='APPROVED')
+
+        return user_id
+
+    def test_grant_department_clearances(self):
+        eligible_id = self.add_member(12)
+        lacking_id = self.add_member(4)
+
+        with self.app.app_context():
+            db.session.get(User, lacking_id).point_balance = 6
+            db.session.commit()
+
+        with mock.patch.object(notification_service, 'trigger_ws_event') as trigger_ws_event:
+            response = self.client.post(self.uri, headers=self.headers, json={'term_id': self.term_id})
+        self.assertEqual(response.status_code, 200)
+
+        events = [call.args for call in trigger_ws_event.call_args_list]
+        self.assertEqual([name for name, _ in events], ['term_clearing_update'] * 2)
+        self.assertEqual(events[0][1]['data']['id'], self.term_id)
+
+        cleared = {clearance['user']['id']: clearance for clearance in response.json['clearances']}
+        self.assertEqual(set(cleared), {eligible_id, lacking_id})
+        self.assertEqual(cleared[lacking_id]['applied_points'], 6)
+
+        skipped = {row['user_id']: row for row in response.json['skipped']}
+        self.assertEqual(skipped[self.head_id]['reason'], 'INSUFFICIENT_POINTS')
+        self.assertEqual(skipped[self.head_id]['lacking_points'], 10)
+
+        with self.app.app_context():
+            self.assertEqual(db.session.get(User, eligible_id).point_balance, 2)
+            self.assertEqual(db.session.get(User, lacking_id).point_balance, 0)
+            self.assertEqual(Notification.query.filter(Notification.target_id.in_([eligible_id, lacking_id])).count(), 2)
+            self.assertEqual(points_ledger_service.verify(), [])
+
+            # Mail for every cleared member is queued as one batch.
+            jobs = Job.query.filter_by(name='mail.send').all()
+            self.assertEqual(len(jobs), 1)
+            self.assertEqual(len(jobs[0].payload['items']), 2)
+
+        response = self.client.get(f'/users/{eligible_id}/points', headers=self.headers, query_string={'term_id': self.term_id})
+        self.assertEqual(response.status_code, 200)
+
+        response = self.client.post(self.uri, headers=self.headers, json={'term_id': self.term_id, 'user_ids': [eligible_id, 12345]})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json['clearances'], [])
+        self.assertEqual(
+            sorted((row['user_id'], row['reason']) for row in response.json['skipped']),
+            [(eligible_id, 'ALREADY_CLEARED'), (12345, 'NOT_FOUND')]
+        )
+
+        with self.app.app_context():
+            self.assertEqual(Clearing.query.filter_by(user_id=eligible_id, is_deleted=False).count(), 1)
+
+    def test_grant_department_clearances_queries(self):
+        counts = []
+        for members in [2, 8]:
+            for _ in range(members):
+                self.add_member(10)
+
+            with count_queries(self.app) as statements:
+                response = self.client.post(self.uri, headers=self.headers, json={'term_id': self.term_id})
+
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(len(response.json['clearances']), members)
+            counts.append(len(statements))
+
+        self.assertEqual(counts[0], counts[1], f"query count grows with member count: {counts}")
+
+    def test_grant_department_clearances_fail(self):
+        headers = {
+            'Authorization': f'Bearer {self.user_token}'
+        }
+
+        response = self.client.post(self.uri, headers=headers, json={'term_id': self.term_id})
+        self.assertEqual(response.status_code, 403)
+
+        response = self.client.post(self.uri, headers=self.headers, json={})
+        self.assertEqual(response.status_code, 400)
+
+        response = self.client.post(self.uri, headers=self.headers, json={'term_id': self.term_id, 'user_ids': 'all'})
+        self.assertEqual(response.status_code, 400)
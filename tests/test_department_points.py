@@ -0,0 +1,47 @@
+from utils import BaseTestCase, create_term, create_department, create_member, create_swtd_form
+
+class TestDepartmentPoints(BaseTestCase):
+    def setUp(self):
+        super().setUp()
+
+        self.department_id = create_department(self.app, 'CCS')
+        self.term_id = create_term(self.app, '1st Semester 2324', '01-24-2024', '05-30-2024')
+
+        self.staff_id, self.staff_token = create_member(self.app, 'staff@email.com', 'password', self.department_id, access_level=2)
+        self.user_id, self.user_token = create_member(self.app, 'user@email.com', 'password', self.department_id)
+
+        create_swtd_form(self.app, self.user_id, self.term_id, points=5, validation_status='APPROVED')
+        create_swtd_form(self.app, self.user_id, self.term_id, points=3, validation_status='PENDING')
+        create_swtd_form(self.app, self.user_id, self.term_id, points=2, validation_status='REJECTED')
+
+        self.uri = f'/departments/{self.department_id}/points'
+
+    def tearDown(self):
+        super().tearDown()
+
+    def test_get_department_points(self):
+        headers = {
+            'Authorization': f'Bearer {self.staff_token}'
+        }
+
+        response = self.client.get(self.uri, headers=headers, query_string={'term_id': self.term_id})
+
+        self.assertEqual(response.status_code, 200)
+
+        points = response.json.get('points')
+
+        self.assertTrue(str(self.user_id) in points)
+        self.assertEqual(points[str(self.user_id)].get('valid_points'), 5)
+        self.assertEqual(points[str(self.user_id)].get('pending_points'), 3)
+        self.assertEqual(points[str(self.user_id)].get('invalid_points'), 2)
+        self.assertEqual(points[str(self.staff_id)].get('valid_points'), 0)
+
+    def test_get_department_points_fail(self):
+        headers = {
+            'Authorization': f'Bearer {self.user_token}'
+        }
+
+        response = self.client.get(self.uri, headers=headers, query_string={'term_id': self.term_id})
+
+        self.assertEqual(response.status_code, 403)
+        self.assertTrue('error' in response.json)
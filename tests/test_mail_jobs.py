@@ -0,0 +1,235 @@
+import time
+
+from utils import BaseTestCase, SMTPStub, create_term, create_department, create_member, create_swtd_form
+
+from api import db, mail
+from api.models.job import Job
+from api.models.dead_letter_job import DeadLetterJob
+from api.services import job_service, mail_service
+
+class TestMailJobs(BaseTestCase):
+    def setUp(self):
+        super().setUp()
+
+        self.smtp = SMTPStub().__enter__()
+        self.configure(JOB_BACKEND='thread')
+
+        self.department_id = create_department(self.app, 'CCS')
+        self.term_id = create_term(self.app, '1st Semester 2324', '01-24-2024', '05-30-2024')
+        self.staff_id, self.staff_token = create_member(self.app, 'staff@email.com', 'password', self.department_id, access_level=2)
+        self.author_id, self.author_token = create_member(self.app, 'author@email.com', 'password', self.department_id)
+
+        self.headers = {
+            'Authorization': f'Bearer {self.staff_token}'
+        }
+
+    def tearDown(self):
+        self.smtp.__exit__()
+        super().tearDown()
+
+    def configure(self, **config):
+        self.app.config.update(
+            MAIL_SERVER='127.0.0.1',
+            MAIL_PORT=self.smtp.port,
+            MAIL_USE_TLS=False,
+            MAIL_USE_SSL=False,
+            MAIL_USERNAME=None,
+            MAIL_PASSWORD=None,
+            MAIL_SUPPRESS_SEND=False,
+            JOB_MAX_ATTEMPTS=2,
+            JOB_RETRY_BACKOFF=0,
+            **config
+        )
+
+        mail.init_app(self.app)
+        job_service.init_app(self.app)
+        mail_service.init_app(self.app)
+
+    def test_validation_mail_sent_after_commit(self):
+        swtd_id = create_swtd_form(self.app, self.author_id, self.term_id)
+
+        response = self.client.put(f'/swtds/{swtd_id}', headers=self.headers, json={
+            'validation_status': 'APPROVED',
+            'validator_id': self.staff_id
+        })
+        self.assertEqual(response.status_code, 200)
+
+        messages = self.smtp.wait_for(1)
+        self.assertEqual(len(messages), 1)
+        self.assertEqual(messages[0].get('recipients'), ['author@email.com'])
+        self.assertTrue('multipart/alternative' in messages[0].get('data'))
+        self.assertTrue('text/html' in messages[0].get('data'))
+
+    def test_rollback_discards_mail(self):
+        with self.app.app_context():
+            mail_service.send_mail('Subject', ['author@email.com'], 'Body', after_commit=True)
+            db.session.rollback()
+
+            mail_service.send_mail('Subject', ['staff@email.com'], 'Body', after_commit=True)
+            db.session.commit()
+
+        messages = self.smtp.wait_for(1)
+        time.sleep(0.2)
+
+        self.assertEqual(len(messages), 1)
+        self.assertEqual(messages[0].get('recipients'), ['staff@email.com'])
+
+    def test_savepoint_keeps_mail_pending(self):
+        with self.app.app_context():
+            mail_service.send_mail('Subject', ['author@email.com'], 'Body', after_commit=True)
+
+            with db.session.begin_nested():
+                pass
+
+            # Releasing the savepoint must not send the mail before the transaction commits.
+            time.sleep(0.2)
+            self.assertEqual(len(self.smtp.messages), 0)
+
+            db.session.rollback()
+
+        time.sleep(0.2)
+        self.assertEqual(len(self.smtp.messages), 0)
+
+    def test_failed_delivery_is_retried(self):
+        self.smtp.fail_next = 1
+
+        with self.app.app_context():
+            mail_service.send_mail('Subject', ['author@email.com'], 'Body')
+
+        self.assertEqual(len(self.smtp.wait_for(1)), 1)
+
+    def test_failed_delivery_is_dead_lettered(self):
+        self.smtp.fail_next = 2
+
+        with self.app.app_context():
+            mail_service.send_mail('Subject', ['author@email.com'], 'Body')
+
+            deadline = time.monotonic() + 5
+            while not DeadLetterJob.query.count() and time.monotonic() < deadline:
+                time.sleep(0.05)
+
+            dead_letter = DeadLetterJob.query.first()
+
+        self.assertIsNotNone(dead_letter)
+        self.assertEqual(dead_letter.name, 'mail.send')
+        self.assertEqual(dead_letter.attempts, 2)
+        self.assertEqual(self.smtp.messages, [])
+
+    def test_shutdown_dead_letters_pending_retries(self):
+        self.app.config.update(JOB_RETRY_BACKOFF=60)
+        job_service.init_app(self.app)
+        self.smtp.fail_next = 1
+        backend = job_service.backend
+
+        with self.app.app_context():
+            mail_service.send_mail('Subject', ['author@email.com'], 'Body')
+
+            deadline = time.monotonic() + 5
+            while not backend.timers and time.monotonic() < deadline:
+                time.sleep(0.05)
+
+            backend.shutdown()
+            self.assertEqual(backend.timers, {})
+
+            # A late submission is kept instead of raising on the closed executor.
+            backend.submit('mail.send', {'items': []})
+
+            dead_letters = DeadLetterJob.query.order_by(DeadLetterJob.id).all()
+
+        self.assertEqual([dead_letter.attempts for dead_letter in dead_letters], [1, 0])
+        self.configure()
+
+    def test_database_backend(self):
+        self.configure(JOB_BACKEND='database')
+
+        with self.app.app_context():
+            mail_service.send_mail('Subject', ['author@email.com'], 'Body')
+            self.assertEqual(Job.query.count(), 1)
+
+            self.assertEqual(job_service.backend.run_pending(), 1)
+            self.assertEqual(Job.query.count(), 0)
+
+        self.assertEqual(len(self.smtp.messages), 1)
+
+    def send_batch(self, count):
+        with self.app.app_context():
+            for i in range(count):
+                mail_service.send_mail('Subject', [f'user{i}@email.com'], 'Body', after_commit=True)
+
+            db.session.commit()
+
+    def test_partial_failure_is_retried_in_place(self):
+        self.configure(JOB_BACKEND='database')
+        self.send_batch(3)
+        self.smtp.fail_next = 1
+
+        with self.app.app_context():
+            self.assertEqual(job_service.backend.run_pending(limit=1), 1)
+            self.assertEqual(len(self.smtp.messages), 2)
+
+            # The same job is retried with only the failed message, and the attempt counts.
+            job = Job.query.one()
+            self.assertEqual(job.attempts, 1)
+            self.assertEqual([item['recipients'] for item in job.payload['items']], [['user0@email.com']])
+
+            self.assertEqual(job_service.backend.run_pending(), 1)
+            self.assertEqual(Job.query.count(), 0)
+
+        self.assertEqual(sorted(message.get('recipients')[0] for message in self.smtp.messages), ['user0@email.com', 'user1@email.com', 'user2@email.com'])
+
+    def test_partial_failure_is_dead_lettered(self):
+        self.configure(JOB_BACKEND='database')
+        self.send_batch(3)
+
+        with self.app.app_context():
+            for _ in range(2):
+                self.smtp.fail_next = 1
+                job_service.backend.run_pending(limit=1)
+
+            self.assertEqual(Job.query.count(), 0)
+
+            dead_letter = DeadLetterJob.query.one()
+            self.assertEqual(dead_letter.attempts, 2)
+            self.assertEqual(len(dead_letter.payload['items']), 1)
+
+        self.assertEqual(len(self.smtp.messages), 2)
+
+    def test_pool_configuration(self):
+        self.configure(MAIL_POOL_SIZE=2, MAIL_BATCH_SIZE=10)
+
+        self.assertEqual(mail_service.pool.size, 2)
+        self.assertEqual(job_service.batch_sizes['mail.send'], 10)
+
+        self.configure(MAIL_POOL_SIZE=4, MAIL_BATCH_SIZE=50)
+
+    def test_batch_shares_one_connection(self):
+        with self.app.app_context():
+            for i in range(5):
+                mail_service.send_mail('Subject', [f'user{i}@email.com'], 'Body', after_commit=True)
+
+            db.session.commit()
+
+        self.assertEqual(len(self.smtp.wait_for(5)), 5)
+        self.assertEqual(len(self.smtp.connections), 1)
+
+    def test_reconnect_after_disconnect(self):
+        reconnects = mail_service.get_metrics().get('reconnects')
+
+        with self.app.app_context():
+            mail_service.send_mail('Subject', ['author@email.com'], 'Body')
+            self.smtp.wait_for(1)
+
+            self.smtp.drop_connections()
+            mail_service.send_mail('Subject', ['staff@email.com'], 'Body')
+
+        self.assertEqual(len(self.smtp.wait_for(2)), 2)
+        self.assertEqual(mail_service.get_metrics().get('reconnects'), reconnects + 1)
+
+    def test_mail_metrics(self):
+        response = self.client.get('/metrics/mail', headers=self.headers)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue('messages_per_connection' in response.json.get('mail'))
+
+        response = self.client.get('/metrics/mail', headers={'Authorization': f'Bearer {self.author_token}'})
+        self.assertEqual(response.status_code, 403)
@@ -0,0 +1,48 @@
+from datetime import datetime
+
+from utils import BaseTestCase
+
+from api.services import template_service
+
+class TestMailTemplates(BaseTestCase):
+    def setUp(self):
+        super().setUp()
+
+        self.context = {
+            'firstname': '<John>',
+            'swtd_id': 1,
+            'title': 'Sample SWTD',
+            'date_created': datetime(2024, 2, 1, 8, 30),
+            'status': 'APPROVED',
+            'validation_date': datetime(2024, 2, 2, 9, 0),
+            'validator_name': 'Jane Doe',
+            'app_url': 'http://localhost'
+        }
+
+    def tearDown(self):
+        super().tearDown()
+
+    def test_render_parts(self):
+        mail = template_service.render('validation_update', **self.context)
+
+        self.assertEqual(mail.subject, 'SWTD Validation Update | PointWatch')
+        self.assertTrue(mail.text.startswith('Hello <John>,'))
+        self.assertTrue('01 February 2024 08:30 AM' in mail.text)
+        self.assertTrue('<a href="http://localhost/swtd/all/1">' in mail.html)
+
+    def test_render_summary(self):
+        mail = template_service.render('validation_summary', **self.context, swtds=[('Seminar', 'APPROVED'), ('<Workshop>', 'REJECTED')])
+
+        self.assertTrue('2 of the SWTD Forms' in mail.text)
+        self.assertTrue('Seminar: APPROVED' in mail.text)
+        self.assertTrue('&lt;Workshop&gt;' in mail.html)
+
+    def test_html_is_escaped(self):
+        mail = template_service.render('validation_update', **self.context)
+
+        self.assertTrue('Hello &lt;John&gt;,' in mail.html)
+        self.assertFalse('<John>' in mail.html)
+
+    def test_templates_are_compiled_once(self):
+        self.assertFalse(self.app.debug)
+        self.assertIs(template_service.get_templates('clearing_granted.j2'), template_service.get_templates('clearing_granted.j2'))
@@ -0,0 +1,58 @@
+import json
+
+from utils import BaseTestCase, create_term, create_department, create_member, create_swtd_form
+
+class TestPagination(BaseTestCase):
+    def setUp(self):
+        super().setUp()
+
+        self.uri = '/swtds'
+
+        self.department_id = create_department(self.app, 'CCS')
+        self.term_id = create_term(self.app, '1st Semester 2324', '01-24-2024', '05-30-2024')
+        self.staff_id, self.staff_token = create_member(self.app, 'staff@email.com', 'password', self.department_id, access_level=2)
+
+        self.swtd_ids = [create_swtd_form(self.app, self.staff_id, self.term_id, title=f'SWTD {i}') for i in range(7)]
+
+        self.headers = {
+            'Authorization': f'Bearer {self.staff_token}'
+        }
+
+    def tearDown(self):
+        super().tearDown()
+
+    def test_keyset_pagination(self):
+        ids = []
+        cursor = None
+
+        while True:
+            params = {'limit': 3}
+            if cursor: params['cursor'] = cursor
+
+            response = self.client.get(self.uri, headers=self.headers, query_string=params)
+            self.assertEqual(response.status_code, 200)
+
+            data = response.json
+            self.assertLessEqual(len(data.get('swtd_forms')), 3)
+
+            ids += [f.get('id') for f in data.get('swtd_forms')]
+            cursor = data.get('next_cursor')
+
+            if not cursor: break
+
+        self.assertEqual(ids, self.swtd_ids)
+
+    def test_invalid_cursor(self):
+        response = self.client.get(self.uri, headers=self.headers, query_string={'cursor': 'invalid'})
+
+        self.assertEqual(response.status_code, 400)
+        self.assertTrue('error' in response.json)
+
+    def test_ndjson_stream(self):
+        response = self.client.get(self.uri, headers=self.headers, query_string={'format': 'ndjson'})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.mimetype, 'application/x-ndjson')
+
+        rows = [json.loads(line) for line in response.data.decode('utf-8').splitlines()]
+        self.assertEqual([r.get('id') for r in rows], self.swtd_ids)
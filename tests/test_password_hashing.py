@@ -0,0 +1,64 @@
+from utils import BaseTestCase, create_department, create_member
+
+from api import db
+from api.models.user import User
+from api.services import password_encoder_service
+
+class TestPasswordHashing(BaseTestCase):
+    def setUp(self):
+        super().setUp()
+
+        self.configure(BCRYPT_ROUNDS=4)
+
+        self.email = 'example@email.com'
+        self.password = 'password'
+        self.department_id = create_department(self.app, 'CCS')
+        self.user_id, self.user_token = create_member(self.app, self.email, self.password, self.department_id)
+
+    def tearDown(self):
+        self.configure(BCRYPT_ROUNDS=12)
+        super().tearDown()
+
+    def configure(self, **config):
+        self.app.config.update(**config)
+        password_encoder_service.init_app(self.app)
+
+    def get_user(self):
+        with self.app.app_context():
+            return db.session.get(User, self.user_id)
+
+    def login(self):
+        return self.client.post('/auth/login', json={'email': self.email, 'password': self.password})
+
+    def test_configured_rounds(self):
+        self.assertTrue(self.get_user().password.startswith('$2b$04$'))
+        self.assertFalse(password_encoder_service.needs_rehash(self.get_user().password))
+        self.assertTrue(password_encoder_service.check_password(self.get_user().password, self.password))
+
+        with self.assertRaises(ValueError):
+            self.configure(BCRYPT_ROUNDS=3)
+
+    def test_rehash_on_login(self):
+        token_version = self.get_user().token_version
+
+        self.configure(BCRYPT_ROUNDS=5)
+        response = self.login()
+        self.assertEqual(response.status_code, 200)
+
+        user = self.get_user()
+        self.assertTrue(user.password.startswith('$2b$05$'))
+        self.assertEqual(user.token_version, token_version)
+        self.assertTrue(password_encoder_service.check_password(user.password, self.password))
+
+        # Tokens issued before the rehash stay valid.
+        response = self.client.get(f'/users/{self.user_id}', headers={'Authorization': f'Bearer {self.user_token}'})
+        self.assertEqual(response.status_code, 200)
+
+        # A current hash is left alone.
+        response = self.login()
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.get_user().password, user.password)
+
+    def test_legacy_prefix_is_rehashed(self):
+        self.assertTrue(password_encoder_service.needs_rehash(self.get_user().password.replace('$2b$', '$2a$', 1)))
+        self.assertTrue(password_encoder_service.needs_rehash('plaintext'))
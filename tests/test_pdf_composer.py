@@ -0,0 +1,78 @@
+import re
+from unittest import TestCase
+
+from api.services.ft_service import PDFComposer, StreamingPDFComposer
+
+class TestStreamingPDFComposer(TestCase):
+    def get_xref_offsets(self, data):
+        xref_offset = int(re.search(rb'startxref\n(\d+)', data).group(1))
+        lines = data[xref_offset:].split(b'\n')
+
+        count = int(lines[1].split()[1])
+        return {i: int(lines[2 + i][:10]) for i in range(1, count)}
+
+    def test_xref_points_to_objects(self):
+        pdf = StreamingPDFComposer()
+        pdf.add_text('Pointwatch Report')
+        pdf.draw_line()
+        pdf.add_paragraph('Lorem ipsum ' * 50)
+
+        data = pdf.get_pdf().read()
+
+        self.assertTrue(data.startswith(b'%PDF-1.4'))
+        self.assertTrue(data.endswith(b'%%EOF\n'))
+
+        for object_id, offset in self.get_xref_offsets(data).items():
+            self.assertTrue(data[offset:].startswith(f'{object_id} 0 obj'.encode()))
+
+    def test_pages_are_flushed(self):
+        pdf = StreamingPDFComposer()
+
+        for i in range(200):
+            pdf.add_text(f'Line {i}')
+
+        # Finished pages are written out; only the current page is held in memory.
+        self.assertEqual(len(pdf.page_ids), 3)
+        self.assertLessEqual(len(pdf.page), 52)
+
+        data = pdf.get_pdf().read()
+        self.assertTrue(b'/Count 4' in data)
+
+    def test_trailing_new_page_is_dropped(self):
+        pdf = StreamingPDFComposer()
+        pdf.add_text('Page 1')
+        pdf.add_new_page()
+
+        data = pdf.get_pdf().read()
+        self.assertTrue(b'/Count 1' in data)
+
+    def test_text_is_escaped(self):
+        pdf = StreamingPDFComposer()
+        pdf.add_text('(Doe) \\ John')
+
+        data = pdf.get_pdf().read()
+        self.assertTrue(b'(\\(Doe\\) \\\\ John) Tj' in data)
+
+    def test_layout_matches_reportlab_composer(self):
+        positions = []
+
+        for pdf in [PDFComposer(), StreamingPDFComposer()]:
+            pdf.add_text('Pointwatch Report')
+            pdf.draw_line()
+            pdf.add_paragraph('Lorem ipsum ' * 400)
+            positions.append(pdf.y_position)
+
+        # Both composers wrap and paginate through the same layout code.
+        self.assertEqual(positions[0], positions[1])
+
+    def test_unicode_text_is_embedded(self):
+        pdf = StreamingPDFComposer()
+        pdf.add_text('Łukasz Šimon')
+
+        data = pdf.get_pdf().read()
+
+        # Characters are encoded as codes of an embedded font subset, which the ToUnicode map translates back.
+        self.assertTrue(b'(\\001ukasz \\002imon) Tj' in data)
+        self.assertTrue(b'/FontFile2' in data)
+        self.assertTrue(b'<01> <0141>\n<02> <0160>' in data)
+        self.assertFalse(b'?' in re.search(rb'BT .* ET', data).group(0))
@@ -0,0 +1,163 @@
+from datetime import date
+
+from sqlalchemy import select
+
+from utils import BaseTestCase, create_term, create_department, create_member, create_swtd_form
+
+from api import db
+from api.models.swtd_form import SWTDForm
+from api.models.term import Term
+from api.models.user_term_points import UserTermPoints
+from api.services import points_ledger_service
+
+class TestPointsLedger(BaseTestCase):
+    def setUp(self):
+        super().setUp()
+
+        self.department_id = create_department(self.app, 'CCS')
+        self.term_id = create_term(self.app, '1st Semester 2324', '01-24-2024', '05-30-2024')
+        self.other_term_id = create_term(self.app, '2nd Semester 2324', '06-01-2024', '10-30-2024')
+
+        self.staff_id, self.staff_token = create_member(self.app, 'staff@email.com', 'password', self.department_id, access_level=2)
+        self.user_id, self.user_token = create_member(self.app, 'user@email.com', 'password', self.department_id)
+
+        self.swtd_id = create_swtd_form(self.app, self.user_id, self.term_id, points=5, validation_status='PENDING')
+        create_swtd_form(self.app, self.user_id, self.term_id, points=2, validation_status='REJECTED')
+
+        self.headers = {
+            'Authorization': f'Bearer {self.staff_token}'
+        }
+
+    def tearDown(self):
+        super().tearDown()
+
+    def get_row(self, term_id=None):
+        with self.app.app_context():
+            row = db.session.execute(
+                select(UserTermPoints.__table__).filter_by(user_id=self.user_id, term_id=term_id or self.term_id)
+            ).first()
+
+            return row._asdict() if row else None
+
+    def update_swtd(self, **data):
+        with self.app.app_context():
+            swtd = db.session.get(SWTDForm, self.swtd_id)
+            for key, value in data.items():
+                setattr(swtd, key, value)
+
+            db.session.commit()
+
+    def assertLedgerMatches(self):
+        with self.app.app_context():
+            self.assertEqual(points_ledger_service.verify(), [])
+
+    def test_insert(self):
+        row = self.get_row()
+
+        self.assertEqual(row['pending_points'], 5)
+        self.assertEqual(row['invalid_points'], 2)
+        self.assertEqual(row['pending_swtds'], 1)
+        self.assertEqual(row['invalid_swtds'], 1)
+        self.assertFalse(row['is_cleared'])
+        self.assertLedgerMatches()
+
+    def test_validation(self):
+        response = self.client.put(f'/swtds/{self.swtd_id}', headers=self.headers, json={
+            'validation_status': 'APPROVED',
+            'validator_id': self.staff_id
+        })
+        self.assertEqual(response.status_code, 200)
+
+        row = self.get_row()
+        self.assertEqual(row['valid_points'], 5)
+        self.assertEqual(row['pending_points'], 0)
+        self.assertEqual(row['pending_swtds'], 0)
+
+        response = self.client.get(f'/users/{self.user_id}/points', headers=self.headers, query_string={'term_id': self.term_id})
+        self.assertEqual(response.json['points']['valid_points'], 5)
+        self.assertLedgerMatches()
+
+    def test_points_and_term_change(self):
+        self.update_swtd(points=8)
+        self.assertEqual(self.get_row()['pending_points'], 8)
+
+        # Starts outside of the new term, so only the count moves.
+        self.update_swtd(term_id=self.other_term_id)
+        self.assertEqual(self.get_row()['pending_points'], 0)
+        self.assertEqual(self.get_row()['pending_swtds'], 0)
+        self.assertEqual(self.get_row(self.other_term_id)['pending_points'], 0)
+        self.assertEqual(self.get_row(self.other_term_id)['pending_swtds'], 1)
+
+        self.update_swtd(start_date=date(2024, 7, 1))
+        self.assertEqual(self.get_row(self.other_term_id)['pending_points'], 8)
+        self.assertLedgerMatches()
+
+    def test_soft_delete(self):
+        response = self.client.delete(f'/swtds/{self.swtd_id}', headers=self.headers)
+        self.assertEqual(response.status_code, 200)
+
+        row = self.get_row()
+        self.assertEqual(row['pending_points'], 0)
+        self.assertEqual(row['pending_swtds'], 0)
+        self.assertEqual(row['invalid_points'], 2)
+        self.assertLedgerMatches()
+
+    def test_clearance(self):
+        with self.app.app_context():
+            db.session.add(SWTDForm(
+                title='Seminar', venue='Online', category='Seminar', start_date=date(2024, 2, 1), end_date=date(2024, 2, 1),
+                total_hours=1, points=30, benefits='Lorem Ipsum', validation_status='APPROVED', author_id=self.user_id, term_id=self.term_id
+            ))
+            db.session.commit()
+
+        response = self.client.post(f'/users/{self.user_id}/clearances', headers=self.headers, json={'term_id': self.term_id})
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(self.get_row()['is_cleared'])
+        self.assertLedgerMatches()
+
+        clearance_id = response.json['clearance']['id']
+        response = self.client.delete(f'/users/{self.user_id}/clearances/{clearance_id}', headers=self.headers)
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(self.get_row()['is_cleared'])
+        self.assertLedgerMatches()
+
+    def test_term_dates_change(self):
+        with self.app.app_context():
+            term = db.session.get(Term, self.term_id)
+            term.start_date = date(2024, 3, 1)
+            db.session.commit()
+
+        row = self.get_row()
+        self.assertEqual(row['pending_points'], 0)
+        self.assertEqual(row['pending_swtds'], 1)
+        self.assertLedgerMatches()
+
+    def test_rebuild_and_verify(self):
+        runner = self.app.test_cli_runner()
+
+        with self.app.app_context():
+            db.session.execute(UserTermPoints.__table__.update().values(pending_points=99))
+            db.session.commit()
+
+        result = runner.invoke(args=['points', 'verify'])
+        self.assertEqual(result.exit_code, 1)
+        self.assertIn(f'User {self.user_id}', result.output)
+
+        result = runner.invoke(args=['points', 'rebuild'])
+        self.assertEqual(result.exit_code, 0)
+        self.assertEqual(self.get_row()['pending_points'], 5)
+
+        result = runner.invoke(args=['points', 'verify'])
+        self.assertEqual(result.exit_code, 0)
+
+    def test_empty_ledger_is_rebuilt(self):
+        with self.app.app_context():
+            db.session.execute(UserTermPoints.__table__.delete())
+            db.session.commit()
+
+            # As after db.create_all() adds the table to an existing database.
+            self.assertTrue(points_ledger_service.rebuild_if_empty())
+            self.assertFalse(points_ledger_service.rebuild_if_empty())
+
+        self.assertEqual(self.get_row()['pending_points'], 5)
+        self.assertLedgerMatches()
@@ -0,0 +1,70 @@
+import io
+
+from utils import BaseTestCase, create_term, create_department, create_member, create_swtd_form
+
+class TestProofFiles(BaseTestCase):
+    def setUp(self):
+        super().setUp()
+
+        self.department_id = create_department(self.app, 'CCS')
+        self.term_id = create_term(self.app, '1st Semester 2324', '01-24-2024', '05-30-2024')
+        self.user_id, self.user_token = create_member(self.app, 'user@email.com', 'password', self.department_id)
+        self.swtd_id = create_swtd_form(self.app, self.user_id, self.term_id)
+
+        self.headers = {
+            'Authorization': f'Bearer {self.user_token}'
+        }
+
+        self.content = b'%PDF-1.4 certificate scan ' * 100
+
+        response = self.client.post(f'/swtds/{self.swtd_id}/proof', headers=self.headers, data={
+            'files': (io.BytesIO(self.content), 'certificate.pdf', 'application/pdf')
+        })
+        self.assertEqual(response.status_code, 200)
+
+        self.uri = f"/swtds/{self.swtd_id}/proof/{response.json.get('proof')[0].get('id')}"
+
+    def tearDown(self):
+        self.app.config['X_ACCEL_REDIRECT_PREFIX'] = None
+        super().tearDown()
+
+    def test_show_proof(self):
+        response = self.client.get(self.uri, headers=self.headers)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.mimetype, 'application/pdf')
+        self.assertEqual(response.data, self.content)
+        self.assertEqual(response.headers.get('Accept-Ranges'), 'bytes')
+        self.assertIn('certificate.pdf', response.headers.get('Content-Disposition'))
+        self.assertIn('private', response.headers.get('Cache-Control'))
+        self.assertIsNotNone(response.headers.get('Last-Modified'))
+        response.close()
+
+    def test_show_proof_not_modified(self):
+        response = self.client.get(self.uri, headers=self.headers)
+        etag = response.headers.get('ETag')
+        response.close()
+
+        response = self.client.get(self.uri, headers={**self.headers, 'If-None-Match': etag})
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.data, b'')
+
+    def test_show_proof_range(self):
+        response = self.client.get(self.uri, headers={**self.headers, 'Range': 'bytes=5-14'})
+
+        self.assertEqual(response.status_code, 206)
+        self.assertEqual(response.data, self.content[5:15])
+        self.assertEqual(response.headers.get('Content-Range'), f'bytes 5-14/{len(self.content)}')
+        response.close()
+
+        response = self.client.get(self.uri, headers={**self.headers, 'Range': f'bytes={len(self.content)}-'})
+        self.assertEqual(response.status_code, 416)
+
+    def test_show_proof_accel_redirect(self):
+        self.app.config['X_ACCEL_REDIRECT_PREFIX'] = '/protected/'
+
+        response = self.client.get(self.uri, headers=self.headers)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data, b'')
+        self.assertTrue(response.headers.get('X-Accel-Redirect').startswith('/protected/blobs/'))
@@ -0,0 +1,108 @@
+import io
+import os
+import time
+
+from PIL import Image
+
+from utils import BaseTestCase, create_term, create_department, create_member, create_swtd_form
+
+from api import db
+from api.models.proof import Proof
+from api.services import preview_service, storage_service
+
+class TestProofPreviews(BaseTestCase):
+    def setUp(self):
+        super().setUp()
+
+        self.department_id = create_department(self.app, 'CCS')
+        self.term_id = create_term(self.app, '1st Semester 2324', '01-24-2024', '05-30-2024')
+        self.user_id, self.user_token = create_member(self.app, 'user@email.com', 'password', self.department_id)
+        self.swtd_id = create_swtd_form(self.app, self.user_id, self.term_id)
+
+        self.headers = {
+            'Authorization': f'Bearer {self.user_token}'
+        }
+
+    def tearDown(self):
+        super().tearDown()
+
+    def upload(self, content, filename, content_type):
+        response = self.client.post(f'/swtds/{self.swtd_id}/proof', headers=self.headers, data={
+            'files': (io.BytesIO(content), filename, content_type)
+        })
+        self.assertEqual(response.status_code, 200)
+
+        return response.json.get('proof')[0].get('id')
+
+    def wait_for_previews(self, proof_id, timeout=10):
+        deadline = time.monotonic() + timeout
+
+        while time.monotonic() < deadline:
+            with self.app.app_context():
+                blob = db.session.get(Proof, proof_id).blob
+                if blob.preview_status:
+                    return blob.preview_status
+
+            time.sleep(0.05)
+
+        return None
+
+    def create_image(self, size, mode='RGB', format='PNG'):
+        buffer = io.BytesIO()
+        Image.new(mode, size, (200, 30, 30, 128) if mode == 'RGBA' else (200, 30, 30)).save(buffer, format)
+        return buffer.getvalue()
+
+    def test_image_variants(self):
+        proof_id = self.upload(self.create_image((3000, 1500), mode='RGBA'), 'scan.png', 'image/png')
+        self.assertEqual(self.wait_for_previews(proof_id), 'DONE')
+
+        uri = f'/swtds/{self.swtd_id}/proof/{proof_id}'
+
+        for variant, size in preview_service.variants.items():
+            response = self.client.get(uri, headers=self.headers, query_string={'variant': variant})
+
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(response.mimetype, 'image/jpeg')
+            self.assertIn(f'scan.{variant}.jpg', response.headers.get('Content-Disposition'))
+
+            image = Image.open(io.BytesIO(response.data))
+            self.assertEqual(image.format, 'JPEG')
+            self.assertEqual(image.size, (size[0], size[0] // 2))
+            response.close()
+
+        response = self.client.get(uri, headers=self.headers, query_string={'variant': 'large'})
+        self.assertEqual(response.status_code, 400)
+
+    def test_previews_deleted_with_blob(self):
+        proof_id = self.upload(self.create_image((800, 600), format='JPEG'), 'scan.jpg', 'image/jpeg')
+        self.assertEqual(self.wait_for_previews(proof_id), 'DONE')
+
+        with self.app.app_context():
+            key = db.session.get(Proof, proof_id).blob.key
+
+        keys = [preview_service.get_key(key, variant) for variant in preview_service.variants]
+        self.assertTrue(all(storage_service.exists(key) for key in keys))
+
+        response = self.client.delete(f'/swtds/{self.swtd_id}/proof/{proof_id}', headers=self.headers)
+        self.assertEqual(response.status_code, 200)
+
+        self.assertFalse(any(storage_service.exists(key) for key in keys))
+
+    def test_unsupported_file(self):
+        proof_id = self.upload(b'plain text certificate ' + os.urandom(16), 'certificate.txt', 'text/plain')
+        self.assertEqual(self.wait_for_previews(proof_id), 'UNSUPPORTED')
+
+        response = self.client.get(f'/swtds/{self.swtd_id}/proof/{proof_id}', headers=self.headers, query_string={'variant': 'thumb'})
+        self.assertEqual(response.status_code, 404)
+
+    def test_enqueue_missing(self):
+        proof_id = self.upload(self.create_image((400, 400)), 'scan.png', 'image/png')
+        self.assertEqual(self.wait_for_previews(proof_id), 'DONE')
+
+        with self.app.app_context():
+            db.session.get(Proof, proof_id).blob.preview_status = None
+            db.session.commit()
+
+        result = self.app.test_cli_runner().invoke(args=['proofs', 'previews'])
+        self.assertIn('Queued previews for 1 file(s).', result.output)
+        self.assertEqual(self.wait_for_previews(proof_id), 'DONE')
@@ -0,0 +1,92 @@
+import io
+import os
+import hashlib
+import threading
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from utils import BaseTestCase, create_term, create_department, create_member, create_swtd_form
+
+from api.services import ft_service
+
+class TestProofUploads(BaseTestCase):
+    def setUp(self):
+        super().setUp()
+
+        self.department_id = create_department(self.app, 'CCS')
+        self.term_id = create_term(self.app, '1st Semester 2324', '01-24-2024', '05-30-2024')
+        self.user_id, self.user_token = create_member(self.app, 'user@email.com', 'password', self.department_id)
+        self.swtd_id = create_swtd_form(self.app, self.user_id, self.term_id)
+
+        self.uri = f'/swtds/{self.swtd_id}/proof'
+        self.headers = {
+            'Authorization': f'Bearer {self.user_token}'
+        }
+
+        self.max_upload_size = ft_service.max_upload_size
+
+    def tearDown(self):
+        ft_service.max_upload_size = self.max_upload_size
+        self.app.config['MAX_CONTENT_LENGTH'] = None
+        super().tearDown()
+
+    def get_pending_uploads(self):
+        directory = os.path.join(ft_service.data_dir, 'uploads')
+        return os.listdir(directory) if os.path.exists(directory) else []
+
+    def test_upload_proofs(self):
+        contents = [b'first certificate' * 1000, b'second certificate']
+        commits = []
+
+        thread = threading.get_ident()
+
+        # Background jobs, such as preview rendering, commit on their own threads.
+        def on_commit(session):
+            if not session.in_nested_transaction() and threading.get_ident() == thread:
+                commits.append(session)
+
+        event.listen(Session, 'after_commit', on_commit)
+        try:
+            response = self.client.post(self.uri, headers=self.headers, data={
+                'files': [(io.BytesIO(content), f'certificate {i}.pdf', 'application/pdf') for i, content in enumerate(contents)]
+            })
+        finally:
+            event.remove(Session, 'after_commit', on_commit)
+
+        self.assertEqual(response.status_code, 200)
+
+        proofs = response.json.get('proof')
+        self.assertEqual(len(proofs), 2)
+
+        for proof, content in zip(proofs, contents):
+            self.assertEqual(proof.get('sha256'), hashlib.sha256(content).hexdigest())
+            self.assertEqual(proof.get('size'), len(content))
+
+            response = self.client.get(f"{self.uri}/{proof.get('id')}", headers=self.headers)
+            self.assertEqual(response.data, content)
+            response.close()
+
+        # One commit for the proofs and one for the SWTD status update.
+        self.assertEqual(len(commits), 2)
+        self.assertEqual(self.get_pending_uploads(), [])
+
+    def test_upload_file_too_large(self):
+        ft_service.max_upload_size = 100
+
+        response = self.client.post(self.uri, headers=self.headers, data={
+            'files': [(io.BytesIO(b'x' * 10), 'small.pdf'), (io.BytesIO(b'x' * 101), 'large.pdf')]
+        })
+
+        self.assertEqual(response.status_code, 413)
+        self.assertEqual(self.get_pending_uploads(), [])
+
+    def test_upload_request_too_large(self):
+        self.app.config['MAX_CONTENT_LENGTH'] = 1000
+
+        response = self.client.post(self.uri, headers=self.headers, data={
+            'files': (io.BytesIO(b'x' * 2000), 'large.pdf')
+        })
+
+        self.assertEqual(response.status_code, 413)
+        self.assertEqual(self.get_pending_uploads(), [])
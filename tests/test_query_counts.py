@@ -0,0 +1,56 @@
+from utils import BaseTestCase, create_term, create_department, create_member, create_swtd_form, count_queries
+
+class TestQueryCounts(BaseTestCase):
+    """List and export endpoints should issue a bounded number of queries regardless of row count."""
+    def setUp(self):
+        super().setUp()
+
+        self.department_id = create_department(self.app, 'CCS')
+        self.term_id = create_term(self.app, '1st Semester 2324', '01-24-2024', '05-30-2024')
+        self.staff_id, self.staff_token = create_member(self.app, 'staff@email.com', 'password', self.department_id, access_level=2)
+
+        self.user_count = 0
+
+    def tearDown(self):
+        super().tearDown()
+
+    def add_members(self, count, forms_per_member=3):
+        for _ in range(count):
+            self.user_count += 1
+            user_id, _ = create_member(self.app, f'user{self.user_count}@email.com', 'password', self.department_id)
+
+            for status in ['APPROVED', 'PENDING', 'REJECTED'][:forms_per_member]:
+                create_swtd_form(self.app, user_id, self.term_id, validation_status=status)
+
+    def assert_bounded(self, uri, max_queries, **kwargs):
+        headers = {
+            'Authorization': f'Bearer {self.staff_token}'
+        }
+
+        counts = []
+        for members in [2, 10]:
+            self.add_members(members)
+
+            with count_queries(self.app) as statements:
+                response = self.client.get(uri, headers=headers, **kwargs)
+
+            self.assertEqual(response.status_code, 200)
+            self.assertLessEqual(len(statements), max_queries, f"{uri} issued {len(statements)} queries")
+            counts.append(len(statements))
+
+        self.assertEqual(counts[0], counts[1], f"{uri} query count grows with row count: {counts}")
+
+    def test_get_all_swtds(self):
+        self.assert_bounded('/swtds', 4)
+
+    def test_get_all_users(self):
+        self.assert_bounded('/users', 3)
+
+    def test_get_department_members(self):
+        self.assert_bounded(f'/departments/{self.department_id}/members', 5)
+
+    def test_export_department_data(self):
+        self.assert_bounded(f'/departments/{self.department_id}/export', 8, query_string={'term_id': self.term_id})
+
+    def test_export_staff_data(self):
+        self.assert_bounded(f'/departments/{self.department_id}/staff/export', 8, query_string={'term_id': self.term_id})
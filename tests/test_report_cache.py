@@ -0,0 +1,91 @@
+import io
+import os
+import shutil
+import tempfile
+from datetime import date
+from unittest import mock
+
+from utils import BaseTestCase, create_term, create_department, create_member, create_swtd_form
+
+from api import db
+from api.models.swtd_form import SWTDForm
+from api.services import ft_service
+from api.services.ft_service import ReportCache
+
+class TestReportCache(BaseTestCase):
+    def setUp(self):
+        super().setUp()
+
+        self.department_id = create_department(self.app, 'CCS')
+        self.term_id = create_term(self.app, '1st Semester 2324', '01-24-2024', '05-30-2024')
+        self.staff_id, self.staff_token = create_member(self.app, 'staff@email.com', 'password', self.department_id, access_level=2)
+        self.user_id, self.user_token = create_member(self.app, 'user@email.com', 'password', self.department_id)
+        self.swtd_id = create_swtd_form(self.app, self.user_id, self.term_id)
+
+        self.uri = f'/departments/{self.department_id}/staff/export'
+        self.headers = {
+            'Authorization': f'Bearer {self.staff_token}'
+        }
+
+        self.cache_dir = tempfile.mkdtemp()
+        self.report_cache = ft_service.report_cache
+        ft_service.report_cache = ReportCache(self.cache_dir, max_size=1024 * 1024)
+
+    def tearDown(self):
+        ft_service.report_cache = self.report_cache
+        shutil.rmtree(self.cache_dir)
+        super().tearDown()
+
+    def test_repeated_export_is_cached(self):
+        first = self.client.get(self.uri, headers=self.headers, query_string={'term_id': self.term_id})
+        second = self.client.get(self.uri, headers=self.headers, query_string={'term_id': self.term_id})
+
+        self.assertEqual(first.status_code, 200)
+        self.assertEqual(first.data, second.data)
+        self.assertEqual(len(os.listdir(self.cache_dir)), 1)
+
+    def test_changed_data_creates_new_version(self):
+        self.client.get(self.uri, headers=self.headers, query_string={'term_id': self.term_id})
+
+        response = self.client.put(f'/swtds/{self.swtd_id}', headers=self.headers, json={'title': 'Updated SWTD'})
+        self.assertEqual(response.status_code, 200)
+
+        self.client.get(self.uri, headers=self.headers, query_string={'term_id': self.term_id})
+        self.assertEqual(len(os.listdir(self.cache_dir)), 2)
+
+    def test_changes_within_a_second_create_new_version(self):
+        with self.app.app_context():
+            swtd = db.session.get(SWTDForm, self.swtd_id)
+            user = swtd.author
+
+            version = ft_service.get_employee_version(user)
+
+            # Keeps date_modified as is, like a second write within the same second.
+            swtd.title = 'Updated SWTD'
+            db.session.commit()
+
+            self.assertNotEqual(ft_service.get_employee_version(user), version)
+
+    def test_entries_expire_daily(self):
+        self.client.get(self.uri, headers=self.headers, query_string={'term_id': self.term_id})
+
+        with mock.patch('api.services.ft_service.date') as mock_date:
+            mock_date.today.return_value = date(2099, 1, 1)
+            self.client.get(self.uri, headers=self.headers, query_string={'term_id': self.term_id})
+
+        self.assertEqual(len(os.listdir(self.cache_dir)), 2)
+
+    def test_least_recently_used_are_evicted(self):
+        cache = ReportCache(self.cache_dir, max_size=350)
+
+        for i in range(3):
+            cache.put(('STAFF', i), io.BytesIO(b'x' * 100))
+            os.utime(cache.get_path(('STAFF', i)), (i, i))
+
+        cache.get(('STAFF', 0))
+        cache.put(('STAFF', 3), io.BytesIO(b'x' * 100))
+
+        self.assertIsNotNone(cache.get(('STAFF', 0)))
+        self.assertIsNone(cache.get(('STAFF', 1)))
+        self.assertIsNotNone(cache.get(('STAFF', 2)))
+        self.assertIsNotNone(cache.get(('STAFF', 3)))
@@ -0,0 +1,158 @@
+import os
+import time
+from datetime import datetime, timedelta
+
+from utils import BaseTestCase, create_term, create_department, create_member, create_swtd_form
+
+from api import db, socketio
+from api.models.report import Report
+from api.services import report_service
+
+class TestReports(BaseTestCase):
+    def setUp(self):
+        super().setUp()
+
+        self.uri = '/reports'
+
+        self.department_id = create_department(self.app, 'CCS')
+        self.term_id = create_term(self.app, '1st Semester 2324', '01-24-2024', '05-30-2024')
+        self.staff_id, self.staff_token = create_member(self.app, 'staff@email.com', 'password', self.department_id, access_level=2)
+        self.user_id, self.user_token = create_member(self.app, 'user@email.com', 'password', self.department_id)
+
+        for i in range(3):
+            create_swtd_form(self.app, self.user_id, self.term_id, title=f'SWTD {i}')
+
+        self.headers = {
+            'Authorization': f'Bearer {self.staff_token}'
+        }
+
+    def tearDown(self):
+        super().tearDown()
+
+    def wait_for_report(self, report_id, headers, timeout=10):
+        deadline = time.monotonic() + timeout
+
+        while time.monotonic() < deadline:
+            report = self.client.get(f'{self.uri}/{report_id}', headers=headers).json.get('report')
+            if report.get('status') in ('DONE', 'FAILED'):
+                return report
+
+            time.sleep(0.05)
+
+        return report
+
+    def test_staff_report(self):
+        client = socketio.test_client(self.app, namespace='/notifications', auth={'token': self.staff_token})
+        anonymous_client = socketio.test_client(self.app, namespace='/notifications')
+        other_client = socketio.test_client(self.app, namespace='/notifications', auth={'token': self.user_token})
+
+        response = self.client.post(self.uri, headers=self.headers, json={
+            'type': 'STAFF',
+            'department_id': self.department_id,
+            'term_id': self.term_id
+        })
+        self.assertEqual(response.status_code, 202)
+
+        report = self.wait_for_report(response.json.get('report').get('id'), self.headers)
+        self.assertEqual(report.get('status'), 'DONE')
+        self.assertEqual(report.get('progress'), 1.0)
+
+        response = self.client.get(f"{self.uri}/{report.get('id')}/download", headers=self.headers)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.mimetype, 'application/pdf')
+        self.assertTrue(response.data.startswith(b'%PDF'))
+        response.close()
+
+        events = [e for e in client.get_received('/notifications') if e.get('name') == 'report_progress']
+        self.assertEqual(events[-1].get('args')[0].get('status'), 'DONE')
+
+        # Progress is only sent to the requester.
+        for other in [anonymous_client, other_client]:
+            self.assertFalse([e for e in other.get_received('/notifications') if e.get('name') == 'report_progress'])
+            other.disconnect(namespace='/notifications')
+
+        client.disconnect(namespace='/notifications')
+
+    def test_employee_report(self):
+        headers = {
+            'Authorization': f'Bearer {self.user_token}'
+        }
+
+        response = self.client.post(self.uri, headers=headers, json={'type': 'EMPLOYEE', 'user_id': self.user_id})
+        self.assertEqual(response.status_code, 202)
+
+        report = self.wait_for_report(response.json.get('report').get('id'), headers)
+        self.assertEqual(report.get('status'), 'DONE')
+
+    def test_report_permissions(self):
+        headers = {
+            'Authorization': f'Bearer {self.user_token}'
+        }
+
+        response = self.client.post(self.uri, headers=headers, json={
+            'type': 'STAFF',
+            'department_id': self.department_id,
+            'term_id': self.term_id
+        })
+        self.assertEqual(response.status_code, 403)
+
+        response = self.client.post(self.uri, headers=self.headers, json={'type': 'DEPARTMENT', 'department_id': self.department_id})
+        self.assertEqual(response.status_code, 400)
+
+    def test_download_before_done(self):
+        with self.app.app_context():
+            report = Report(type='STAFF', requester_id=self.staff_id, department_id=self.department_id, term_id=self.term_id)
+            db.session.add(report)
+            db.session.commit()
+
+            report_id = report.id
+
+        response = self.client.get(f'{self.uri}/{report_id}/download', headers=self.headers)
+        self.assertEqual(response.status_code, 409)
+
+        response = self.client.get(f'{self.uri}/{report_id + 1}/download', headers=self.headers)
+        self.assertEqual(response.status_code, 404)
+
+    def test_download_missing_file(self):
+        headers = {
+            'Authorization': f'Bearer {self.user_token}'
+        }
+
+        response = self.client.post(self.uri, headers=headers, json={'type': 'EMPLOYEE', 'user_id': self.user_id})
+        report = self.wait_for_report(response.json.get('report').get('id'), headers)
+        self.assertEqual(report.get('status'), 'DONE')
+
+        with self.app.app_context():
+            os.remove(db.session.get(Report, report.get('id')).path)
+
+        response = self.client.get(f"{self.uri}/{report.get('id')}/download", headers=headers)
+        self.assertEqual(response.status_code, 404)
+
+    def test_cleanup(self):
+        headers = {
+            'Authorization': f'Bearer {self.user_token}'
+        }
+
+        response = self.client.post(self.uri, headers=headers, json={'type': 'EMPLOYEE', 'user_id': self.user_id})
+        report = self.wait_for_report(response.json.get('report').get('id'), headers)
+        self.assertEqual(report.get('status'), 'DONE')
+
+        with self.app.app_context():
+            path = db.session.get(Report, report.get('id')).path
+            self.assertTrue(os.path.isfile(path))
+
+        result = self.app.test_cli_runner().invoke(args=['reports', 'cleanup'])
+        self.assertEqual(result.exit_code, 0)
+        self.assertIn('Deleted 0 report(s).', result.output)
+
+        with self.app.app_context():
+            db.session.get(Report, report.get('id')).date_modified = datetime.now() - timedelta(seconds=report_service.retention + 1)
+            db.session.commit()
+
+        result = self.app.test_cli_runner().invoke(args=['reports', 'cleanup'])
+        self.assertEqual(result.exit_code, 0)
+        self.assertIn('Deleted 1 report(s).', result.output)
+        self.assertFalse(os.path.exists(path))
+
+        response = self.client.get(f"{self.uri}/{report.get('id')}", headers=headers)
+        self.assertEqual(response.status_code, 404)
@@ -0,0 +1,125 @@
+from unittest import mock
+
+from utils import BaseTestCase, create_term, create_department, create_member, create_swtd_form, count_queries
+
+from api import db
+from api.models.job import Job
+from api.models.swtd_form import SWTDForm
+from api.models.notification import Notification
+from api.services import job_service, notification_service, points_ledger_service
+
+class TestSWTDBulkValidation(BaseTestCase):
+    def setUp(self):
+        super().setUp()
+
+        self.app.config.update(JOB_BACKEND='database')
+        job_service.init_app(self.app)
+
+        self.department_id = create_department(self.app, 'CCS')
+        self.other_department_id = create_department(self.app, 'CEA')
+        self.term_id = create_term(self.app, '1st Semester 2324', '01-24-2024', '05-30-2024')
+
+        self.staff_id, self.staff_token = create_member(self.app, 'staff@email.com', 'password', self.department_id, access_level=2)
+        self.author_id, self.author_token = create_member(self.app, 'author@email.com', 'password', self.department_id)
+        self.other_id, _ = create_member(self.app, 'other@email.com', 'password', self.other_department_id)
+
+        self.uri = '/swtds/validate'
+        self.headers = {
+            'Authorization': f'Bearer {self.staff_token}'
+        }
+
+    def tearDown(self):
+        super().tearDown()
+
+    def test_validate_swtds(self):
+        swtd_ids = [create_swtd_form(self.app, self.author_id, self.term_id, points=2) for _ in range(3)]
+        other_swtd_id = create_swtd_form(self.app, self.other_id, self.term_id, points=4)
+
+        with mock.patch.object(notification_service, 'trigger_ws_event') as trigger_ws_event:
+            response = self.client.post(self.uri, headers=self.headers, json={'validations': [
+                {'id': swtd_ids[0], 'validation_status': 'APPROVED'},
+                {'id': swtd_ids[1], 'validation_status': 'APPROVED'},
+                {'id': swtd_ids[2], 'validation_status': 'REJECTED'},
+                {'id': other_swtd_id, 'validation_status': 'APPROVED'},
+                {'id': 12345, 'validation_status': 'APPROVED'}
+            ]})
+        self.assertEqual(response.status_code, 200)
+
+        # One socket event per author.
+        events = [call.args for call in trigger_ws_event.call_args_list]
+        self.assertEqual([name for name, _ in events], ['swtd_validation_update'] * 2)
+        self.assertEqual(sorted(len(payload['data']['swtds']) for _, payload in events), [1, 3])
+
+        self.assertEqual([swtd['id'] for swtd in response.json['swtd_forms']], [*swtd_ids, other_swtd_id])
+        self.assertEqual(response.json['skipped'], [{'id': 12345, 'reason': 'NOT_FOUND'}])
+
+        with self.app.app_context():
+            swtd = db.session.get(SWTDForm, swtd_ids[0])
+            self.assertEqual(swtd.validation_status, 'APPROVED')
+            self.assertEqual(swtd.validator_id, self.staff_id)
+            self.assertIsNotNone(swtd.date_validated)
+
+            # One notification and one mail per author.
+            self.assertEqual(Notification.query.filter_by(target_id=self.author_id).count(), 1)
+            self.assertEqual(Notification.query.filter_by(target_id=self.other_id).count(), 1)
+
+            notification = Notification.query.filter_by(target_id=self.author_id).first()
+            self.assertEqual(notification.data['status'], 'MIXED')
+            self.assertEqual(len(notification.data['swtds']), 3)
+
+            jobs = Job.query.filter_by(name='mail.send').all()
+            self.assertEqual(len(jobs), 1)
+
+            items = jobs[0].payload['items']
+            self.assertEqual(sorted(item['recipients'][0] for item in items), ['author@email.com', 'other@email.com'])
+
+            self.assertEqual(points_ledger_service.get_points([self.author_id], self.term_id)[self.author_id].valid_points, 4)
+            self.assertEqual(points_ledger_service.verify(), [])
+
+        response = self.client.post(self.uri, headers=self.headers, json={'validations': [
+            {'id': swtd_ids[0], 'validation_status': 'APPROVED'},
+            {'id': swtd_ids[1], 'validation_status': 'PENDING'}
+        ]})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json['skipped'], [{'id': swtd_ids[0], 'reason': 'UNCHANGED'}])
+
+        with self.app.app_context():
+            swtd = db.session.get(SWTDForm, swtd_ids[1])
+            self.assertEqual(swtd.validation_status, 'PENDING')
+            self.assertIsNone(swtd.validator_id)
+            self.assertIsNone(swtd.date_validated)
+
+            # Returning a form to PENDING notifies without mail.
+            self.assertEqual(Job.query.filter_by(name='mail.send').count(), 1)
+            self.assertEqual(points_ledger_service.verify(), [])
+
+    def test_validate_swtds_queries(self):
+        counts = []
+        for count in [2, 8]:
+            swtd_ids = [create_swtd_form(self.app, self.author_id, self.term_id) for _ in range(count)]
+
+            with count_queries(self.app) as statements:
+                response = self.client.post(self.uri, headers=self.headers, json={'validations': [
+                    {'id': swtd_id, 'validation_status': 'APPROVED'} for swtd_id in swtd_ids
+                ]})
+
+            self.assertEqual(response.status_code, 200)
+            counts.append(len(statements))
+
+        self.assertEqual(counts[0], counts[1], f"query count grows with SWTD count: {counts}")
+
+    def test_validate_swtds_fail(self):
+        swtd_id = create_swtd_form(self.app, self.author_id, self.term_id)
+        headers = {
+            'Authorization': f'Bearer {self.author_token}'
+        }
+
+        response = self.client.post(self.uri, headers=headers, json={'validations': [{'id': swtd_id, 'validation_status': 'APPROVED'}]})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json['skipped'], [{'id': swtd_id, 'reason': 'FORBIDDEN'}])
+
+        response = self.client.post(self.uri, headers=self.headers, json={})
+        self.assertEqual(response.status_code, 400)
+
+        response = self.client.post(self.uri, headers=self.headers, json={'validations': [{'id': swtd_id, 'validation_status': 'DONE'}]})
+        self.assertEqual(response.status_code, 400)
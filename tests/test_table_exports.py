@@ -0,0 +1,114 @@
+import io
+import csv
+import zipfile
+
+from utils import BaseTestCase, create_term, create_department, create_member, create_swtd_form, count_queries
+
+from api import db
+from api.models.user import User
+
+class TestTableExports(BaseTestCase):
+    def setUp(self):
+        super().setUp()
+
+        self.department_id = create_department(self.app, 'CCS')
+        self.other_department_id = create_department(self.app, 'CEA')
+        self.term_id = create_term(self.app, '1st Semester 2324', '01-24-2024', '05-30-2024')
+        self.staff_id, self.staff_token = create_member(self.app, 'staff@email.com', 'password', self.other_department_id, access_level=2)
+        self.user_id, self.user_token = create_member(self.app, 'user@email.com', 'password', self.department_id)
+
+        create_swtd_form(self.app, self.user_id, self.term_id, validation_status='APPROVED', points=4)
+        create_swtd_form(self.app, self.user_id, self.term_id, validation_status='PENDING', points=2)
+        create_swtd_form(self.app, self.user_id, self.term_id, validation_status='REJECTED', points=1)
+
+        self.headers = {
+            'Authorization': f'Bearer {self.staff_token}'
+        }
+
+    def tearDown(self):
+        super().tearDown()
+
+    def read_csv(self, response):
+        return list(csv.DictReader(io.StringIO(response.data.decode('utf-8-sig'))))
+
+    def test_staff_export_csv(self):
+        response = self.client.get(f'/departments/{self.department_id}/staff/export', headers=self.headers, query_string={'term_id': self.term_id, 'format': 'csv'})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.mimetype, 'text/csv')
+
+        rows = self.read_csv(response)
+        self.assertEqual(len(rows), 1)
+        self.assertEqual(rows[0]['Department'], 'CCS')
+        self.assertEqual(rows[0]['Cleared'], 'No')
+        self.assertEqual(float(rows[0]['Approved Points']), 4)
+        self.assertEqual(float(rows[0]['Pending Points']), 2)
+        self.assertEqual(float(rows[0]['For Revision Points']), 1)
+        self.assertEqual(int(rows[0]['Pending SWTDs']), 1)
+
+    def test_employee_export_csv(self):
+        response = self.client.get(f'/users/{self.user_id}/swtds/export', headers={'Authorization': f'Bearer {self.user_token}'}, query_string={'format': 'csv'})
+
+        self.assertEqual(response.status_code, 200)
+
+        rows = self.read_csv(response)
+        self.assertEqual(len(rows), 1)
+        self.assertEqual(rows[0]['Term'], '1st Semester 2324')
+        self.assertEqual(float(rows[0]['Required Points']), 10)
+        self.assertEqual(float(rows[0]['Approved Points']), 4)
+
+    def test_all_staff_export_xlsx(self):
+        response = self.client.get('/departments/staff/export', headers=self.headers, query_string={'term_id': self.term_id, 'format': 'xlsx'})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.mimetype, 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet')
+
+        with zipfile.ZipFile(io.BytesIO(response.data)) as archive:
+            self.assertIn('xl/workbook.xml', archive.namelist())
+            sheet = archive.read('xl/worksheets/sheet1.xml').decode('utf-8')
+
+        # Header row plus both employees.
+        self.assertEqual(sheet.count('<row>'), 3)
+        self.assertIn('CCS', sheet)
+        self.assertIn('CEA', sheet)
+
+    def test_formulas_are_quoted(self):
+        with self.app.app_context():
+            user = db.session.get(User, self.user_id)
+            user.firstname = '=HYPERLINK("http://example.com")'
+            user.lastname = '@SUM(A1)'
+            db.session.commit()
+
+        uri = f'/departments/{self.department_id}/staff/export'
+
+        response = self.client.get(uri, headers=self.headers, query_string={'term_id': self.term_id, 'format': 'csv'})
+        rows = self.read_csv(response)
+        self.assertEqual(rows[0]['First Name'], '\'=HYPERLINK("http://example.com")')
+        self.assertEqual(rows[0]['Last Name'], "'@SUM(A1)")
+
+        response = self.client.get(uri, headers=self.headers, query_string={'term_id': self.term_id, 'format': 'xlsx'})
+        with zipfile.ZipFile(io.BytesIO(response.data)) as archive:
+            sheet = archive.read('xl/worksheets/sheet1.xml').decode('utf-8')
+
+        self.assertIn('>\'=HYPERLINK("http://example.com")<', sheet)
+        self.assertIn("'@SUM(A1)", sheet)
+
+    def test_export_queries(self):
+        counts = []
+
+        for i in range(2):
+            for j in range(5):
+                create_member(self.app, f'member{i}{j}@email.com', 'password', self.department_id)
+
+            with count_queries(self.app) as statements:
+                response = self.client.get('/departments/staff/export', headers=self.headers, query_string={'term_id': self.term_id, 'format': 'csv'})
+                response.get_data()
+
+            self.assertEqual(response.status_code, 200)
+            counts.append(len(statements))
+
+        self.assertEqual(counts[0], counts[1], f"Query count grows with member count: {counts}")
+
+    def test_invalid_format(self):
+        response = self.client.get(f'/departments/{self.department_id}/staff/export', headers=self.headers, query_string={'term_id': self.term_id, 'format': 'docx'})
+        self.assertEqual(response.status_code, 400)
@@ -0,0 +1,69 @@
+from flask_jwt_extended import decode_token
+
+from sqlalchemy import update
+
+from utils import BaseTestCase, create_department, create_member
+
+from api import db
+from api.models.user import User
+from api.services import jwt_service
+
+class TestTokenClaims(BaseTestCase):
+    def setUp(self):
+        super().setUp()
+
+        self.department_id = create_department(self.app, 'CCS')
+        self.user_id, self.user_token = create_member(self.app, 'user@email.com', 'password', self.department_id)
+
+        self.headers = {
+            'Authorization': f'Bearer {self.user_token}'
+        }
+
+    def tearDown(self):
+        super().tearDown()
+
+    def test_token_claims(self):
+        with self.app.app_context():
+            claims = decode_token(self.user_token)
+
+        self.assertEqual(claims.get('uid'), self.user_id)
+        self.assertEqual(claims.get('access_level'), 0)
+        self.assertEqual(claims.get('department_id'), self.department_id)
+        self.assertIsNone(claims.get('headed_department_id'))
+        self.assertEqual(claims.get('ver'), 0)
+
+    def test_password_change_revokes_token(self):
+        response = self.client.put(f'/users/{self.user_id}', headers=self.headers, json={'password': 'N3w-password'})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue('access_token' in response.json)
+
+        response = self.client.get(f'/users/{self.user_id}', headers=self.headers)
+        self.assertEqual(response.status_code, 401)
+
+    def test_new_token_after_password_change(self):
+        response = self.client.put(f'/users/{self.user_id}', headers=self.headers, json={'password': 'N3w-password'})
+        token = response.json.get('access_token')
+
+        response = self.client.get(f'/users/{self.user_id}', headers={'Authorization': f'Bearer {token}'})
+        self.assertEqual(response.status_code, 200)
+
+    def test_cached_requester_is_revoked_by_other_processes(self):
+        self.app.config.update(REQUESTER_CACHE_TTL=60)
+        jwt_service.init_app(self.app)
+
+        try:
+            response = self.client.get(f'/users/{self.user_id}', headers=self.headers)
+            self.assertEqual(response.status_code, 200)
+            self.assertIsNotNone(jwt_service.requester_cache.get('user@email.com'))
+
+            # Bumped without invalidating this process's cache, as another worker would.
+            with self.app.app_context():
+                db.session.execute(update(User).where(User.id == self.user_id).values(token_version=User.token_version + 1))
+                db.session.commit()
+
+            response = self.client.get(f'/users/{self.user_id}', headers=self.headers)
+            self.assertEqual(response.status_code, 401)
+        finally:
+            self.app.config.update(REQUESTER_CACHE_TTL=0)
+            jwt_service.init_app(self.app)
@@ -2,14 +2,24 @@ import random
 import string
 import io
 import os
+import socket
+import socketserver
+import threading
+import time
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import urlsplit, unquote
 
+from contextlib import contextmanager
 from unittest import TestCase
 from datetime import datetime
 from werkzeug.datastructures import FileStorage
+from sqlalchemy import event
 
 from api import db, create_app
 from api.models.user import User
 from api.models.term import Term
+from api.models.department import Department
+from api.models.swtd_form import SWTDForm
 from api.services import password_encoder_service, jwt_service, term_service
 
 class BaseTestCase(TestCase):
@@ -51,13 +61,14 @@ def create_user(app, email, password, **data):
         token = jwt_service.generate_token(user.email)
         return user.id, token
 
-def create_term(app, name, start_date, end_date, is_deleted=False):
+def create_term(app, name, start_date, end_date, is_deleted=False, type='SEMESTER'):
     with app.app_context():
         term = Term(
             name=name,
             start_date=datetime.strptime(start_date, '%m-%d-%Y'),
             end_date=datetime.strptime(end_date, '%m-%d-%Y'),
-            is_deleted=is_deleted
+            is_deleted=is_deleted,
+            type=type
         )
 
         db.session.add(term)
@@ -70,3 +81,199 @@ def get_test_file():
     stream = io.BytesIO(content)
     file = FileStorage(stream, filename='testfile.txt')
     return file
+
+def create_department(app, name, **data):
+    with app.app_context():
+        department = Department(
+            name=name,
+            required_points=data.get('required_points', 10),
+            level=data.get('level', 'COLLEGE'),
+            midyear_points=data.get('midyear_points', 0),
+            use_schoolyear=data.get('use_schoolyear', False)
+        )
+
+        db.session.add(department)
+        db.session.commit()
+
+        return department.id
+
+def create_member(app, email, password, department_id, access_level=0):
+    with app.app_context():
+        user = User(
+            employee_id=generate_random_string(),
+            email=email,
+            firstname='John',
+            lastname='Doe',
+            password=password_encoder_service.encode_password(password),
+            department_id=department_id,
+            access_level=access_level
+        )
+
+        db.session.add(user)
+        db.session.commit()
+
+        token = jwt_service.generate_user_token(user)
+        return user.id, token
+
+def create_swtd_form(app, author_id, term_id, **data):
+    with app.app_context():
+        swtd_form = SWTDForm(
+            title=data.get('title', 'Sample SWTD'),
+            venue=data.get('venue', 'Online'),
+            category=data.get('category', 'Life-Relevant Webinar'),
+            start_date=datetime.strptime(data.get('start_date', '02-01-2024'), '%m-%d-%Y'),
+            end_date=datetime.strptime(data.get('end_date', '02-01-2024'), '%m-%d-%Y'),
+            total_hours=data.get('total_hours', 1),
+            points=data.get('points', 5),
+            benefits=data.get('benefits', 'Lorem Ipsum'),
+            validation_status=data.get('validation_status', 'PENDING'),
+            author_id=author_id,
+            term_id=term_id
+        )
+
+        db.session.add(swtd_form)
+        db.session.commit()
+
+        return swtd_form.id
+
+@contextmanager
+def count_queries(app):
+    """Count the SQL statements executed against the app database inside the block."""
+    with app.app_context():
+        engine = db.engine
+
+    statements = []
+    def on_execute(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(engine, 'before_cursor_execute', on_execute)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, 'before_cursor_execute', on_execute)
+
+class SMTPStub(socketserver.ThreadingTCPServer):
+    """Minimal local SMTP server that records every message it receives."""
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self):
+        super().__init__(('127.0.0.1', 0), SMTPStubHandler)
+        self.port = self.server_address[1]
+        self.messages = []
+        self.fail_next = 0
+        self.connections = []
+
+    def __enter__(self):
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, *args):
+        self.shutdown()
+        self.server_close()
+
+    def wait_for(self, count, timeout=5):
+        deadline = time.monotonic() + timeout
+        while len(self.messages) < count and time.monotonic() < deadline:
+            time.sleep(0.05)
+
+        return self.messages
+
+    def drop_connections(self):
+        for connection in self.connections:
+            connection.shutdown(socket.SHUT_RDWR)
+
+class SMTPStubHandler(socketserver.StreamRequestHandler):
+    def reply(self, line):
+        self.wfile.write(f'{line}\r\n'.encode())
+
+    def handle(self):
+        self.server.connections.append(self.connection)
+        self.reply('220 localhost SMTP stub')
+        recipients = []
+
+        for raw in self.rfile:
+            command = raw.decode().strip()
+            verb = command.split(' ')[0].upper()
+
+            if verb in ('EHLO', 'HELO'):
+                self.reply('250 localhost')
+            elif verb == 'MAIL':
+                recipients = []
+                self.reply('250 OK')
+            elif verb == 'RCPT':
+                recipients.append(command.split(':', 1)[1].strip(' <>'))
+                self.reply('250 OK')
+            elif verb == 'DATA':
+                self.reply('354 End data with <CR><LF>.<CR><LF>')
+                lines = []
+                for data in self.rfile:
+                    if data in (b'.\r\n', b'.\n'):
+                        break
+                    lines.append(data.decode())
+
+                if self.server.fail_next:
+                    self.server.fail_next -= 1
+                    self.reply('451 Temporary failure')
+                else:
+                    self.server.messages.append({'recipients': recipients, 'data': ''.join(lines)})
+                    self.reply('250 OK')
+            elif verb == 'QUIT':
+                self.reply('221 Bye')
+                break
+            else:
+                self.reply('250 OK')
+
+class S3Stub(ThreadingHTTPServer):
+    """Minimal local S3 endpoint that keeps objects in memory and records the requests it receives."""
+    daemon_threads = True
+
+    def __init__(self):
+        super().__init__(('127.0.0.1', 0), S3StubHandler)
+        self.endpoint_url = f'http://127.0.0.1:{self.server_address[1]}'
+        self.objects = {}
+        self.requests = []
+
+    def __enter__(self):
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, *args):
+        self.shutdown()
+        self.server_close()
+
+class S3StubHandler(BaseHTTPRequestHandler):
+    def log_message(self, *args):
+        pass
+
+    def record(self):
+        path = unquote(urlsplit(self.path).path)
+        self.server.requests.append({'method': self.command, 'path': path, 'headers': {k.lower(): v for k, v in self.headers.items()}})
+        return path
+
+    def reply(self, code, body=b''):
+        self.send_response(code)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+
+        if self.command != 'HEAD':
+            self.wfile.write(body)
+
+    def do_PUT(self):
+        path = self.record()
+        self.server.objects[path] = self.rfile.read(int(self.headers['Content-Length']))
+        self.reply(200)
+
+    def do_GET(self):
+        path = self.record()
+        if path not in self.server.objects:
+            return self.reply(404)
+
+        self.reply(200, self.server.objects[path])
+
+    def do_HEAD(self):
+        self.do_GET()
+
+    def do_DELETE(self):
+        self.server.objects.pop(self.record(), None)
+        self.reply(204)